@@ -0,0 +1,136 @@
+from collections import Counter
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower, Trim
+
+from app.groups import parse_group_ids
+from app.models import AuthorAggregate, AuthorAggregateCount, DataExtractionAuthor
+
+# Author names refreshed per query / aggregate rows inserted per batch
+REFRESH_NAMES_PER_QUERY = 1000
+AGGREGATE_BATCH_SIZE = 5000
+
+# Normalized author key; the name expression is backed by the dea_author_name_norm index
+AUTHOR_NAME_NORM = Lower(Trim(F('author_name')))
+AUTHOR_EMAIL_NORM = F('email_normalized')
+
+
+AGGREGATE_KEY_FIELDS = ['name_norm', 'email_norm']
+AGGREGATE_UPDATE_FIELDS = ['email_domain', 'author_name', 'country', 'article_count', 'first_year', 'last_year',
+                           'updated_at']
+
+
+def author_key_rows(authors):
+    """
+    Author rows with their normalized key and the article/extraction columns the
+    aggregate needs, ordered by key so each author's rows are consecutive.
+    """
+    return (authors
+            .annotate(name_norm=AUTHOR_NAME_NORM, email_norm=AUTHOR_EMAIL_NORM)
+            .exclude(name_norm='')
+            .order_by('name_norm', 'email_norm', 'id')
+            .values_list('name_norm', 'email_norm', 'email_domain', 'author_name', 'author_country', 'article_id',
+                         'article__publication_year', 'article__data_extraction__extraction_groups'))
+
+
+def build_author_aggregates(rows):
+    """
+    Folds key-ordered author rows into (AuthorAggregate, [AuthorAggregateCount]) per
+    (name_norm, email_norm): the author's distinct articles per publication year, for
+    every group of their extraction and for ALL_GROUPS. The display name and country
+    are taken from the most recently loaded row.
+    """
+    for (name_norm, email_norm, email_domain), author_rows in groupby(rows, key=lambda row: row[:3]):
+        articles = {}
+        author_name, country = '', ''
+        for _, _, _, name, row_country, article_id, year, extraction_groups in author_rows:
+            author_name = (name or '').strip() or author_name
+            country = row_country or country
+            articles[article_id] = (year, parse_group_ids(extraction_groups))
+
+        years = {year for year, _ in articles.values() if year}
+        aggregate = AuthorAggregate(
+            name_norm=name_norm,
+            email_norm=email_norm,
+            email_domain=email_domain,
+            author_name=author_name,
+            country=country,
+            article_count=len(articles),
+            first_year=min(years) if years else None,
+            last_year=max(years) if years else None,
+        )
+
+        counts = Counter()
+        for year, group_ids in articles.values():
+            for group_id in [AuthorAggregateCount.ALL_GROUPS, *group_ids]:
+                counts[group_id, year] += 1
+        yield aggregate, [AuthorAggregateCount(aggregate=aggregate, group_id=group_id, year=year, articles=count)
+                          for (group_id, year), count in counts.items()]
+
+
+def extraction_author_names(extraction):
+    """Normalized names of every author loaded by a DataExtraction."""
+    return set(DataExtractionAuthor.objects
+               .filter(article__data_extraction=extraction)
+               .annotate(name_norm=AUTHOR_NAME_NORM)
+               .values_list('name_norm', flat=True)
+               .distinct())
+
+
+def refresh_author_aggregates(names):
+    """
+    Recomputes the aggregates and counts of the given normalized author names from their
+    current DataExtractionAuthor rows (names with no rows left are removed).
+
+    Rows are upserted on their (name_norm, email_norm) key in key order, so ingests
+    sharing author names wait on each other's rows instead of failing on the unique
+    constraint, and always lock them in the same order.
+    """
+    names = sorted(name for name in names if name)
+    for start in range(0, len(names), REFRESH_NAMES_PER_QUERY):
+        chunk = names[start:start + REFRESH_NAMES_PER_QUERY]
+        rows = author_key_rows(DataExtractionAuthor.objects.all()).filter(name_norm__in=chunk)
+        with transaction.atomic():
+            built = list(build_author_aggregates(rows))
+            aggregates = AuthorAggregate.objects.bulk_create(
+                [aggregate for aggregate, _ in built], batch_size=AGGREGATE_BATCH_SIZE,
+                update_conflicts=True, unique_fields=AGGREGATE_KEY_FIELDS, update_fields=AGGREGATE_UPDATE_FIELDS)
+            AuthorAggregateCount.objects.filter(aggregate__name_norm__in=chunk).delete()
+            (AuthorAggregate.objects.filter(name_norm__in=chunk)
+             .exclude(id__in=[aggregate.id for aggregate in aggregates]).delete())
+            AuthorAggregateCount.objects.bulk_create(
+                [count for _, counts in built for count in counts], batch_size=AGGREGATE_BATCH_SIZE)
+
+
+def refresh_author_aggregates_for_extraction(extraction):
+    refresh_author_aggregates(extraction_author_names(extraction))
+
+
+def save_author_aggregates(built):
+    """Inserts (aggregate, counts) pairs from build_author_aggregates; returns how many."""
+    AuthorAggregate.objects.bulk_create([aggregate for aggregate, _ in built])
+    AuthorAggregateCount.objects.bulk_create([count for _, counts in built for count in counts],
+                                             batch_size=AGGREGATE_BATCH_SIZE)
+    return len(built)
+
+
+def rebuild_author_aggregates():
+    """
+    Rebuilds both tables from a single key-ordered pass over DataExtractionAuthor.
+    Returns the number of aggregate rows written.
+    """
+    total = 0
+    with transaction.atomic():
+        AuthorAggregateCount.objects.all().delete()
+        AuthorAggregate.objects.all().delete()
+        batch = []
+        for built in build_author_aggregates(
+                author_key_rows(DataExtractionAuthor.objects.all()).iterator(chunk_size=AGGREGATE_BATCH_SIZE)):
+            batch.append(built)
+            if len(batch) >= AGGREGATE_BATCH_SIZE:
+                total += save_author_aggregates(batch)
+                batch = []
+        total += save_author_aggregates(batch)
+    return total
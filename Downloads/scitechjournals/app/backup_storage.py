@@ -0,0 +1,80 @@
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Upload targets of the database backups, chosen by settings.DB_BACKUP['STORAGE'] and
+# built with its 'STORAGE_OPTIONS'. A storage saves a local file and returns a link to it.
+
+
+class BackupStorage:
+    def save(self, path):
+        """Stores the file at `path` and returns a link to the stored copy."""
+        raise NotImplementedError
+
+
+class LocalStorage(BackupStorage):
+    """Copies backups into a directory, e.g. a mounted network share, or a temp dir in tests."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def save(self, path):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        destination = self.directory / os.path.basename(path)
+        shutil.copyfile(path, destination)
+        return destination.resolve().as_uri()
+
+
+class GoogleDriveStorage(BackupStorage):
+    """Uploads backups to a Drive folder in resumable chunks; the files stay private."""
+
+    scopes = ['https://www.googleapis.com/auth/drive.file']
+
+    def __init__(self, folder_id, credentials_file='google_drive_save.json', token_file='token.pickle'):
+        self.folder_id = folder_id
+        self.credentials_file = credentials_file
+        self.token_file = token_file
+
+    def service(self):
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from googleapiclient.discovery import build
+
+        creds = None
+        if os.path.exists(self.token_file):
+            with open(self.token_file, 'rb') as token:
+                creds = pickle.load(token)
+        if not creds or not creds.valid:
+            flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
+            # Use browser-based OAuth flow
+            creds = flow.run_local_server(port=0)
+            with open(self.token_file, 'wb') as token:
+                pickle.dump(creds, token)
+        return build('drive', 'v3', credentials=creds)
+
+    def save(self, path):
+        from googleapiclient.http import MediaFileUpload
+
+        media = MediaFileUpload(path, mimetype='application/octet-stream', resumable=True)
+        request = self.service().files().create(
+            body={'name': os.path.basename(path), 'parents': [self.folder_id]},
+            media_body=media,
+            fields='id,webViewLink'
+        )
+        response = None
+        while response is None:
+            try:
+                status, response = request.next_chunk()
+                if status:
+                    print(f"📤 Upload progress: {int(status.progress() * 100)}%")
+            except Exception as e:
+                raise Exception(f"Chunked upload failed: {e}")
+        return response['webViewLink']
+
+
+def get_backup_storage():
+    config = settings.DB_BACKUP
+    return import_string(config['STORAGE'])(**config.get('STORAGE_OPTIONS', {}))
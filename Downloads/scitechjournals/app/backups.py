@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+
+from app.exports import COMPRESSED_EXTENSIONS
+from app.models import BackupDataExtractionLog
+
+# Incremental backups of app/data_extraction (backup_data_extraction_zip.py). Every
+# successful backup stores a manifest of the whole tree, path -> [size, mtime, sha256,
+# archive], where archive is the backup zip holding that content. The next run only
+# hashes files whose size or mtime changed and only archives files whose content did,
+# so restoring a backup means extracting each manifest entry from its archive.
+
+DATA_EXTRACTION_DIR = os.path.join(settings.BASE_DIR, "app", "data_extraction")
+BACKUPS_DIR = os.path.join(settings.BASE_DIR, "app", "data_extraction_backups")
+
+# Incremental backups between two full snapshots, which bound the chain a restore needs
+FULL_SNAPSHOT_EVERY = 7
+
+# Copy of the manifest in every archive, so a chain can be restored without the database
+MANIFEST_MEMBER = "__backup_manifest__.json"
+
+# Top-level directories of the tree that aren't backed up (exports written before they
+# moved to settings.EXPORT_ROOT)
+EXCLUDED_DIRS = {"exports"}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_tree(folder, previous=None):
+    """
+    Manifest of the files under `folder`, relative paths with '/' separators. Entries
+    whose size and mtime match `previous` are reused without reading the file, changed
+    ones are hashed to tell a touched file from new content; an entry is left without
+    an archive when its content isn't in any backup yet.
+    """
+    previous = previous or {}
+    manifest = {}
+    for root, dirs, files in os.walk(folder):
+        if os.path.samefile(root, folder):
+            dirs[:] = [name for name in dirs if name not in EXCLUDED_DIRS]
+        for file in files:
+            full_path = os.path.join(root, file)
+            path = os.path.relpath(full_path, folder).replace(os.sep, "/")
+            stat = os.stat(full_path)
+            known = previous.get(path)
+            if known and known[0] == stat.st_size and known[1] == stat.st_mtime:
+                manifest[path] = known
+                continue
+            # New files are hashed as they are archived (create_archive)
+            sha256 = file_sha256(full_path) if known else None
+            archive = known[3] if known and known[2] == sha256 else None
+            manifest[path] = [stat.st_size, stat.st_mtime, sha256, archive]
+    return manifest
+
+
+def archive_file(archive, full_path, path, compression):
+    """
+    Copies a file into an open archive and returns the sha256 of the bytes written, which
+    is what a restore checks against even if the file changed since it was scanned.
+    """
+    digest = hashlib.sha256()
+    info = zipfile.ZipInfo.from_file(full_path, path)
+    info.compress_type = compression
+    with open(full_path, "rb") as source, archive.open(info, "w", force_zip64=True) as member:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            member.write(chunk)
+    return digest.hexdigest()
+
+
+def last_successful_backup():
+    """The latest successful backup with a manifest, the base of the next incremental one."""
+    return (BackupDataExtractionLog.objects.filter(status="SUCCESS").exclude(manifest={})
+            .order_by("-timestamp", "-id").first())
+
+
+def backup_chain(backup):
+    """The backups from the full snapshot a backup builds on up to the backup itself."""
+    chain = [backup]
+    while chain[0].kind == "INCREMENTAL" and chain[0].base_id:
+        chain.insert(0, chain[0].base)
+    return chain
+
+
+def create_archive(folder, backups_dir, full=False):
+    """
+    Writes the next backup archive of `folder` and returns (zip_path, zip_name, kind,
+    base, manifest, files_archived). Incremental archives only hold the new and changed
+    files; when nothing changed no archive is written and zip_path is None.
+    """
+    base = last_successful_backup()
+    if base is not None and not full:
+        full = len(backup_chain(base)) > FULL_SNAPSHOT_EVERY
+    kind = "FULL" if full or base is None else "INCREMENTAL"
+
+    manifest = scan_tree(folder, None if kind == "FULL" else base.manifest)
+    changed = sorted(path for path, entry in manifest.items() if entry[3] is None)
+    if not changed and kind == "INCREMENTAL":
+        return None, "", kind, base, manifest, 0
+
+    zip_name = f"data_extraction_{kind.lower()}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.zip"
+    zip_path = os.path.join(backups_dir, zip_name)
+    os.makedirs(backups_dir, exist_ok=True)
+    files_archived = 0
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for path in changed:
+            compression = zipfile.ZIP_STORED if path.lower().endswith(COMPRESSED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+            # Uploads and exports may write the file between the scan and here: the size and
+            # mtime stay those scanned (a later change is picked up by the next run), the
+            # hash is the archived content's
+            try:
+                manifest[path][2] = archive_file(archive, os.path.join(folder, path), path, compression)
+            except FileNotFoundError:
+                # Deleted since the scan
+                del manifest[path]
+                continue
+            manifest[path][3] = zip_name
+            files_archived += 1
+        archive.writestr(MANIFEST_MEMBER, json.dumps({"kind": kind, "manifest": manifest}))
+
+    return zip_path, zip_name, kind, base if kind == "INCREMENTAL" else None, manifest, files_archived
+
+
+def read_archive_manifest(zip_path):
+    with zipfile.ZipFile(zip_path) as archive:
+        return json.loads(archive.read(MANIFEST_MEMBER))["manifest"]
+
+
+def restore_tree(manifest, backups_dir, target):
+    """
+    Rebuilds the tree described by a manifest into `target` from the archives of its
+    chain, checking every file against its sha256. Returns the number of files restored.
+    """
+    by_archive = defaultdict(list)
+    for path, (_, mtime, sha256, archive) in manifest.items():
+        by_archive[archive].append((path, mtime, sha256))
+
+    missing = sorted(name for name in by_archive if not name or not os.path.exists(os.path.join(backups_dir, name)))
+    if missing:
+        raise FileNotFoundError(f"Backup archives not found in {backups_dir}: {', '.join(map(str, missing))}")
+
+    restored = 0
+    for name, entries in sorted(by_archive.items()):
+        with zipfile.ZipFile(os.path.join(backups_dir, name)) as archive:
+            for path, mtime, sha256 in entries:
+                full_path = os.path.join(target, *path.split("/"))
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with archive.open(path) as source, open(full_path, "wb") as output:
+                    while chunk := source.read(HASH_CHUNK_SIZE):
+                        output.write(chunk)
+                if file_sha256(full_path) != sha256:
+                    raise ValueError(f"Checksum mismatch for {path} restored from {name}")
+                os.utime(full_path, (mtime, mtime))
+                restored += 1
+    return restored
+
+
+# Database dumps (backup_db.py): format -> (pg_dump -F flag, file suffix). Directory and
+# custom dumps compress the table data and are restored with pg_restore (-j N for parallel
+# restores); only directory dumps can also be written by parallel jobs.
+DUMP_FORMATS = {
+    "directory": ("d", ".tar"),
+    "custom": ("c", ".dump"),
+    "plain": ("p", ".sql"),
+}
+
+
+def pg_dump_command(database, output_path, dump_format="directory", jobs=1, compress=None, pg_dump="pg_dump"):
+    """pg_dump arguments for a settings.DATABASES entry."""
+    command = [pg_dump, "-h", database.get("HOST") or "localhost", "-p", str(database.get("PORT") or 5432),
+               "-U", database["USER"], f"-F{DUMP_FORMATS[dump_format][0]}", "-f", output_path]
+    if dump_format == "directory" and jobs > 1:
+        command += ["-j", str(jobs)]
+    if compress is not None:
+        command += ["-Z", str(compress)]
+    return command + [database["NAME"]]
+
+
+def dump_database(database, backup_dir, name, options):
+    """
+    Dumps a database with the settings.DB_BACKUP options and returns the path of the
+    single file to upload: directory dumps are packed into an uncompressed tar, their
+    table files being compressed already.
+    """
+    dump_format = options.get("FORMAT", "directory")
+    suffix = DUMP_FORMATS[dump_format][1]
+    if dump_format == "plain" and options.get("COMPRESS"):
+        suffix += ".gz"
+    os.makedirs(backup_dir, exist_ok=True)
+    dump_path = os.path.join(backup_dir, name if dump_format == "directory" else name + suffix)
+
+    env = os.environ.copy()
+    env["PGPASSWORD"] = database.get("PASSWORD") or ""
+    subprocess.run(pg_dump_command(database, dump_path, dump_format, options.get("JOBS", 1),
+                                   options.get("COMPRESS"), options.get("PG_DUMP", "pg_dump")),
+                   check=True, env=env, capture_output=True, text=True)
+    if dump_format != "directory":
+        return dump_path
+
+    archive_path = dump_path + suffix
+    with tarfile.open(archive_path, "w") as archive:
+        archive.add(dump_path, arcname=name)
+    shutil.rmtree(dump_path)
+    return archive_path
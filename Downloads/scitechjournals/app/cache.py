@@ -0,0 +1,102 @@
+import logging
+import time
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Seconds to keep using the local-memory cache after Redis failed, before retrying it
+REDIS_RETRY_AFTER = 30
+
+DATA_VERSION_KEY = 'data_version'
+
+_redis_down_since = None
+
+# Version keys bumped while Redis was unreachable (the bump only reached the local
+# cache), replayed on Redis once it answers again so it stops serving older entries
+_pending_bumps = set()
+
+
+def _redis_bump(key):
+    try:
+        caches['default'].incr(key)
+    except ValueError:
+        caches['default'].set(key, int(time.time()), None)
+
+
+def _replay_pending_bumps():
+    while _pending_bumps:
+        key = next(iter(_pending_bumps))
+        _redis_bump(key)
+        _pending_bumps.discard(key)
+
+
+def _call(method, *args, **kwargs):
+    """
+    Runs a cache operation on Redis ('default'), falling back to the per-process
+    'local' cache while Redis is unreachable.
+    """
+    global _redis_down_since
+    if _redis_down_since is None or time.monotonic() - _redis_down_since > REDIS_RETRY_AFTER:
+        try:
+            result = getattr(caches['default'], method)(*args, **kwargs)
+            _replay_pending_bumps()
+            _redis_down_since = None
+            return result
+        except ValueError:
+            # Raised by incr() on a missing key, not a connection problem
+            raise
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, using local memory cache: {e}")
+            _redis_down_since = time.monotonic()
+    return getattr(caches['local'], method)(*args, **kwargs)
+
+
+def cache_get(key, default=None):
+    return _call('get', key, default)
+
+
+def cache_set(key, value, timeout=None):
+    _call('set', key, value, timeout)
+
+
+def cached(key, compute, timeout=None):
+    """Value of `key`, computed by compute() and stored on a miss."""
+    value = cache_get(key)
+    if value is None:
+        value = compute()
+        cache_set(key, value, timeout)
+    return value
+
+
+def cache_add(key, value, timeout=None):
+    """Sets the key only if it is missing; returns whether it was set."""
+    return _call('add', key, value, timeout)
+
+
+def get_version(key):
+    """
+    Version counter stored under `key`, part of the keys of the entries it versions:
+    bumping it invalidates all of them at once. It starts from the current timestamp
+    so a counter lost to eviction never reuses an old version.
+    """
+    cache_add(key, int(time.time()), None)
+    return cache_get(key, 0)
+
+
+def bump_version(key):
+    try:
+        _call('incr', key)
+    except ValueError:
+        cache_set(key, int(time.time()), None)
+    if _redis_down_since is not None:
+        _pending_bumps.add(key)
+
+
+def get_data_version():
+    """Version bumped whenever extracted data changes; part of every search result key."""
+    return get_version(DATA_VERSION_KEY)
+
+
+def bump_data_version():
+    bump_version(DATA_VERSION_KEY)
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+from app.cache import cache_add, cache_get, cache_set, get_data_version
+from app.reports import COUNT_REPORTS
+
+logger = logging.getLogger(__name__)
+
+# Seconds a queued exact count blocks re-queuing the same count
+COUNT_PENDING_TIMEOUT = 10 * 60
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate of a queryset (EXPLAIN, nothing is executed), or None
+    when the database can't provide one.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        # e.g. queryset.none() for an invalid filter
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except Exception as e:
+        logger.warning(f"Could not estimate row count: {e}")
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def report_queryset(name, params):
+    queryset_for, _ = COUNT_REPORTS[name]
+    return queryset_for(**params)
+
+
+def report_params(name, values):
+    """The count params of a report, read from a GET/POST dict."""
+    _, param_names = COUNT_REPORTS[name]
+    return {key: (values.get(key) or '').strip() for key in param_names}
+
+
+def count_cache_key(name, params):
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"count:{name}:{get_data_version()}:{digest}"
+
+
+def compute_exact_count(name, params):
+    count = report_queryset(name, params).count()
+    cache_set(count_cache_key(name, params), count, settings.SEARCH_CACHE_TIMEOUT)
+    return count
+
+
+def report_count(name, params):
+    """
+    Total rows of a report as {"count": n, "exact": bool}.
+
+    Exact counts are cached per data version. Until one is available the planner
+    estimate is returned (None when EXPLAIN fails) and the exact COUNT() is queued
+    in the background, once per report/filters. Small estimates are queued too:
+    the planner often underestimates icontains and array filters badly.
+    """
+    key = count_cache_key(name, params)
+    count = cache_get(key)
+    if count is not None:
+        return {"count": count, "exact": True}
+
+    queryset = report_queryset(name, params)
+    if queryset.query.is_empty():
+        # queryset.none() for an invalid filter
+        return {"count": 0, "exact": True}
+    estimate = estimate_count(queryset)
+
+    if cache_add(f"{key}:pending", True, COUNT_PENDING_TIMEOUT):
+        from app.tasks import compute_report_count
+        try:
+            compute_report_count.delay(name, params)
+        except Exception as e:
+            logger.warning(f"Could not queue exact count for {name}: {e}")
+    return {"count": estimate, "exact": False}
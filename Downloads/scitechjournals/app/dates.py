@@ -0,0 +1,75 @@
+import re
+from datetime import date
+
+# Parsing of the free-text publication dates of the PubMed, PubMed Central, Europe PMC
+# and ScienceDirect imports into the indexed publication_year / publication_date columns
+
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+ISO_DATE_RE = re.compile(r'\b((?:19|20)\d{2})-(\d{1,2})(?:-(\d{1,2}))?\b')
+# "2021 Jan 15", "2021 Jan-Feb", "15 January 2021", "January 2021"
+YEAR_MONTH_RE = re.compile(r'\b((?:19|20)\d{2})\s+([A-Za-z]{3,})\.?(?:\s+(\d{1,2})\b)?')
+DAY_MONTH_YEAR_RE = re.compile(r'(?:\b(\d{1,2})\s+)?\b([A-Za-z]{3,})\.?,?\s+((?:19|20)\d{2})\b')
+YEAR_RANGE_RE = re.compile(r'^\s*((?:19|20)\d{2})\s*(?:[-–]\s*((?:19|20)\d{2})\s*)?$')
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+
+def parse_publication_year(*values):
+    """First 19xx/20xx year found in the given texts (e.g. published_year, published_date)."""
+    for value in values:
+        match = YEAR_RE.search(str(value or ''))
+        if match:
+            return int(match.group(0))
+    return None
+
+
+def _date(year, month=1, day=1):
+    try:
+        return date(int(year), int(month), int(day or 1))
+    except ValueError:
+        try:
+            return date(int(year), int(month), 1)
+        except ValueError:
+            return date(int(year), 1, 1)
+
+
+def parse_publication_date(*values):
+    """
+    Publication date from the given texts, precise to the day, month or year the text
+    gives ('2021 Jan' -> 2021-01-01, '2021' -> 2021-01-01). None when no year is found.
+    """
+    for value in values:
+        text = str(value or '')
+        match = ISO_DATE_RE.search(text)
+        if match:
+            return _date(match.group(1), match.group(2), match.group(3))
+        match = YEAR_MONTH_RE.search(text)
+        if match and match.group(2)[:3].lower() in MONTHS:
+            return _date(match.group(1), MONTHS[match.group(2)[:3].lower()], match.group(3))
+        match = DAY_MONTH_YEAR_RE.search(text)
+        if match and match.group(2)[:3].lower() in MONTHS:
+            return _date(match.group(3), MONTHS[match.group(2)[:3].lower()], match.group(1))
+    year = parse_publication_year(*values)
+    return _date(year) if year else None
+
+
+def parse_year_range(value):
+    """
+    Year filter value -> (first, last) inclusive: '2021' -> (2021, 2021),
+    '2019-2023' -> (2019, 2023). None when the value isn't a year or year range.
+    """
+    match = YEAR_RANGE_RE.match(str(value or ''))
+    if not match:
+        return None
+    first, last = int(match.group(1)), int(match.group(2) or match.group(1))
+    return min(first, last), max(first, last)
+
+
+def format_year_range(first, last):
+    """Inverse of parse_year_range, for filter links: '2021' or '2019-2023'."""
+    first, last = first or last, last or first
+    if not str(first or '').isdigit() or not str(last).isdigit():
+        return ''
+    first, last = min(int(first), int(last)), max(int(first), int(last))
+    return str(first) if first == last else f"{first}-{last}"
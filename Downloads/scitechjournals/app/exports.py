@@ -0,0 +1,246 @@
+import csv
+import re
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+
+# Rows fetched per round trip from the server-side cursor (.iterator(chunk_size=...))
+EXPORT_CHUNK_SIZE = 2000
+
+# Bytes accumulated before a chunk is handed to the client
+STREAM_FLUSH_BYTES = 64 * 1024
+
+# Archive members deflate can't shrink any further: stored as they are
+COMPRESSED_EXTENSIONS = ('.xlsx', '.xlsm', '.docx', '.zip', '.gz', '.bz2', '.xz', '.7z', '.pdf', '.png', '.jpg', '.jpeg')
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+INVALID_XML_CHARS = re.compile(r"[^\u0009\u000A\u000D\u0020-\uD7FF\uE000-\uFFFD]")
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{overrides}'
+    '</Types>'
+)
+SHEET_OVERRIDE_XML = (
+    '<Override PartName="/xl/worksheets/sheet{index}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets>'
+    '</workbook>'
+)
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{relationships}'
+    '</Relationships>'
+)
+WORKSHEET_HEAD_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+WORKSHEET_TAIL_XML = '</sheetData></worksheet>'
+
+
+class StreamBuffer:
+    """
+    Write-only, non-seekable file object. zipfile writes into it (using data
+    descriptors, since it cannot seek back) and the generator drains it.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+def column_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA ..."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def xlsx_cell(reference, value):
+    if value is None or value == '':
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = INVALID_XML_CHARS.sub('', str(value))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def xlsx_row(row_number, values):
+    cells = ''.join(xlsx_cell(f'{column_letter(i)}{row_number}', value) for i, value in enumerate(values))
+    return f'<row r="{row_number}">{cells}</row>'.encode('utf-8')
+
+
+def iter_xlsx(sheets):
+    """
+    Writes an .xlsx workbook incrementally and yields its bytes chunk by chunk.
+
+    `sheets` is a list of (title, header, rows) where rows is any iterable of
+    sequences, typically a queryset .iterator(). Cells are written as inline
+    strings, so memory stays flat regardless of the number of rows.
+    """
+    buffer = StreamBuffer()
+    titles = [INVALID_XML_CHARS.sub('', title)[:31] for title, _, _ in sheets]
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr('[Content_Types].xml', CONTENT_TYPES_XML.format(
+            overrides=''.join(SHEET_OVERRIDE_XML.format(index=i) for i in range(1, len(sheets) + 1))
+        ))
+        workbook.writestr('_rels/.rels', ROOT_RELS_XML)
+        workbook.writestr('xl/workbook.xml', WORKBOOK_XML.format(sheets=''.join(
+            f'<sheet name="{escape(title, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, title in enumerate(titles, start=1)
+        )))
+        workbook.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_XML.format(relationships=''.join(
+            f'<Relationship Id="rId{i}" '
+            f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(sheets) + 1)
+        )))
+
+        for index, (_, header, rows) in enumerate(sheets, start=1):
+            with workbook.open(f'xl/worksheets/sheet{index}.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(WORKSHEET_HEAD_XML.encode('utf-8'))
+                sheet.write(xlsx_row(1, header))
+                for row_number, row in enumerate(rows, start=2):
+                    sheet.write(xlsx_row(row_number, row))
+                    if buffer.size >= STREAM_FLUSH_BYTES:
+                        yield buffer.drain()
+                sheet.write(WORKSHEET_TAIL_XML.encode('utf-8'))
+            yield buffer.drain()
+
+    yield buffer.drain()
+
+
+def iter_file(path, chunk_size=STREAM_FLUSH_BYTES):
+    """Yields the bytes of a file on disk chunk by chunk, opening it on the first read."""
+    with open(path, 'rb') as source:
+        while chunk := source.read(chunk_size):
+            yield chunk
+
+
+def iter_zip(files, compression=zipfile.ZIP_DEFLATED):
+    """
+    Writes a .zip archive incrementally and yields its bytes chunk by chunk. `files`
+    is an iterable of (name, chunks) where chunks is an iterable of bytes, e.g.
+    iter_xlsx() or iter_file(). Members that are already compressed (see
+    COMPRESSED_EXTENSIONS) are always stored; ZIP64 is used for every member since
+    sizes aren't known up front.
+    """
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression, allowZip64=True) as archive:
+        for name, chunks in files:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED if name.lower().endswith(COMPRESSED_EXTENSIONS) else compression
+            with archive.open(info, 'w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    if buffer.size >= STREAM_FLUSH_BYTES:
+                        yield buffer.drain()
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: writerow() returns the formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """
+    Writes CSV incrementally, yielding it in chunks of roughly STREAM_FLUSH_BYTES.
+    """
+    writer = csv.writer(Echo())
+    lines = [writer.writerow(header)]
+    size = 0
+    for row in rows:
+        line = writer.writerow(row)
+        lines.append(line)
+        size += len(line)
+        if size >= STREAM_FLUSH_BYTES:
+            yield ''.join(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield ''.join(lines)
+
+
+def write_export(path, file_format, sheets):
+    """
+    Writes an export to a file on disk (background export jobs). CSV exports only
+    have one sheet.
+    """
+    with open(path, 'wb') as output:
+        if file_format == 'csv':
+            _, header, rows = sheets[0]
+            for chunk in iter_csv(header, rows):
+                output.write(chunk.encode('utf-8'))
+        else:
+            for chunk in iter_xlsx(sheets):
+                output.write(chunk)
+
+
+def streaming_xlsx_response(filename, sheets):
+    response = StreamingHttpResponse(iter_xlsx(sheets), content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_csv_response(filename, header, rows):
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_zip_response(filename, files, compression=zipfile.ZIP_DEFLATED):
+    response = StreamingHttpResponse(iter_zip(files, compression), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
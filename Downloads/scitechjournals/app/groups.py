@@ -0,0 +1,31 @@
+from django.db import transaction
+
+from app.models import DataExtractionGroup, DataExtractionGroupMembership
+
+# Membership of DataExtraction rows in DataExtractionGroups, kept relational so group
+# filters are indexed joins instead of matches on the comma-separated text
+
+
+def parse_group_ids(extraction_groups):
+    """'3, 7' (DataExtraction.extraction_groups) -> [3, 7]"""
+    return sorted({int(g) for g in (extraction_groups or '').split(',') if g.strip().isdigit()})
+
+
+def sync_extraction_groups(extraction):
+    """Makes the extraction's memberships match its extraction_groups text (unknown ids are skipped)."""
+    group_ids = set(DataExtractionGroup.objects
+                    .filter(id__in=parse_group_ids(extraction.extraction_groups))
+                    .values_list('id', flat=True))
+    with transaction.atomic():
+        DataExtractionGroupMembership.objects.filter(extraction=extraction).exclude(group_id__in=group_ids).delete()
+        DataExtractionGroupMembership.objects.bulk_create(
+            [DataExtractionGroupMembership(extraction=extraction, group_id=group_id) for group_id in sorted(group_ids)],
+            ignore_conflicts=True)
+
+
+def extraction_ids_in_groups(groups):
+    """
+    Semi-join subquery of the extractions in any of `groups` (ids or a group queryset),
+    each extraction once however many of the groups it belongs to.
+    """
+    return DataExtractionGroupMembership.objects.filter(group__in=groups).values('extraction_id')
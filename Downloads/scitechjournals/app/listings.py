@@ -0,0 +1,71 @@
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from app.dates import parse_year_range
+from app.models import Article, Author, Journal
+from app.search import SEARCH_CONFIG, substring_match_ids
+
+# ScienceDirect journal / article / author lists, paged by app.pagination.keyset_page.
+# Every sort is backed by an index ending in id, and rows carry only the columns the
+# tables show plus the sort key the next-page cursor needs.
+
+SCIENCE_DIRECT_PAGE_SIZE = 50
+
+
+def journals_queryset(q=""):
+    journals = Journal.objects.all()
+    if q:
+        journals = journals.annotate(name_lower=Lower("journal_name")).filter(name_lower__contains=q.lower())
+    return journals.values("id", "journal_name", "total_articles", "subject")
+
+
+def articles_queryset(q="", year=""):
+    articles = Article.objects.filter(is_email=True)
+    if q:
+        # LOWER(article_title) LIKE '%q%' on the article_title_trgm index
+        articles = articles.filter(id__in=substring_match_ids(Article, "article_title", [q]))
+    if year:
+        years = parse_year_range(year)
+        articles = articles.filter(publication_year__range=years) if years else articles.none()
+    return articles.values("id", "article_title", "author_emails", "journal_id", "published_date",
+                           "published_month", "published_year", "publication_date")
+
+
+def authors_queryset(q="", domain=""):
+    authors = Author.objects.all()
+    if q:
+        authors = authors.filter(search_vector=SearchQuery(q, search_type="websearch", config=SEARCH_CONFIG))
+    if domain:
+        authors = authors.filter(email_domain=domain.lower().lstrip("@"))
+    return authors.values("id", "article_title", "author_name", "author_email", "email_normalized",
+                          published_date=F("article__published_date"),
+                          published_month=F("article__published_month"),
+                          published_year=F("article__published_year"))
+
+
+# list -> (queryset builder, filter params, {sort: order_by}); the first sort is the default
+SCIENCE_DIRECT_LISTS = {
+    "journals": (journals_queryset, ("q",), {
+        "name": ("journal_name", "id"),
+        "articles": ("-total_articles", "-id"),
+        "newest": ("-id",),
+    }),
+    "articles": (articles_queryset, ("q", "year"), {
+        "newest": ("-id",),
+        "published": ("-publication_date", "-id"),
+    }),
+    "authors": (authors_queryset, ("q", "domain"), {
+        "newest": ("-id",),
+        "name": ("author_name", "id"),
+        "email": ("email_normalized", "id"),
+    }),
+}
+
+
+def science_direct_list_queryset(name, values):
+    """Ordered rows of a ScienceDirect list for the filters and sort in a GET dict."""
+    queryset_for, param_names, sorts = SCIENCE_DIRECT_LISTS[name]
+    params = {key: (values.get(key) or "").strip() for key in param_names}
+    sort = values.get("sort") if values.get("sort") in sorts else next(iter(sorts))
+    return queryset_for(**params).order_by(*sorts[sort])
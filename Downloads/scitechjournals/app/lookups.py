@@ -0,0 +1,51 @@
+from django.db.models.functions import Lower
+
+from app.cache import DATA_VERSION_KEY, bump_version, cached, get_version
+from app.models import DashboardStat, DataExtractionGroup, Users
+
+# Small lookup lists behind the dropdowns and facets, cached under named, versioned
+# keys (lookup:<name>:<version>). Bumping a lookup's version (see app.signals) makes
+# every page read a fresh copy; the old entries are never read again and expire.
+
+# Entries are replaced through their version, the timeout only bounds the memory they hold
+LOOKUP_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _users():
+    return list(Users.objects.order_by("first_name", "last_name", "id")
+                .values("id", "first_name", "last_name", "email"))
+
+
+def _groups():
+    return list(DataExtractionGroup.objects.order_by(Lower("group_name"), "id")
+                .values("id", "group_name", "user_id"))
+
+
+def _publication_years():
+    # The per-year article counters kept by app.stats, instead of a DISTINCT over every article
+    keys = DashboardStat.objects.filter(kind="year").values_list("key", flat=True)
+    return sorted(int(key) for key in keys if key.isdigit())
+
+
+# name -> (builder, version key). Facets of the extracted data follow the data version,
+# which save_extraction_items and extraction deletes already bump.
+LOOKUPS = {
+    "users": (_users, "lookup_version:users"),
+    "groups": (_groups, "lookup_version:groups"),
+    "publication_years": (_publication_years, DATA_VERSION_KEY),
+}
+
+
+def lookup(name):
+    """The cached rows of a named lookup, rebuilt on the first read after an invalidation."""
+    build, version_key = LOOKUPS[name]
+    return cached(f"lookup:{name}:{get_version(version_key)}", build, LOOKUP_CACHE_TIMEOUT)
+
+
+def invalidate_lookup(name):
+    bump_version(LOOKUPS[name][1])
+
+
+def user_groups(user_id):
+    """The groups assigned to a user, from the cached groups lookup."""
+    return [group for group in lookup("groups") if user_id is not None and group["user_id"] == int(user_id)]
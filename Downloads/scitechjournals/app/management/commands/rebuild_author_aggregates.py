@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.aggregates import rebuild_author_aggregates
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the AuthorAggregate table (Top Authors) from every DataExtractionAuthor row."
+
+    def handle(self, *args, **options):
+        total = rebuild_author_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} author aggregates."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.stats import rebuild_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the DashboardStat counters (dashboard charts) from the current data."
+
+    def handle(self, *args, **options):
+        total = rebuild_dashboard_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} dashboard counters."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.stats import rebuild_upload_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the DailyUploadRollup rows (user upload reports) from the current extractions."
+
+    def handle(self, *args, **options):
+        total = rebuild_upload_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} daily upload rollups."))
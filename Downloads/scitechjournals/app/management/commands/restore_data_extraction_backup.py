@@ -0,0 +1,41 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.backups import BACKUPS_DIR, backup_chain, last_successful_backup, read_archive_manifest, restore_tree
+from app.models import BackupDataExtractionLog
+
+
+class Command(BaseCommand):
+    help = ("Rebuilds the app/data_extraction tree of a backup (the latest successful one by default) "
+            "into an empty directory, from the archives of its full + incremental chain.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", help="Directory to restore into; must not exist or be empty.")
+        parser.add_argument("--backup", type=int, help="BackupDataExtractionLog id to restore.")
+        parser.add_argument("--archive", help="Restore from the manifest stored in this archive, "
+                                              "without the backup logs.")
+        parser.add_argument("--backups-dir", default=BACKUPS_DIR,
+                            help="Directory holding the backup archives (downloaded from Drive if needed).")
+
+    def handle(self, *args, **options):
+        target, backups_dir = options["target"], options["backups_dir"]
+        if os.path.isdir(target) and os.listdir(target):
+            raise CommandError(f"{target} is not empty.")
+
+        if options["archive"]:
+            manifest = read_archive_manifest(os.path.join(backups_dir, options["archive"]))
+        else:
+            backup = (BackupDataExtractionLog.objects.filter(id=options["backup"], status="SUCCESS").first()
+                      if options["backup"] else last_successful_backup())
+            if backup is None or not backup.manifest:
+                raise CommandError("No successful backup with a manifest to restore.")
+            chain = backup_chain(backup)
+            self.stdout.write("Chain: " + " -> ".join(log.archive_name or f"#{log.id} (no changes)" for log in chain))
+            manifest = backup.manifest
+
+        try:
+            restored = restore_tree(manifest, backups_dir, target)
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} files into {target}."))
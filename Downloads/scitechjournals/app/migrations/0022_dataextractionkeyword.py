@@ -0,0 +1,55 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def backfill_keywords(apps, schema_editor):
+    DataExtractionArticle = apps.get_model('app', 'DataExtractionArticle')
+    DataExtractionKeyword = apps.get_model('app', 'DataExtractionKeyword')
+
+    articles = (DataExtractionArticle.objects
+                .exclude(article_keywords__isnull=True)
+                .values_list('id', 'article_keywords'))
+
+    batch = []
+    for article_id, keywords in articles.iterator(chunk_size=2000):
+        if not isinstance(keywords, list):
+            continue
+        normalized = {kw.strip().lower() for kw in keywords if isinstance(kw, str) and kw.strip()}
+        batch.extend(DataExtractionKeyword(article_id=article_id, keyword=kw) for kw in normalized)
+        if len(batch) >= BATCH_SIZE:
+            DataExtractionKeyword.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    if batch:
+        DataExtractionKeyword.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0021_backupdataextractionlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataExtractionKeyword',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('keyword', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keywords', to='app.dataextractionarticle')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['keyword', 'article'], name='app_dataext_keyword_3d8f43_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dataextractionkeyword',
+            constraint=models.UniqueConstraint(fields=('article', 'keyword'), name='uniq_data_extraction_article_keyword'),
+        ),
+        migrations.RunPython(backfill_keywords, migrations.RunPython.noop),
+    ]
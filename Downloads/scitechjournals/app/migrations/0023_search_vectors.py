@@ -0,0 +1,75 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Max
+
+BATCH_SIZE = 10000
+
+
+def backfill_search_vectors(apps, schema_editor):
+    def weighted(column, weight):
+        return SearchVector(column, weight=weight, config='english')
+
+    targets = [
+        ('DataExtractionArticle', weighted('article_title', 'A') + weighted('article_keywords', 'B')),
+        ('DataExtractionAuthor', weighted('author_name', 'A') + weighted('author_affiliation', 'B')
+         + weighted('author_country', 'C')),
+        ('Article', weighted('article_title', 'A')),
+        ('Author', weighted('author_name', 'A') + weighted('article_title', 'B')),
+    ]
+
+    for model_name, search_vector in targets:
+        model = apps.get_model('app', model_name)
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        for start in range(0, last_id, BATCH_SIZE):
+            model.objects.filter(id__gt=start, id__lte=start + BATCH_SIZE).update(search_vector=search_vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0022_dataextractionkeyword'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataextractionarticle',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataextractionauthor',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='app_article_search__7a6bf4_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='app_author_search__cd41d2_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionarticle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='app_dataext_search__0238b2_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='app_dataext_search__3dba2d_gin'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:03
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0023_search_vectors'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('author_name'), name='gin_trgm_ops'), name='dea_author_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('author_affiliation'), name='gin_trgm_ops'), name='dea_affiliation_trgm'),
+        ),
+    ]
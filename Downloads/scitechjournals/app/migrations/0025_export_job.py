@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0024_author_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_type', models.CharField(max_length=50)),
+                ('file_format', models.CharField(choices=[('excel', 'Excel'), ('csv', 'CSV')], default='excel', max_length=10)),
+                ('file_name', models.CharField(max_length=255)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILURE', 'Failure')], default='PENDING', max_length=20)),
+                ('file_path', models.TextField(blank=True, default='')),
+                ('row_count', models.BigIntegerField(default=0)),
+                ('message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to='app.users')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['requested_by', '-created_at'], name='app_exportj_request_fd85fa_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:10
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0025_export_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('article_title'), name='gin_trgm_ops'), name='article_title_trgm'),
+        ),
+    ]
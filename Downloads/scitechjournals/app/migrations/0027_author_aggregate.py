@@ -0,0 +1,130 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:12
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from collections import Counter
+from itertools import groupby
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Lower, Trim
+
+BATCH_SIZE = 5000
+ALL_GROUPS = 0
+
+
+def parse_year(value):
+    value = (value or '').strip()[:4]
+    return int(value) if value.isdigit() else None
+
+
+def backfill_author_aggregates(apps, schema_editor):
+    DataExtractionAuthor = apps.get_model('app', 'DataExtractionAuthor')
+    AuthorAggregate = apps.get_model('app', 'AuthorAggregate')
+    AuthorAggregateCount = apps.get_model('app', 'AuthorAggregateCount')
+
+    rows = (DataExtractionAuthor.objects
+            .annotate(name_norm=Lower(Trim(F('author_name'))),
+                      email_norm=Lower(Trim(Coalesce(F('author_email'), Value('')))))
+            .exclude(name_norm='')
+            .order_by('name_norm', 'email_norm', 'id')
+            .values_list('name_norm', 'email_norm', 'author_name', 'author_country', 'article_id',
+                         'article__published_year', 'article__data_extraction__extraction_groups'))
+
+    def save(batch):
+        AuthorAggregate.objects.bulk_create([aggregate for aggregate, _ in batch])
+        AuthorAggregateCount.objects.bulk_create([count for _, counts in batch for count in counts],
+                                                 batch_size=BATCH_SIZE)
+
+    batch = []
+    for (name_norm, email_norm), author_rows in groupby(rows.iterator(chunk_size=BATCH_SIZE),
+                                                        key=lambda row: (row[0], row[1])):
+        articles = {}
+        author_name, country = '', ''
+        for _, _, name, row_country, article_id, published_year, extraction_groups in author_rows:
+            author_name = (name or '').strip() or author_name
+            country = row_country or country
+            articles[article_id] = (
+                parse_year(published_year),
+                {int(g) for g in (extraction_groups or '').split(',') if g.strip().isdigit()},
+            )
+
+        years = {year for year, _ in articles.values() if year}
+        aggregate = AuthorAggregate(
+            name_norm=name_norm,
+            email_norm=email_norm,
+            email_domain=email_norm.rsplit('@', 1)[1] if '@' in email_norm else '',
+            author_name=author_name,
+            country=country,
+            article_count=len(articles),
+            first_year=min(years) if years else None,
+            last_year=max(years) if years else None,
+        )
+        counts = Counter()
+        for year, group_ids in articles.values():
+            for group_id in [ALL_GROUPS, *group_ids]:
+                counts[group_id, year] += 1
+        batch.append((aggregate, [AuthorAggregateCount(aggregate=aggregate, group_id=group_id, year=year,
+                                                       articles=count)
+                                  for (group_id, year), count in counts.items()]))
+        if len(batch) >= BATCH_SIZE:
+            save(batch)
+            batch = []
+
+    save(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0026_article_title_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorAggregate',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('name_norm', models.CharField(max_length=255)),
+                ('email_norm', models.CharField(blank=True, default='', max_length=255)),
+                ('email_domain', models.CharField(blank=True, default='', max_length=255)),
+                ('author_name', models.CharField(blank=True, default='', max_length=255)),
+                ('country', models.TextField(blank=True, default='')),
+                ('article_count', models.IntegerField(default=0)),
+                ('first_year', models.IntegerField(blank=True, null=True)),
+                ('last_year', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuthorAggregateCount',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('group_id', models.IntegerField(default=0)),
+                ('year', models.IntegerField(blank=True, null=True)),
+                ('articles', models.IntegerField(default=0)),
+                ('aggregate', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='counts', to='app.authoraggregate')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=models.Index(django.db.models.functions.text.Lower(django.db.models.functions.text.Trim('author_name')), name='dea_author_name_norm'),
+        ),
+        migrations.AddIndex(
+            model_name='authoraggregate',
+            index=models.Index(fields=['-article_count', 'name_norm'], name='author_agg_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='authoraggregate',
+            index=models.Index(fields=['email_domain', '-article_count'], name='author_agg_domain_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='authoraggregatecount',
+            index=models.Index(fields=['group_id', 'year', 'aggregate'], name='author_agg_count_range_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='authoraggregate',
+            constraint=models.UniqueConstraint(fields=('name_norm', 'email_norm'), name='uniq_author_aggregate_key'),
+        ),
+        migrations.RunPython(backfill_author_aggregates, migrations.RunPython.noop),
+    ]
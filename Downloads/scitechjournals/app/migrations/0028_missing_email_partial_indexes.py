@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0027_author_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=models.Index(condition=models.Q(('author_email__isnull', True), ('author_email', ''), _connector='OR'), fields=['id'], name='dea_missing_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=models.Index(condition=models.Q(('author_email__isnull', True), ('author_email', ''), _connector='OR'), fields=['article', 'id'], name='dea_missing_email_article_idx'),
+        ),
+    ]
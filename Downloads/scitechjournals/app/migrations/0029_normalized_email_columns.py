@@ -0,0 +1,73 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+BATCH_SIZE = 10000
+
+# Same normalization as app.search.normalize_email, for the rows that predate the columns
+BACKFILL_SQL = """
+    UPDATE {table}
+       SET email_normalized = lower(btrim(coalesce(author_email, ''), E' \\t\\r\\n')),
+           email_domain = coalesce(substring(lower(btrim(coalesce(author_email, ''), E' \\t\\r\\n')) from '@([^@]*)$'), '')
+     WHERE id >= %s AND id < %s
+"""
+
+
+def backfill_normalized_emails(apps, schema_editor):
+    # Id-range batches, each committed on its own (the migration is non-atomic)
+    # so large tables aren't rewritten in one long transaction
+    for model_name in ('Author', 'DataExtractionAuthor'):
+        model = apps.get_model('app', model_name)
+        last_id = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        sql = BACKFILL_SQL.format(table=schema_editor.quote_name(model._meta.db_table))
+        with schema_editor.connection.cursor() as cursor:
+            for start in range(0, last_id + 1, BATCH_SIZE):
+                cursor.execute(sql, [start, start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0028_missing_email_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='email_domain',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='email_normalized',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='dataextractionauthor',
+            name='email_domain',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='dataextractionauthor',
+            name='email_normalized',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(backfill_normalized_emails, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['email_normalized'], name='app_author_email_n_3094f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['email_domain'], name='app_author_email_d_d1c406_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=models.Index(fields=['email_normalized'], name='app_dataext_email_n_3207f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=models.Index(fields=['email_domain'], name='app_dataext_email_d_312552_idx'),
+        ),
+    ]
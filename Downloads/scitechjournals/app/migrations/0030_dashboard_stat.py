@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:20
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_dashboard_stats(apps, schema_editor):
+    DashboardStat = apps.get_model('app', 'DashboardStat')
+    DataExtraction = apps.get_model('app', 'DataExtraction')
+    DataExtractionArticle = apps.get_model('app', 'DataExtractionArticle')
+    DataExtractionAuthor = apps.get_model('app', 'DataExtractionAuthor')
+    DataExtractionGroup = apps.get_model('app', 'DataExtractionGroup')
+    DataExtractionKeyword = apps.get_model('app', 'DataExtractionKeyword')
+
+    counts = Counter({('groups', ''): DataExtractionGroup.objects.count()})
+    for kind, rows in (
+        ('extraction_type', DataExtraction.objects.values_list('extraction_type').annotate(count=Count('id'))),
+        ('user', DataExtraction.objects.values_list('extracted_by_id').annotate(count=Count('id'))),
+        ('keyword', DataExtractionKeyword.objects.values_list('keyword').annotate(count=Count('id'))),
+        ('year', DataExtractionArticle.objects.exclude(published_year__isnull=True).exclude(published_year='')
+                 .values_list('published_year').annotate(count=Count('id'))),
+        ('domain', DataExtractionAuthor.objects.exclude(email_domain='')
+                   .values_list('email_domain').annotate(count=Count('id'))),
+    ):
+        for key, count in rows:
+            counts[(kind, '' if key is None else key)] += count
+
+    DashboardStat.objects.bulk_create(
+        [DashboardStat(kind=kind, key=str(key), count=count) for (kind, key), count in counts.items() if count],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0029_normalized_email_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('groups', 'Groups'), ('extraction_type', 'Extractions per type'), ('user', 'Extractions per user'), ('keyword', 'Articles per keyword'), ('year', 'Articles per year'), ('domain', 'Authors per email domain')], max_length=20)),
+                ('key', models.TextField(blank=True, default='')),
+                ('count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', '-count'], name='dashboard_stat_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardstat',
+            constraint=models.UniqueConstraint(fields=('kind', 'key'), name='uniq_dashboard_stat'),
+        ),
+        migrations.RunPython(backfill_dashboard_stats, migrations.RunPython.noop),
+    ]
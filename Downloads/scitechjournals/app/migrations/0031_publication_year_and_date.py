@@ -0,0 +1,205 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:21
+
+import re
+from collections import Counter
+from datetime import date
+from itertools import groupby
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 5000
+ALL_GROUPS = 0  # AuthorAggregateCount.ALL_GROUPS
+
+# Frozen copy of the app.dates parsers at the time of this migration
+
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+ISO_DATE_RE = re.compile(r'\b((?:19|20)\d{2})-(\d{1,2})(?:-(\d{1,2}))?\b')
+YEAR_MONTH_RE = re.compile(r'\b((?:19|20)\d{2})\s+([A-Za-z]{3,})\.?(?:\s+(\d{1,2})\b)?')
+DAY_MONTH_YEAR_RE = re.compile(r'(?:\b(\d{1,2})\s+)?\b([A-Za-z]{3,})\.?,?\s+((?:19|20)\d{2})\b')
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+
+def parse_publication_year(*values):
+    for value in values:
+        match = YEAR_RE.search(str(value or ''))
+        if match:
+            return int(match.group(0))
+    return None
+
+
+def _date(year, month=1, day=1):
+    try:
+        return date(int(year), int(month), int(day or 1))
+    except ValueError:
+        try:
+            return date(int(year), int(month), 1)
+        except ValueError:
+            return date(int(year), 1, 1)
+
+
+def parse_publication_date(*values):
+    for value in values:
+        text = str(value or '')
+        match = ISO_DATE_RE.search(text)
+        if match:
+            return _date(match.group(1), match.group(2), match.group(3))
+        match = YEAR_MONTH_RE.search(text)
+        if match and match.group(2)[:3].lower() in MONTHS:
+            return _date(match.group(1), MONTHS[match.group(2)[:3].lower()], match.group(3))
+        match = DAY_MONTH_YEAR_RE.search(text)
+        if match and match.group(2)[:3].lower() in MONTHS:
+            return _date(match.group(3), MONTHS[match.group(2)[:3].lower()], match.group(1))
+    year = parse_publication_year(*values)
+    return _date(year) if year else None
+
+
+def backfill_article_publication(apps, schema_editor):
+    # Id-range batches, each committed on its own (the migration is non-atomic)
+    for model_name, fields in (
+        ('Article', ('published_date', 'published_month', 'published_year')),
+        ('DataExtractionArticle', ('published_date', 'published_year')),
+    ):
+        model = apps.get_model('app', model_name)
+        last_id = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for start in range(0, last_id + 1, BATCH_SIZE):
+            updates = []
+            for row in model.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).values('id', *fields):
+                if model_name == 'Article':
+                    publication_date = parse_publication_date(
+                        f"{row['published_date'] or ''} {row['published_month'] or ''} {row['published_year'] or ''}",
+                        row['published_year'])
+                else:
+                    publication_date = parse_publication_date(row['published_date'], row['published_year'])
+                updates.append(model(
+                    id=row['id'],
+                    publication_year=parse_publication_year(row['published_year'], row['published_date']),
+                    publication_date=publication_date,
+                ))
+            model.objects.bulk_update(updates, ['publication_year', 'publication_date'])
+
+
+def recount_dashboard_years(apps, schema_editor):
+    # The 'year' dashboard counters were keyed by the published_year text
+    DashboardStat = apps.get_model('app', 'DashboardStat')
+    DataExtractionArticle = apps.get_model('app', 'DataExtractionArticle')
+    DashboardStat.objects.filter(kind='year').delete()
+    DashboardStat.objects.bulk_create([
+        DashboardStat(kind='year', key=str(year), count=count)
+        for year, count in (DataExtractionArticle.objects
+                            .exclude(publication_year__isnull=True)
+                            .values_list('publication_year')
+                            .annotate(count=Count('id')))
+    ])
+
+
+def rebuild_author_aggregates(apps, schema_editor):
+    # AuthorAggregate years and counts were parsed from the published_year text: rebuilt
+    # from publication_year, as app.aggregates.rebuild_author_aggregates does
+    AuthorAggregate = apps.get_model('app', 'AuthorAggregate')
+    AuthorAggregateCount = apps.get_model('app', 'AuthorAggregateCount')
+    DataExtractionAuthor = apps.get_model('app', 'DataExtractionAuthor')
+
+    rows = (DataExtractionAuthor.objects
+            .annotate(name_norm=Lower(Trim(F('author_name'))), email_norm=F('email_normalized'))
+            .exclude(name_norm='')
+            .order_by('name_norm', 'email_norm', 'id')
+            .values_list('name_norm', 'email_norm', 'email_domain', 'author_name', 'author_country', 'article_id',
+                         'article__publication_year', 'article__data_extraction__extraction_groups'))
+
+    def save(batch):
+        AuthorAggregate.objects.bulk_create([aggregate for aggregate, _ in batch])
+        AuthorAggregateCount.objects.bulk_create([count for _, counts in batch for count in counts],
+                                                 batch_size=BATCH_SIZE)
+
+    with transaction.atomic():
+        AuthorAggregateCount.objects.all().delete()
+        AuthorAggregate.objects.all().delete()
+        batch = []
+        for (name_norm, email_norm, email_domain), author_rows in groupby(rows.iterator(chunk_size=BATCH_SIZE),
+                                                                          key=lambda row: row[:3]):
+            articles = {}
+            author_name, country = '', ''
+            for _, _, _, name, row_country, article_id, year, extraction_groups in author_rows:
+                author_name = (name or '').strip() or author_name
+                country = row_country or country
+                articles[article_id] = (
+                    year,
+                    {int(g) for g in (extraction_groups or '').split(',') if g.strip().isdigit()},
+                )
+
+            years = {year for year, _ in articles.values() if year}
+            aggregate = AuthorAggregate(
+                name_norm=name_norm,
+                email_norm=email_norm,
+                email_domain=email_domain,
+                author_name=author_name,
+                country=country,
+                article_count=len(articles),
+                first_year=min(years) if years else None,
+                last_year=max(years) if years else None,
+            )
+            counts = Counter()
+            for year, group_ids in articles.values():
+                for group_id in [ALL_GROUPS, *group_ids]:
+                    counts[group_id, year] += 1
+            batch.append((aggregate, [AuthorAggregateCount(aggregate=aggregate, group_id=group_id, year=year,
+                                                           articles=count)
+                                      for (group_id, year), count in counts.items()]))
+            if len(batch) >= BATCH_SIZE:
+                save(batch)
+                batch = []
+        save(batch)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0030_dashboard_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='publication_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='publication_year',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataextractionarticle',
+            name='publication_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataextractionarticle',
+            name='publication_year',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_article_publication, migrations.RunPython.noop),
+        migrations.RunPython(recount_dashboard_years, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_author_aggregates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['publication_year'], name='app_article_publica_0a002f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['publication_date'], name='app_article_publica_d7b8ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionarticle',
+            index=models.Index(fields=['publication_year'], name='app_dataext_publica_da41db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractionarticle',
+            index=models.Index(fields=['publication_date'], name='app_dataext_publica_f76dba_idx'),
+        ),
+    ]
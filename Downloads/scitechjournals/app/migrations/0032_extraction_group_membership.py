@@ -0,0 +1,59 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def backfill_group_memberships(apps, schema_editor):
+    # Parses the comma-separated DataExtraction.extraction_groups ids; ids of deleted groups are skipped
+    DataExtraction = apps.get_model('app', 'DataExtraction')
+    DataExtractionGroup = apps.get_model('app', 'DataExtractionGroup')
+    DataExtractionGroupMembership = apps.get_model('app', 'DataExtractionGroupMembership')
+
+    group_ids = set(DataExtractionGroup.objects.values_list('id', flat=True))
+    batch = []
+    for extraction_id, extraction_groups in (DataExtraction.objects
+                                             .order_by('id')
+                                             .values_list('id', 'extraction_groups')
+                                             .iterator(chunk_size=BATCH_SIZE)):
+        for group_id in {int(g) for g in (extraction_groups or '').split(',') if g.strip().isdigit()} & group_ids:
+            batch.append(DataExtractionGroupMembership(extraction_id=extraction_id, group_id=group_id))
+        if len(batch) >= BATCH_SIZE:
+            DataExtractionGroupMembership.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    DataExtractionGroupMembership.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0031_publication_year_and_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataExtractionGroupMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('extraction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to='app.dataextraction')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='extraction_memberships', to='app.dataextractiongroup')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dataextraction',
+            name='groups',
+            field=models.ManyToManyField(blank=True, related_name='extractions', through='app.DataExtractionGroupMembership', to='app.dataextractiongroup'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextractiongroupmembership',
+            index=models.Index(fields=['group', 'extraction'], name='extraction_group_by_group_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dataextractiongroupmembership',
+            constraint=models.UniqueConstraint(fields=('extraction', 'group'), name='uniq_extraction_group'),
+        ),
+        migrations.RunPython(backfill_group_memberships, migrations.RunPython.noop),
+    ]
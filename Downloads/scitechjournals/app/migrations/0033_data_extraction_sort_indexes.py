@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0032_extraction_group_membership'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataextraction',
+            index=models.Index(fields=['created_at'], name='app_dataext_created_824c8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextraction',
+            index=models.Index(fields=['extraction_name'], name='app_dataext_extract_522a1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataextraction',
+            index=models.Index(fields=['extraction_type'], name='app_dataext_extract_6deead_idx'),
+        ),
+    ]
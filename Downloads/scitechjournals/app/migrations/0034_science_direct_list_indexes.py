@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0033_data_extraction_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_email', True)), fields=['id'], name='article_with_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_email', True)), fields=['publication_date', 'id'], name='article_with_email_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['author_name', 'id'], name='author_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['email_normalized', 'id'], name='author_email_normalized_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['journal_name', 'id'], name='journal_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['total_articles', 'id'], name='journal_total_articles_id_idx'),
+        ),
+    ]
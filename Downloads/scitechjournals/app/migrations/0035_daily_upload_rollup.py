@@ -0,0 +1,53 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def backfill_daily_upload_rollups(apps, schema_editor):
+    DailyUploadRollup = apps.get_model('app', 'DailyUploadRollup')
+    DataExtraction = apps.get_model('app', 'DataExtraction')
+
+    rows = (DataExtraction.objects
+            .annotate(day=TruncDate('created_at'))
+            .values('day', 'extracted_by_id')
+            .annotate(uploads=Count('id'),
+                      records=Coalesce(Sum('total_records'), 0),
+                      unique_records=Coalesce(Sum('total_unique_records'), 0)))
+    DailyUploadRollup.objects.bulk_create(
+        [DailyUploadRollup(upload_date=row['day'], user_id=row['extracted_by_id'], uploads=row['uploads'],
+                           total_records=row['records'], total_unique_records=row['unique_records'])
+         for row in rows],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0034_science_direct_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUploadRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_date', models.DateField()),
+                ('uploads', models.IntegerField(default=0)),
+                ('total_records', models.BigIntegerField(default=0)),
+                ('total_unique_records', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_rollups', to='app.users')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'upload_date'], name='upload_rollup_user_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyuploadrollup',
+            constraint=models.UniqueConstraint(fields=('upload_date', 'user'), name='uniq_daily_upload_rollup', nulls_distinct=False),
+        ),
+        migrations.RunPython(backfill_daily_upload_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:32
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0035_daily_upload_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('author_country'), name='gin_trgm_ops'), name='dea_country_trgm'),
+        ),
+    ]
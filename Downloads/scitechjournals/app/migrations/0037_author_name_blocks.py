@@ -0,0 +1,96 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:35
+
+import re
+import unicodedata
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+# Frozen copy of the app.names key scheme at the time of this migration
+
+FOLD_MAP = str.maketrans({'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th',
+                          'ı': 'i'})
+TOKEN_RE = re.compile(r'[a-z]+')
+RAW_TOKEN_RE = re.compile(r'[^\W\d_]+')
+SOUNDEX_CODES = {letter: digit for digit, letters in (
+    ('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'), ('4', 'l'), ('5', 'mn'), ('6', 'r')) for letter in letters}
+MAX_NAME_TOKENS = 4
+
+
+def fold_name(name):
+    text = unicodedata.normalize('NFKD', str(name or '').lower().translate(FOLD_MAP))
+    return ' '.join(TOKEN_RE.findall(text.encode('ascii', 'ignore').decode('ascii')))
+
+
+def soundex(word):
+    if not word:
+        return ''
+    code, last = word[0].upper(), SOUNDEX_CODES.get(word[0], '')
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            last = digit
+    return code.ljust(4, '0')
+
+
+def name_tokens(name):
+    raw = RAW_TOKEN_RE.findall(str(name or ''))
+    mixed_case = any(not token.isupper() for token in raw)
+    tokens = []
+    for token in raw:
+        parts = list(token) if mixed_case and token.isupper() and len(token) <= 3 else [token]
+        tokens.extend(word for part in parts for word in fold_name(part).split())
+    return tokens
+
+
+def name_blocking_keys(name):
+    tokens = name_tokens(name)[:MAX_NAME_TOKENS]
+    keys = set()
+    for index, token in enumerate(tokens):
+        if len(token) < 2:
+            continue
+        code = soundex(token)
+        keys.add(code)
+        keys.update(code + other[0].upper() for other_index, other in enumerate(tokens) if other_index != index)
+    return sorted(keys)
+
+
+def backfill_name_blocks(apps, schema_editor):
+    # Id-range batches, each committed on its own (the migration is non-atomic)
+    DataExtractionAuthor = apps.get_model('app', 'DataExtractionAuthor')
+    last_id = DataExtractionAuthor.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        DataExtractionAuthor.objects.bulk_update([
+            DataExtractionAuthor(id=author_id, name_blocks=name_blocking_keys(author_name))
+            for author_id, author_name in (DataExtractionAuthor.objects
+                                           .filter(id__gte=start, id__lt=start + BATCH_SIZE)
+                                           .values_list('id', 'author_name'))
+        ], ['name_blocks'])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('app', '0036_author_country_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataextractionauthor',
+            name='name_blocks',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=8), blank=True, default=list, size=None),
+        ),
+        migrations.RunPython(backfill_name_blocks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='dataextractionauthor',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_blocks'], name='dea_name_blocks_gin'),
+        ),
+    ]
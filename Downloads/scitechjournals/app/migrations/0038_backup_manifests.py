@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0037_author_name_blocks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backupdataextractionlog',
+            name='archive_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='backupdataextractionlog',
+            name='base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='incrementals', to='app.backupdataextractionlog'),
+        ),
+        migrations.AddField(
+            model_name='backupdataextractionlog',
+            name='files_archived',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='backupdataextractionlog',
+            name='kind',
+            field=models.CharField(choices=[('FULL', 'Full'), ('INCREMENTAL', 'Incremental')], default='FULL', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='backupdataextractionlog',
+            name='manifest',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,4 +1,9 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
 
 class Users(models.Model):
     id = models.AutoField(primary_key=True)
@@ -43,6 +48,9 @@ class Journal(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['journal_id']),
+            # Sorts of the ScienceDirect journal list (keyset paged on (sort, id))
+            models.Index(fields=['journal_name', 'id'], name='journal_name_id_idx'),
+            models.Index(fields=['total_articles', 'id'], name='journal_total_articles_id_idx'),
         ]
 
     def __str__(self):
@@ -62,10 +70,14 @@ class Article(models.Model):
     published_date = models.TextField(null=True, blank=True)
     published_month = models.TextField(max_length=15, null=True, blank=True)
     published_year = models.TextField(null=True, blank=True)
+    # Parsed from the published_* texts on save (see app.dates and app.signals)
+    publication_year = models.SmallIntegerField(null=True, blank=True)
+    publication_date = models.DateField(null=True, blank=True)
     is_email = models.BooleanField(default=False)
     author_emails = models.IntegerField(default=0)
     # 🔗 ForeignKey to Site
     site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='articles')
+    search_vector = SearchVectorField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
@@ -73,6 +85,15 @@ class Article(models.Model):
             models.Index(fields=['article_id']),
             models.Index(fields=['journal']),
             models.Index(fields=['published_year']),
+            models.Index(fields=['publication_year']),
+            models.Index(fields=['publication_date']),
+            GinIndex(fields=['search_vector']),
+            # pg_trgm index backing the case-insensitive title search (get_data_science_direct)
+            GinIndex(OpClass(Lower('article_title'), name='gin_trgm_ops'), name='article_title_trgm'),
+            # Sorts of the ScienceDirect article list, which only shows articles with emails
+            models.Index(fields=['id'], condition=Q(is_email=True), name='article_with_email_idx'),
+            models.Index(fields=['publication_date', 'id'], condition=Q(is_email=True),
+                         name='article_with_email_date_idx'),
         ]
 
     def __str__(self):
@@ -88,12 +109,22 @@ class Author(models.Model):
     article_title = models.TextField(null=True, blank=True)
     author_name = models.CharField(max_length=255, null=True, blank=True)
     author_email = models.EmailField(max_length=255, null=True, blank=True)
+    # Lower-cased, trimmed author_email and its domain, set on save (see app.signals)
+    email_normalized = models.CharField(max_length=255, blank=True, default='')
+    email_domain = models.CharField(max_length=255, blank=True, default='')
+    search_vector = SearchVectorField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         indexes = [
             models.Index(fields=['author_email']),
+            models.Index(fields=['email_normalized']),
+            models.Index(fields=['email_domain']),
             models.Index(fields=['article']),
+            GinIndex(fields=['search_vector']),
+            # Sorts of the ScienceDirect author list
+            models.Index(fields=['author_name', 'id'], name='author_name_id_idx'),
+            models.Index(fields=['email_normalized', 'id'], name='author_email_normalized_id_idx'),
         ]
 
     def __str__(self):
@@ -130,7 +161,10 @@ class DataExtractionGroup(models.Model):
 
 class DataExtraction(models.Model):
     extraction_name = models.CharField(max_length=255)
+    # Comma-separated group ids as selected at upload, mirrored into `groups` on save (see app.signals)
     extraction_groups = models.TextField(default="")
+    groups = models.ManyToManyField(DataExtractionGroup, through='DataExtractionGroupMembership',
+                                    related_name='extractions', blank=True)
     file_type = models.TextField(null=True, blank=True, default=0)
     extraction_file_name = models.TextField(default="")
     output_excel_path = models.FilePathField(
@@ -149,6 +183,27 @@ class DataExtraction(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        indexes = [
+            # Sortable columns of the Data Central list (see views.data_central_list_api)
+            models.Index(fields=['created_at']),
+            models.Index(fields=['extraction_name']),
+            models.Index(fields=['extraction_type']),
+        ]
+
+
+class DataExtractionGroupMembership(models.Model):
+    extraction = models.ForeignKey(DataExtraction, on_delete=models.CASCADE, related_name='group_memberships')
+    group = models.ForeignKey(DataExtractionGroup, on_delete=models.CASCADE, related_name='extraction_memberships')
+    created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['extraction', 'group'], name='uniq_extraction_group'),
+        ]
+        indexes = [
+            # Group -> extractions lookups (the unique constraint covers extraction -> groups)
+            models.Index(fields=['group', 'extraction'], name='extraction_group_by_group_idx'),
+        ]
 
 
 class DataExtractionArticle(models.Model):
@@ -157,7 +212,10 @@ class DataExtractionArticle(models.Model):
     article_link = models.URLField(max_length=1024, null=True, blank=True)
     published_date = models.TextField(null=True, blank=True)
     published_year = models.TextField(null=True, blank=True)
+    publication_year = models.SmallIntegerField(null=True, blank=True)
+    publication_date = models.DateField(null=True, blank=True)
     article_keywords = models.JSONField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     data_extraction = models.ForeignKey(DataExtraction, on_delete=models.CASCADE, related_name='data_extraction', null=True,
@@ -167,30 +225,168 @@ class DataExtractionArticle(models.Model):
         indexes = [
             models.Index(fields=['article_title']),
             models.Index(fields=['published_year']),
+            models.Index(fields=['publication_year']),
+            models.Index(fields=['publication_date']),
+            GinIndex(fields=['search_vector']),
         ]
 
     def __str__(self):
         return self.article_title or self.id
 
+class DataExtractionKeyword(models.Model):
+    # One row per (article, keyword), normalized (trimmed + lowercased) at ingest time
+    id = models.BigAutoField(primary_key=True)
+    article = models.ForeignKey(DataExtractionArticle, on_delete=models.CASCADE,
+                                related_name='keywords')
+    keyword = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'keyword'], name='uniq_data_extraction_article_keyword'),
+        ]
+        indexes = [
+            models.Index(fields=['keyword', 'article']),
+        ]
+
+    def __str__(self):
+        return self.keyword
+
 class DataExtractionAuthor(models.Model):
     id = models.BigAutoField(primary_key=True)
     article = models.ForeignKey(DataExtractionArticle, on_delete=models.CASCADE,
                                 related_name='data_extraction_authors')
     author_name = models.CharField(max_length=255, null=True, blank=True)
     author_email = models.EmailField(max_length=255, null=True, blank=True)
+    email_normalized = models.CharField(max_length=255, blank=True, default='')
+    email_domain = models.CharField(max_length=255, blank=True, default='')
+    # Blocking keys of author_name for the fuzzy author search, set on save (see app.names)
+    name_blocks = ArrayField(models.CharField(max_length=8), default=list, blank=True)
     author_country = models.TextField(default="", null=True, blank=True)
     author_affiliation = models.TextField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         indexes = [
             models.Index(fields=['author_email']),
+            models.Index(fields=['email_normalized']),
+            models.Index(fields=['email_domain']),
             models.Index(fields=['article']),
+            GinIndex(fields=['search_vector']),
+            # pg_trgm indexes backing the case-insensitive substring searches
+            GinIndex(OpClass(Lower('author_name'), name='gin_trgm_ops'), name='dea_author_name_trgm'),
+            GinIndex(OpClass(Lower('author_affiliation'), name='gin_trgm_ops'), name='dea_affiliation_trgm'),
+            GinIndex(OpClass(Lower('author_country'), name='gin_trgm_ops'), name='dea_country_trgm'),
+            GinIndex(fields=['name_blocks'], name='dea_name_blocks_gin'),
+            # Normalized author key used to refresh AuthorAggregate rows
+            models.Index(Lower(Trim('author_name')), name='dea_author_name_norm'),
+            # Partial indexes over the (few) rows without an email, for the Missing Emails report:
+            # keyset pages in id order, and per-article lookups when filtering by year
+            models.Index(fields=['id'], name='dea_missing_email_idx',
+                         condition=Q(author_email__isnull=True) | Q(author_email='')),
+            models.Index(fields=['article', 'id'], name='dea_missing_email_article_idx',
+                         condition=Q(author_email__isnull=True) | Q(author_email='')),
         ]
 
     def __str__(self):
         return self.author_name or f"Author {self.id}"
 
+class AuthorAggregate(models.Model):
+    # One row per normalized (name, email) across all DataExtractionAuthor rows,
+    # maintained by app.aggregates (refreshed at ingest and on extraction delete)
+    id = models.BigAutoField(primary_key=True)
+    name_norm = models.CharField(max_length=255)
+    email_norm = models.CharField(max_length=255, blank=True, default='')
+    email_domain = models.CharField(max_length=255, blank=True, default='')
+    author_name = models.CharField(max_length=255, blank=True, default='')
+    country = models.TextField(blank=True, default='')
+    article_count = models.IntegerField(default=0)
+    first_year = models.IntegerField(null=True, blank=True)
+    last_year = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name_norm', 'email_norm'], name='uniq_author_aggregate_key'),
+        ]
+        indexes = [
+            models.Index(fields=['-article_count', 'name_norm'], name='author_agg_rank_idx'),
+            models.Index(fields=['email_domain', '-article_count'], name='author_agg_domain_idx'),
+        ]
+
+    def __str__(self):
+        return self.author_name or self.name_norm
+
+class AuthorAggregateCount(models.Model):
+    # Distinct articles of an AuthorAggregate per publication year (NULL: no year) and
+    # extraction group, summed over the selected years / group by Top Authors
+    ALL_GROUPS = 0  # group_id of the counts over every article, in any group or none
+
+    id = models.BigAutoField(primary_key=True)
+    # Deleted by app.aggregates before their aggregates, so neither table needs a
+    # cascading (row by row) delete
+    aggregate = models.ForeignKey(AuthorAggregate, on_delete=models.DO_NOTHING, related_name='counts')
+    group_id = models.IntegerField(default=ALL_GROUPS)
+    year = models.IntegerField(null=True, blank=True)
+    articles = models.IntegerField(default=0)
+    class Meta:
+        indexes = [
+            models.Index(fields=['group_id', 'year', 'aggregate'], name='author_agg_count_range_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.aggregate_id} {self.group_id}/{self.year}: {self.articles}"
+
+
+class DashboardStat(models.Model):
+    # Dashboard counters, one row per (kind, key), kept up to date by app.stats
+    # at ingest and on extraction/group create and delete
+    KIND_CHOICES = [
+        ('groups', 'Groups'),
+        ('extraction_type', 'Extractions per type'),
+        ('user', 'Extractions per user'),
+        ('keyword', 'Articles per keyword'),
+        ('year', 'Articles per year'),
+        ('domain', 'Authors per email domain'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.TextField(blank=True, default='')
+    count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='uniq_dashboard_stat'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', '-count'], name='dashboard_stat_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key} = {self.count}"
+
+
+class DailyUploadRollup(models.Model):
+    # Extractions uploaded per user and (local) day, kept up to date by app.stats on
+    # extraction create and delete; read by the user upload reports
+    upload_date = models.DateField()
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='upload_rollups', null=True, blank=True)
+    uploads = models.IntegerField(default=0)
+    total_records = models.BigIntegerField(default=0)
+    total_unique_records = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [
+            # One row per day for uploads without a user too (NULLS NOT DISTINCT)
+            models.UniqueConstraint(fields=['upload_date', 'user'], name='uniq_daily_upload_rollup',
+                                    nulls_distinct=False),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'upload_date'], name='upload_rollup_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.upload_date} {self.user_id}: {self.uploads}"
+
 class BackupLog(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=[('SUCCESS', 'Success'), ('FAILURE', 'Failure')])
@@ -202,10 +398,47 @@ class BackupLog(models.Model):
 
 
 class BackupDataExtractionLog(models.Model):
+    # Backups of app/data_extraction made by backup_data_extraction_zip.py (see app.backups)
+    KIND_CHOICES = [('FULL', 'Full'), ('INCREMENTAL', 'Incremental')]
+
     timestamp = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=[('SUCCESS', 'Success'), ('FAILURE', 'Failure')])
     message = models.TextField(blank=True)
     drive_link = models.URLField(blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='FULL')
+    # The successful backup an incremental one was diffed against
+    base = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='incrementals')
+    archive_name = models.CharField(max_length=255, blank=True)
+    files_archived = models.IntegerField(default=0)
+    # relative path -> [size, mtime, sha256, archive holding that content] for the whole tree
+    manifest = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f"{self.timestamp} - {self.status}"
+
+
+class ExportJob(models.Model):
+    # Large Data Central exports written to disk by app.tasks.run_export_job
+    STATUS_CHOICES = [('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILURE', 'Failure')]
+    FORMAT_CHOICES = [('excel', 'Excel'), ('csv', 'CSV')]
+
+    export_type = models.CharField(max_length=50)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='excel')
+    file_name = models.CharField(max_length=255)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    file_path = models.TextField(blank=True, default='')
+    row_count = models.BigIntegerField(default=0)
+    message = models.TextField(blank=True)
+    requested_by = models.ForeignKey(Users, on_delete=models.SET_NULL, related_name='export_jobs', null=True,
+                                     blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    class Meta:
+        indexes = [
+            models.Index(fields=['requested_by', '-created_at']),
+        ]
 
     def __str__(self):
-        return f"{self.timestamp} - {self.status}"
\ No newline at end of file
+        return f"{self.file_name} - {self.status}"
@@ -0,0 +1,121 @@
+import re
+import unicodedata
+
+from rapidfuzz.distance import JaroWinkler
+
+# Blocking keys of author names for the fuzzy author search (app.search.fuzzy_author_rows):
+# computed at ingest (app.signals) into the GIN-indexed DataExtractionAuthor.name_blocks,
+# so only authors sharing a key with a query name are scored (name_similarity).
+
+# Letters NFKD doesn't decompose into an ASCII base letter
+FOLD_MAP = str.maketrans({'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th',
+                          'ı': 'i'})
+
+TOKEN_RE = re.compile(r'[a-z]+')
+
+SOUNDEX_CODES = {letter: digit for digit, letters in (
+    ('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'), ('4', 'l'), ('5', 'mn'), ('6', 'r')) for letter in letters}
+
+# Name tokens keyed per name (long names add little recall for many more keys)
+MAX_NAME_TOKENS = 4
+
+# Weight of an initial in name_similarity, about the length of the given name it stands for
+INITIAL_WEIGHT = 4
+
+RAW_TOKEN_RE = re.compile(r'[^\W\d_]+')
+
+
+def fold_name(name):
+    """'Müller-Lüdenscheidt, J.' -> 'muller ludenscheidt j' (lowercase ASCII words)."""
+    text = unicodedata.normalize('NFKD', str(name or '').lower().translate(FOLD_MAP))
+    return ' '.join(TOKEN_RE.findall(text.encode('ascii', 'ignore').decode('ascii')))
+
+
+def soundex(word):
+    """American Soundex of an ASCII word: 'mueller' and 'muller' -> 'M460'."""
+    if not word:
+        return ''
+    code, last = word[0].upper(), SOUNDEX_CODES.get(word[0], '')
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            last = digit
+    return code.ljust(4, '0')
+
+
+def name_tokens(name):
+    """
+    Folded words of a name, with the initials of PubMed-style names split up:
+    'Smith AJ' -> ['smith', 'a', 'j'] (only in mixed-case names, 'WEI ZHANG' stays whole).
+    """
+    raw = RAW_TOKEN_RE.findall(str(name or ''))
+    mixed_case = any(not token.isupper() for token in raw)
+    tokens = []
+    for token in raw:
+        parts = list(token) if mixed_case and token.isupper() and len(token) <= 3 else [token]
+        tokens.extend(word for part in parts for word in fold_name(part).split())
+    return tokens
+
+
+def name_blocking_keys(name, paired_only=False):
+    """
+    Blocking keys of a name, independent of the token order: the Soundex of every word
+    of two letters or more followed by the initial of each other token ('Smith John',
+    'J. Smith' and 'Smith AJ' share 'S530J'). Unless `paired_only`, the bare Soundex
+    codes are included too, so single-word queries ('Mueller') find their surname block.
+    """
+    tokens = name_tokens(name)[:MAX_NAME_TOKENS]
+    keys = set()
+    for index, token in enumerate(tokens):
+        if len(token) < 2:
+            continue
+        code = soundex(token)
+        if not paired_only:
+            keys.add(code)
+        keys.update(code + other[0].upper() for other_index, other in enumerate(tokens) if other_index != index)
+    return sorted(keys)
+
+
+def query_blocking_keys(name):
+    """Keys to look a query name up with: the paired ones, or the bare codes of a one-word name."""
+    return name_blocking_keys(name, paired_only=len(name_tokens(name)) > 1)
+
+
+def _token_similarity(a, b):
+    if len(a) == 1 or len(b) == 1:
+        # An initial stands for any word starting with it, and contradicts any other
+        return 100.0 if a[0] == b[0] else 0.0
+    return JaroWinkler.normalized_similarity(a, b) * 100
+
+
+def name_similarity(query_tokens, candidate_tokens):
+    """
+    0-100 score of a candidate name for a query name (both name_tokens()). Every query
+    word is paired with a distinct candidate word, best pairs first, in any order; the
+    score is the Jaro-Winkler similarity of the pairs weighted by word length, with
+    initials matching the words they start ('Mueller J' ~ 'Müller Johann' scores 95).
+    Unpaired query words count as 0, unpaired candidate words don't count, so a
+    surname alone matches every author with that surname.
+    """
+    if not query_tokens or not candidate_tokens:
+        return 0.0
+    pairs = sorted(((_token_similarity(a, b), i, j) for i, a in enumerate(query_tokens)
+                    for j, b in enumerate(candidate_tokens)), reverse=True)
+    paired_query, paired_candidate = set(), set()
+    total = weight = 0.0
+    for similarity, i, j in pairs:
+        if i in paired_query or j in paired_candidate:
+            continue
+        paired_query.add(i)
+        paired_candidate.add(j)
+        a, b = query_tokens[i], candidate_tokens[j]
+        pair_weight = INITIAL_WEIGHT if min(len(a), len(b)) == 1 else max(len(a), len(b))
+        total += similarity * pair_weight
+        weight += pair_weight
+    weight += sum(INITIAL_WEIGHT if len(token) == 1 else len(token)
+                  for i, token in enumerate(query_tokens) if i not in paired_query)
+    return total / weight
@@ -0,0 +1,126 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+
+
+def encode_cursor(values, position, reverse=False):
+    """
+    Opaque URL-safe cursor: the ordering key of the boundary row, the index of the
+    first row of the page it leads to (for display only) and the paging direction.
+    """
+    payload = json.dumps({"v": values, "p": position, "r": reverse}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return list(payload["v"]), max(int(payload.get("p", 0)), 0), bool(payload.get("r"))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _ordering(queryset):
+    return [(field.lstrip("-"), field.startswith("-")) for field in queryset.query.order_by]
+
+
+def _row_key(row, ordering):
+    return [row[field] if isinstance(row, dict) else getattr(row, field) for field, _ in ordering]
+
+
+def _equal(field, value):
+    return Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value})
+
+
+def _past(field, value, lookup):
+    """
+    `field` strictly greater ("gt") or smaller ("lt") than `value`, with NULL sorting
+    after every value as PostgreSQL does (NULLS LAST ascending, NULLS FIRST descending).
+    """
+    if lookup == "gt":
+        return Q(pk__in=[]) if value is None else Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+    return Q(**{f"{field}__isnull": False}) if value is None else Q(**{f"{field}__lt": value})
+
+
+def _beyond(ordering, values, reverse):
+    """
+    Rows strictly after `values` in the queryset ordering (before it when `reverse`),
+    expanded for mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    """
+    condition = Q()
+    for index, (field, descending) in enumerate(ordering):
+        lookup = "lt" if descending != reverse else "gt"
+        term = _past(field, values[index], lookup)
+        for previous_index in range(index):
+            term &= _equal(ordering[previous_index][0], values[previous_index])
+        condition |= term
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, rows, start_index, next_cursor, prev_cursor):
+        self.rows = rows
+        self.start_index = start_index
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def end_index(self):
+        return self.start_index + len(self.rows)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    One page of `queryset` seeking from the cursor's key instead of OFFSET, so any page
+    costs the same as the first. The queryset's order_by() must end with a unique
+    column (e.g. id) and every ordering field must be present on the rows.
+    """
+    ordering = _ordering(queryset)
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded and len(decoded[0]) != len(ordering):
+        decoded = None
+
+    position, reverse = 0, False
+    if decoded:
+        values, position, reverse = decoded
+        queryset = queryset.filter(_beyond(ordering, values, reverse))
+        if reverse:
+            queryset = queryset.order_by(*[field if descending else f"-{field}" for field, descending in ordering])
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+        # Coming back from a later page: the next page exists, more previous ones only if has_more
+        has_next, has_previous = True, has_more
+        if not has_more:
+            position = 0
+    else:
+        has_next, has_previous = has_more, decoded is not None
+
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(_row_key(rows[-1], ordering), position + len(rows))
+    if rows and has_previous:
+        prev_cursor = encode_cursor(_row_key(rows[0], ordering), max(position - page_size, 0), reverse=True)
+
+    return KeysetPage(rows, position, next_cursor, prev_cursor)
+
+
+class AuthorSearchCursorPagination(CursorPagination):
+    # Opaque next/previous links seeking on the primary key, no COUNT() or OFFSET
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,337 @@
+import csv
+import hashlib
+import json
+import re
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Trim
+
+from app.aggregates import AUTHOR_EMAIL_NORM, AUTHOR_NAME_NORM
+from app.cache import cache_get, cache_set, get_data_version
+from app.dates import parse_year_range
+from app.exports import EXPORT_CHUNK_SIZE
+from app.groups import extraction_ids_in_groups
+from app.models import AuthorAggregate, AuthorAggregateCount, DataExtractionAuthor
+from app.search import (fuzzy_author_rows, keyword_authors, keyword_match_rows, normalize_keywords,
+                        science_direct_title_authors, substring_match_authors, unique_by_email)
+
+# Data Central report definitions, shared by the streaming download views and the
+# background export task (app.tasks.run_export_job). Every builder takes the JSON
+# params stored on an ExportJob and returns the (title, header, rows) sheets.
+
+SEARCH_HEADER = ["article", "author_name", "author_email"]
+SEARCH_FIELDS = ["article__article_title", "author_name", "author_email"]
+AFFILIATION_HEADER = SEARCH_HEADER + ["affiliation", "country"]
+AFFILIATION_FIELDS = SEARCH_FIELDS + ["author_affiliation", "author_country"]
+FUZZY_NAME_HEADER = SEARCH_HEADER + ["matched_name", "score"]
+TOP_AUTHORS_HEADER = ["author_name", "author_email", "country", "article_count", "first_year", "last_year"]
+TOP_AUTHORS_FIELDS = ["name", "email", "country", "article_count", "first_year", "last_year"]
+MISSING_EMAILS_HEADER = ["author_name", "affiliation", "article_title", "year"]
+MISSING_EMAILS_FIELDS = ["author_name", "author_affiliation", "article__article_title", "article__publication_year"]
+SCIENCE_DIRECT_HEADER = ["Article Title", "Author Name", "Author Email", "Published"]
+
+
+def author_search_sheets(authors, header, fields, order_by=('id',)):
+    """
+    The total_data / unique_data sheets of a Data Central search export, both read
+    from server-side cursors so rows are written as they are fetched.
+    """
+    return [
+        ("total_data", header,
+         authors.order_by(*order_by).values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)),
+        ("unique_data", header,
+         unique_by_email(authors).values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)),
+    ]
+
+
+def filter_publication_years(queryset, year, field):
+    """Indexed range filter on a publication_year column; no rows for an invalid year."""
+    years = parse_year_range(year)
+    return queryset.filter(**{f"{field}__range": years}) if years else queryset.none()
+
+
+def top_authors_queryset(year="", keyword="", domain="", group=""):
+    """
+    Authors matching the Top Authors filters, ranked by their number of articles in
+    the selected years and group. `year` is a year or an inclusive year range
+    ('2019-2023').
+
+    Unfiltered (or domain-only) rankings read the maintained AuthorAggregate rows in
+    rank order. A year or group filter sums the author's AuthorAggregateCount rows for
+    that year / group instead, so the counts and years only cover those articles. A
+    keyword filter can't be answered from the aggregate, so it falls back to
+    aggregating the authors of the keyword's articles live.
+    """
+    domain = domain.lower().lstrip("@")
+    if keyword:
+        return live_top_authors_queryset(year, keyword, domain, group)
+    if year or group:
+        return counted_top_authors_queryset(year, domain, group)
+
+    authors = AuthorAggregate.objects.all()
+    if domain:
+        authors = authors.filter(email_domain=domain)
+
+    return (authors
+            .order_by("-article_count", "name_norm", "id")
+            .values("id", "name_norm", "country", "article_count", "first_year", "last_year",
+                    name=F("author_name"), email=F("email_norm")))
+
+
+def counted_top_authors_queryset(year, domain, group):
+    # (group, year)-indexed count rows, one GROUP BY over the authors with articles there
+    counts = AuthorAggregateCount.objects.all()
+    if year:
+        counts = filter_publication_years(counts, year, "year")
+    if not group:
+        counts = counts.filter(group_id=AuthorAggregateCount.ALL_GROUPS)
+    elif group.isdigit() and int(group) != AuthorAggregateCount.ALL_GROUPS:
+        counts = counts.filter(group_id=int(group))
+    else:
+        counts = counts.none()
+    if domain:
+        counts = counts.filter(aggregate__email_domain=domain)
+
+    return (counts
+            .values("aggregate_id", name_norm=F("aggregate__name_norm"), name=F("aggregate__author_name"),
+                    email=F("aggregate__email_norm"), country=F("aggregate__country"))
+            .annotate(article_count=Sum("articles"), first_year=Min("year"), last_year=Max("year"))
+            .order_by("-article_count", "name_norm", "aggregate_id"))
+
+
+def live_top_authors_queryset(year, keyword, domain, group):
+    # The keyword's articles are resolved through the indexed keyword table (a semi-join)
+    authors = (
+        keyword_authors([keyword], year=year)
+        .annotate(name_norm=AUTHOR_NAME_NORM, email_norm=AUTHOR_EMAIL_NORM)
+        .exclude(name_norm="")
+    )
+    if group:
+        authors = (authors.filter(article__data_extraction__in=extraction_ids_in_groups([int(group)]))
+                   if group.isdigit() else authors.none())
+    if domain:
+        authors = authors.filter(email_domain=domain)
+
+    # Aggregate from the authors side to avoid row explosion
+    return (
+        authors
+        .values("name_norm", "email_norm")
+        .annotate(
+            name=Max(Trim(F("author_name"))),
+            email=F("email_norm"),
+            country=Max("author_country"),
+            article_count=Count("article_id", distinct=True),
+            first_year=Min("article__publication_year"),
+            last_year=Max("article__publication_year"),
+        )
+        .order_by("-article_count", "name_norm", "email_norm")
+    )
+
+
+def missing_email_queryset(year=""):
+    # Same predicate as the dea_missing_email partial indexes, so the planner can use them
+    authors = DataExtractionAuthor.objects.filter(Q(author_email__isnull=True) | Q(author_email__exact=""))
+    if year:
+        authors = filter_publication_years(authors, year, "article__publication_year")
+    return authors
+
+
+def keyword_search_sheets(params):
+    return author_search_sheets(keyword_authors(params.get("keywords", []), year=params.get("year")),
+                                SEARCH_HEADER, SEARCH_FIELDS, order_by=("article_id", "id"))
+
+
+def author_name_search_sheets(params):
+    return author_search_sheets(substring_match_authors("author_name", params.get("terms", [])),
+                                SEARCH_HEADER, SEARCH_FIELDS)
+
+
+def fuzzy_author_name_search_sheets(params):
+    """
+    Fuzzy author name search: total_data in id order, and unique_data (first match per
+    email) collected during the same pass, so the candidates are only read once.
+    """
+    unique = {}
+
+    def matches():
+        for row in fuzzy_author_rows(params.get("terms", []), SEARCH_FIELDS):
+            unique.setdefault(row[2], row)
+            yield row
+
+    def unique_rows():
+        for _, row in sorted(unique.items(), key=lambda item: (item[0] is None, item[0] or '')):
+            yield row
+
+    return [
+        ("total_data", FUZZY_NAME_HEADER, matches()),
+        ("unique_data", FUZZY_NAME_HEADER, unique_rows()),
+    ]
+
+
+def affiliation_search_sheets(params):
+    return author_search_sheets(substring_match_authors("author_affiliation", params.get("terms", [])),
+                                AFFILIATION_HEADER, AFFILIATION_FIELDS)
+
+
+def top_authors_sheets(params):
+    rows = (top_authors_queryset(**params)
+            .values_list(*TOP_AUTHORS_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    return [("TopAuthors", TOP_AUTHORS_HEADER, rows)]
+
+
+def missing_email_sheets(params):
+    rows = (missing_email_queryset(**params)
+            .order_by("id")
+            .values_list(*MISSING_EMAILS_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    return [("MissingEmails", MISSING_EMAILS_HEADER, rows)]
+
+
+def science_direct_author_sheets(params):
+    """
+    'Matched Articles' and 'Unique Authors' sheets of the ScienceDirect title search;
+    the article columns come from the same query (one join, no per-row lookups).
+    """
+    authors = science_direct_title_authors(params.get("keywords", []))
+    matched_articles = (
+        (title, name, email, f"{date}-{month}-{year}")
+        for title, name, email, date, month, year in (
+            authors
+            .order_by("id")
+            .values_list("article__article_title", "author_name", "author_email", "article__published_date",
+                         "article__published_month", "article__published_year")
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+    )
+    unique_authors = (authors
+                      .order_by("author_name", "author_email")
+                      .values_list("author_name", "author_email")
+                      .distinct()
+                      .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    return [
+        ("Matched Articles", SCIENCE_DIRECT_HEADER, matched_articles),
+        ("Unique Authors", ["Author Name", "Author Email"], unique_authors),
+    ]
+
+
+def _spooled_rows(spool):
+    spool.seek(0)
+    try:
+        yield from csv.reader(spool)
+    finally:
+        spool.close()
+
+
+def keyword_list_workbooks(keyword_lists, year=""):
+    """
+    Batch keyword search over many named lists ({name: keywords}) in a single pass:
+    one indexed query over the union of their keywords, each matching author routed
+    to every list holding one of its keywords. Returns (file name, sheets) per list,
+    with the total_data / unique_data sheets of a single keyword search.
+
+    Matches are spooled to temporary files during the pass, so only the unique rows
+    are held in memory.
+    """
+    names = list(keyword_lists)
+    lists_by_keyword = defaultdict(set)
+    for index, name in enumerate(names):
+        for keyword in normalize_keywords(keyword_lists[name]):
+            lists_by_keyword[keyword].add(index)
+
+    spools = [tempfile.TemporaryFile(mode='w+', newline='', encoding='utf-8') for _ in names]
+    writers = [csv.writer(spool) for spool in spools]
+    # author_email -> first (lowest id) row, like unique_by_email
+    unique = [{} for _ in names]
+
+    def route(indexes, row):
+        for index in indexes:
+            writers[index].writerow(row)
+            unique[index].setdefault(row[2], row)
+
+    current_id, current_lists, current_row = None, set(), None
+    rows = keyword_match_rows(list(lists_by_keyword), SEARCH_FIELDS, year=year).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for author_id, keyword, *row in rows:
+        if author_id != current_id:
+            if current_id is not None:
+                route(current_lists, current_row)
+            current_id, current_lists, current_row = author_id, set(), row
+        current_lists |= lists_by_keyword.get(keyword, set())
+    if current_id is not None:
+        route(current_lists, current_row)
+
+    workbooks, used_names = [], set()
+    for index, name in enumerate(names):
+        file_name = re.sub(r'[^\w\- ]+', '_', str(name)).strip() or f"list_{index + 1}"
+        while file_name.lower() in used_names:
+            file_name = f"{file_name}_{index + 1}"
+        used_names.add(file_name.lower())
+        unique_rows = [row for email, row in sorted(unique[index].items(),
+                                                    key=lambda item: (item[0] is None, item[0] or ''))]
+        workbooks.append((f"{file_name}.xlsx", [
+            ("total_data", SEARCH_HEADER, _spooled_rows(spools[index])),
+            ("unique_data", SEARCH_HEADER, unique_rows),
+        ]))
+    return workbooks
+
+
+# ExportJob.export_type -> sheets builder
+EXPORT_REPORTS = {
+    "search_by_keywords": keyword_search_sheets,
+    "search_by_author_name": author_name_search_sheets,
+    "search_by_author_name_fuzzy": fuzzy_author_name_search_sheets,
+    "search_by_affiliation": affiliation_search_sheets,
+    "top_authors": top_authors_sheets,
+    "missing_emails": missing_email_sheets,
+    "science_direct_authors": science_direct_author_sheets,
+}
+
+
+# Paginated report -> (queryset builder, filter params) for the total counts (app.counts)
+COUNT_REPORTS = {
+    "top_authors": (top_authors_queryset, ("year", "keyword", "domain", "group")),
+    "missing_emails": (missing_email_queryset, ("year",)),
+}
+
+
+def search_cache_key(export_type, params):
+    """
+    Result cache key: the report, its normalized (sorted) inputs and filters, and the
+    current data version, so any ingestion or deletion invalidates it.
+    """
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"search:{export_type}:{get_data_version()}:{digest}"
+
+
+def cached_report_sheets(export_type, params):
+    """
+    Sheets of a report, served from the result cache when the same search was run
+    against the same data version.
+
+    On a miss the rows are streamed as usual and collected on the way; once the last
+    sheet is written they are cached, unless the result exceeds SEARCH_CACHE_MAX_ROWS.
+    """
+    key = search_cache_key(export_type, params)
+    cached = cache_get(key)
+    if cached is not None:
+        return [(title, header, iter(rows)) for title, header, rows in cached]
+
+    sheets = EXPORT_REPORTS[export_type](params)
+    collected = [[] for _ in sheets]
+    state = {'rows': 0, 'finished': 0}
+
+    def collecting(index, rows):
+        for row in rows:
+            if state['rows'] <= settings.SEARCH_CACHE_MAX_ROWS:
+                collected[index].append(row)
+                state['rows'] += 1
+            yield row
+        state['finished'] += 1
+        if state['finished'] == len(sheets) and state['rows'] <= settings.SEARCH_CACHE_MAX_ROWS:
+            cache_set(key, [(title, header, collected[i]) for i, (title, header, _) in enumerate(sheets)],
+                      settings.SEARCH_CACHE_TIMEOUT)
+
+    return [(title, header, collecting(i, rows)) for i, (title, header, rows) in enumerate(sheets)]
@@ -0,0 +1,247 @@
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+
+from app.dates import parse_year_range
+from app.models import Article, Author, DataExtractionArticle, DataExtractionAuthor, DataExtractionKeyword
+from app.names import name_similarity, name_tokens, query_blocking_keys
+
+SEARCH_CONFIG = 'english'
+
+# Search terms OR'd together per branch of a substring search (branches are UNIONed)
+SUBSTRING_TERMS_PER_BRANCH = 200
+
+# Lowest app.names.name_similarity (0-100) of a fuzzy author name match: keeps typos and
+# initials ('Jon Smyth', 'J. Smith' for 'John Smith', ~91+) and drops other given names
+# sharing the surname ('Jane Smith', ~85)
+FUZZY_NAME_MIN_SCORE = 88
+
+# Candidate rows fetched per round trip by the fuzzy author search
+FUZZY_CHUNK_SIZE = 2000
+
+# tsvector definitions kept in the search_vector columns (see update_*_search_vectors and app.signals)
+DATA_EXTRACTION_ARTICLE_VECTOR = (
+    SearchVector('article_title', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('article_keywords', weight='B', config=SEARCH_CONFIG)
+)
+DATA_EXTRACTION_AUTHOR_VECTOR = (
+    SearchVector('author_name', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('author_affiliation', weight='B', config=SEARCH_CONFIG)
+    + SearchVector('author_country', weight='C', config=SEARCH_CONFIG)
+)
+ARTICLE_VECTOR = SearchVector('article_title', weight='A', config=SEARCH_CONFIG)
+AUTHOR_VECTOR = (
+    SearchVector('author_name', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('article_title', weight='B', config=SEARCH_CONFIG)
+)
+
+# scope -> (model, columns returned by the search API)
+FULLTEXT_SCOPES = {
+    'articles': (DataExtractionArticle, ('id', 'article_title', 'published_year', 'article_keywords')),
+    'authors': (DataExtractionAuthor, ('id', 'author_name', 'author_email', 'author_affiliation',
+                                       'author_country', 'article__article_title')),
+    'sd_articles': (Article, ('id', 'article_id', 'article_title', 'published_year', 'journal_id')),
+    'sd_authors': (Author, ('id', 'author_name', 'author_email', 'article_title')),
+}
+
+
+def normalize_keyword(keyword):
+    """
+    Normalizes a keyword the same way for ingestion and search: trimmed and lowercased.
+    """
+    return keyword.strip().lower()
+
+
+def normalize_keywords(keywords):
+    """
+    Returns the unique, normalized, non-empty keywords from a list (order preserved).
+    """
+    normalized = {}
+    for keyword in keywords or []:
+        if isinstance(keyword, str) and keyword.strip():
+            normalized[normalize_keyword(keyword)] = None
+    return list(normalized)
+
+
+def normalize_email(email):
+    """
+    ' J.Doe@Uni.EDU' -> ('j.doe@uni.edu', 'uni.edu'); the domain is empty without an '@'.
+    """
+    normalized = (email or '').strip().lower()
+    return normalized, normalized.rsplit('@', 1)[1] if '@' in normalized else ''
+
+
+def keyword_authors(keywords, year=None):
+    """
+    DataExtractionAuthor rows of every article tagged with at least one of `keywords`.
+
+    Matching articles are resolved through the indexed keyword table, so this is a
+    single SQL semi-join instead of a scan of every article's keyword list.
+    """
+    matching_articles = DataExtractionKeyword.objects.filter(
+        keyword__in=normalize_keywords(keywords)
+    ).values('article_id')
+
+    authors = DataExtractionAuthor.objects.filter(article_id__in=matching_articles)
+    if year:
+        years = parse_year_range(year)
+        authors = authors.filter(article__publication_year__range=years) if years else authors.none()
+    return authors
+
+
+def keyword_match_rows(keywords, fields, year=None):
+    """
+    (author id, matched keyword, *fields) for every author of an article tagged with
+    one of `keywords`, ordered by author id: an author matching several keywords
+    comes out as consecutive rows. One indexed join serves any number of keyword
+    lists (see app.reports.keyword_list_workbooks).
+    """
+    authors = DataExtractionAuthor.objects.filter(article__keywords__keyword__in=normalize_keywords(keywords))
+    if year:
+        years = parse_year_range(year)
+        authors = authors.filter(article__publication_year__range=years) if years else authors.none()
+    return authors.order_by('id').values_list('id', 'article__keywords__keyword', *fields)
+
+
+def unique_by_email(authors):
+    """
+    First row (lowest id) per author email, using DISTINCT ON so the de-duplication
+    happens in the database instead of in a DataFrame.
+    """
+    return authors.order_by('author_email', 'id').distinct('author_email')
+
+
+def substring_match_ids(model, field, terms):
+    """
+    Subquery of the ids of `model` rows whose lowercased `field` contains any of `terms`.
+
+    LOWER(field) LIKE '%term%' is served by a pg_trgm GIN index on LOWER(field).
+    All terms go into a single query: large lists are split into branches of OR'd
+    LIKEs that are UNIONed, so each branch stays a cheap bitmap index scan.
+    """
+    terms = sorted({term.lower() for term in terms if term})
+    if not terms:
+        return None
+
+    lowered = model.objects.annotate(match_value=Lower(field))
+    branches = []
+    for start in range(0, len(terms), SUBSTRING_TERMS_PER_BRANCH):
+        condition = Q()
+        for term in terms[start:start + SUBSTRING_TERMS_PER_BRANCH]:
+            condition |= Q(match_value__contains=term)
+        branches.append(lowered.filter(condition).values('id'))
+
+    return branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+
+
+def substring_match_authors(field, terms):
+    """
+    DataExtractionAuthor rows whose lowercased `field` contains any of `terms`.
+    """
+    matching_ids = substring_match_ids(DataExtractionAuthor, field, terms)
+    if matching_ids is None:
+        return DataExtractionAuthor.objects.none()
+    return DataExtractionAuthor.objects.filter(id__in=matching_ids)
+
+
+def search_extracted_authors(keywords=(), year="", author_names=(), affiliations=(), countries=(), domain=""):
+    """
+    DataExtractionAuthor rows matching every given filter (empty filters are skipped):
+    any of the keywords, the publication year or year range, any of the name,
+    affiliation or country substrings, and the email domain. Each filter is an
+    indexed semi-join or predicate, so the result can be paged by id.
+    """
+    authors = DataExtractionAuthor.objects.all()
+    if keywords:
+        authors = keyword_authors(keywords, year=year)
+    elif year:
+        years = parse_year_range(year)
+        authors = authors.filter(article__publication_year__range=years) if years else authors.none()
+    for field, terms in (('author_name', author_names), ('author_affiliation', affiliations),
+                         ('author_country', countries)):
+        matching_ids = substring_match_ids(DataExtractionAuthor, field, terms)
+        if matching_ids is not None:
+            authors = authors.filter(id__in=matching_ids)
+    if domain:
+        authors = authors.filter(email_domain=domain.strip().lower().lstrip('@'))
+    return authors
+
+
+def fuzzy_author_rows(names, fields, min_score=FUZZY_NAME_MIN_SCORE):
+    """
+    (*fields, matched query name, score) for every DataExtractionAuthor whose name
+    scores at least `min_score` against one of `names`, in id order. Typo, accent
+    and word-order tolerant ('Mueller J' finds 'Müller Johann').
+
+    Candidates are the authors sharing a blocking key (app.names) with a query name,
+    read through the GIN index on name_blocks; a candidate is only scored against the
+    query names of its blocks.
+    """
+    queries = []
+    names_by_key = defaultdict(set)
+    for name in names:
+        keys = query_blocking_keys(name)
+        if keys:
+            for key in keys:
+                names_by_key[key].add(len(queries))
+            queries.append((name, name_tokens(name)))
+    if not queries:
+        return
+
+    candidates = (DataExtractionAuthor.objects
+                  .filter(name_blocks__overlap=sorted(names_by_key))
+                  .order_by('id')
+                  .values_list('author_name', 'name_blocks', *fields)
+                  .iterator(chunk_size=FUZZY_CHUNK_SIZE))
+    for author_name, blocks, *values in candidates:
+        tokens = name_tokens(author_name)
+        indexes = set().union(*(names_by_key.get(key, ()) for key in blocks))
+        score, index = max((name_similarity(queries[index][1], tokens), index) for index in indexes)
+        if score >= min_score:
+            yield (*values, queries[index][0], round(score))
+
+
+def science_direct_title_authors(keywords):
+    """
+    ScienceDirect authors of every article whose title contains any of `keywords`
+    (case-insensitive), matched on the trigram-indexed Article title rather than a
+    regex over the denormalized Author.article_title.
+    """
+    matching_ids = substring_match_ids(Article, 'article_title', keywords)
+    if matching_ids is None:
+        return Author.objects.none()
+    return Author.objects.filter(article__id__in=matching_ids)
+
+
+def update_data_extraction_search_vectors(extraction):
+    """
+    Refreshes the search vectors of every article and author loaded by a DataExtraction
+    (two set-based UPDATEs instead of one per row).
+    """
+    DataExtractionArticle.objects.filter(data_extraction=extraction).update(
+        search_vector=DATA_EXTRACTION_ARTICLE_VECTOR
+    )
+    DataExtractionAuthor.objects.filter(article__data_extraction=extraction).update(
+        search_vector=DATA_EXTRACTION_AUTHOR_VECTOR
+    )
+
+
+def fulltext_search(scope, text, page=1, page_size=25):
+    """
+    Ranked full-text search over the GIN-indexed search_vector of the given scope.
+    Returns (rows, has_next); pages are fetched with a one-row lookahead instead of COUNT().
+    """
+    model, fields = FULLTEXT_SCOPES[scope]
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+
+    start = (page - 1) * page_size
+    rows = list(
+        model.objects
+        .filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', 'id')
+        .values(*fields, 'rank')[start:start + page_size + 1]
+    )
+    return rows[:page_size], len(rows) > page_size
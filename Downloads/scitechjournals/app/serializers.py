@@ -1,7 +1,7 @@
 # serializers.py
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
-from .models import Users
+from .models import DataExtractionAuthor, Users
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,3 +22,40 @@ class UserSerializer(serializers.ModelSerializer):
         if 'password' in validated_data:
             validated_data['password'] = make_password(validated_data['password'])
         return super().update(instance, validated_data)
+
+
+class ExtractedAuthorSerializer(serializers.ModelSerializer):
+    """
+    An extracted author with the columns of its article. The `fields` query param
+    (comma-separated) keeps only the listed fields; see AuthorSearchAPI.
+    """
+    article_title = serializers.CharField(source='article.article_title', read_only=True)
+    publication_year = serializers.IntegerField(source='article.publication_year', read_only=True)
+    article_keywords = serializers.JSONField(source='article.article_keywords', read_only=True)
+
+    class Meta:
+        model = DataExtractionAuthor
+        fields = [
+            'id', 'author_name', 'author_email', 'email_domain', 'author_affiliation', 'author_country',
+            'article_id', 'article_title', 'publication_year', 'article_keywords'
+        ]
+
+    @classmethod
+    def selected_fields(cls, fields_param):
+        """The requested fields in declared order, or every field when none is valid."""
+        requested = {field.strip() for field in (fields_param or '').split(',')}
+        return [field for field in cls.Meta.fields if field in requested] or list(cls.Meta.fields)
+
+    @classmethod
+    def query_columns(cls, fields):
+        """ORM columns behind the given fields, for only() (article ones through the join)."""
+        declared = cls._declared_fields
+        return [declared[field].source.replace('.', '__') if field in declared else field for field in fields]
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field in set(self.fields) - set(fields):
+                self.fields.pop(field)
+
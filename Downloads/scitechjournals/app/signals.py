@@ -0,0 +1,138 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from app.aggregates import extraction_author_names, refresh_author_aggregates
+from app.cache import bump_data_version
+from app.dates import parse_publication_date, parse_publication_year
+from app.groups import sync_extraction_groups
+from app.lookups import invalidate_lookup
+from app.models import (Article, Author, DataExtraction, DataExtractionArticle, DataExtractionAuthor,
+                        DataExtractionGroup, Users)
+from app.names import name_blocking_keys
+from app.search import ARTICLE_VECTOR, AUTHOR_VECTOR, normalize_email
+from app.stats import (apply_stat_deltas, apply_upload_deltas, extraction_counts, extraction_data_counts,
+                       extraction_upload_counts)
+
+
+@receiver(pre_save, sender=Article)
+def set_article_publication(sender, instance, **kwargs):
+    instance.publication_year = parse_publication_year(instance.published_year, instance.published_date)
+    # ScienceDirect keeps the day, month name and year in separate columns
+    instance.publication_date = parse_publication_date(
+        f"{instance.published_date or ''} {instance.published_month or ''} {instance.published_year or ''}",
+        instance.published_year)
+
+
+@receiver(pre_save, sender=DataExtractionArticle)
+def set_data_extraction_article_publication(sender, instance, **kwargs):
+    instance.publication_year = parse_publication_year(instance.published_year, instance.published_date)
+    instance.publication_date = parse_publication_date(instance.published_date, instance.published_year)
+
+
+@receiver(post_save, sender=Article)
+def update_article_search_vector(sender, instance, **kwargs):
+    # Queryset update so the tsvector is computed by PostgreSQL without re-firing post_save
+    Article.objects.filter(pk=instance.pk).update(search_vector=ARTICLE_VECTOR)
+
+
+@receiver(pre_save, sender=Author)
+@receiver(pre_save, sender=DataExtractionAuthor)
+def set_normalized_email(sender, instance, **kwargs):
+    instance.email_normalized, instance.email_domain = normalize_email(instance.author_email)
+
+
+@receiver(pre_save, sender=DataExtractionAuthor)
+def set_name_blocks(sender, instance, **kwargs):
+    instance.name_blocks = name_blocking_keys(instance.author_name)
+
+
+@receiver(post_save, sender=Author)
+def update_author_search_vector(sender, instance, **kwargs):
+    Author.objects.filter(pk=instance.pk).update(search_vector=AUTHOR_VECTOR)
+
+
+@receiver(post_save, sender=DataExtraction)
+def data_extraction_created(sender, instance, created, **kwargs):
+    # New data invalidates every cached search result (see app.reports.cached_report_sheets)
+    if created:
+        transaction.on_commit(bump_data_version)
+
+
+@receiver(post_save, sender=DataExtraction)
+def sync_data_extraction_groups(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'extraction_groups' in update_fields:
+        sync_extraction_groups(instance)
+
+
+@receiver(post_delete, sender=DataExtraction)
+def data_extraction_deleted(sender, instance, **kwargs):
+    transaction.on_commit(bump_data_version)
+
+
+@receiver(pre_delete, sender=DataExtraction)
+def collect_extraction_authors(sender, instance, **kwargs):
+    # Captured before the cascade removes the rows, refreshed once it has
+    instance._aggregate_author_names = extraction_author_names(instance)
+
+
+@receiver(post_delete, sender=DataExtraction)
+def refresh_deleted_extraction_authors(sender, instance, **kwargs):
+    names = getattr(instance, '_aggregate_author_names', None)
+    if names:
+        transaction.on_commit(lambda: refresh_author_aggregates(names))
+
+
+@receiver(post_save, sender=DataExtraction)
+def count_created_extraction(sender, instance, created, **kwargs):
+    # Its articles/authors are counted by save_extraction_items once they are loaded
+    if created:
+        apply_stat_deltas(extraction_counts(instance))
+
+
+@receiver(post_save, sender=DataExtraction)
+def roll_up_created_extraction(sender, instance, created, **kwargs):
+    if created:
+        apply_upload_deltas(extraction_upload_counts(instance))
+
+
+@receiver(post_delete, sender=DataExtraction)
+def roll_up_deleted_extraction(sender, instance, **kwargs):
+    apply_upload_deltas(extraction_upload_counts(instance, sign=-1))
+
+
+@receiver(pre_delete, sender=DataExtraction)
+def collect_extraction_counts(sender, instance, **kwargs):
+    instance._dashboard_counts = extraction_counts(instance) + extraction_data_counts(instance)
+
+
+@receiver(post_delete, sender=DataExtraction)
+def uncount_deleted_extraction(sender, instance, **kwargs):
+    counts = getattr(instance, '_dashboard_counts', None)
+    if counts:
+        apply_stat_deltas(Counter({key: -count for key, count in counts.items()}))
+
+
+@receiver(post_save, sender=DataExtractionGroup)
+def count_created_group(sender, instance, created, **kwargs):
+    if created:
+        apply_stat_deltas(Counter({('groups', ''): 1}))
+
+
+@receiver(post_delete, sender=DataExtractionGroup)
+def uncount_deleted_group(sender, instance, **kwargs):
+    apply_stat_deltas(Counter({('groups', ''): -1}))
+
+
+@receiver(post_save, sender=Users)
+@receiver(post_delete, sender=Users)
+def users_changed(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_lookup('users'))
+
+
+@receiver(post_save, sender=DataExtractionGroup)
+@receiver(post_delete, sender=DataExtractionGroup)
+def groups_changed(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_lookup('groups'))
@@ -0,0 +1,179 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from app.models import (DailyUploadRollup, DashboardStat, DataExtraction, DataExtractionArticle,
+                        DataExtractionAuthor, DataExtractionGroup, DataExtractionKeyword, Users)
+
+# Counter rows upserted per statement
+STATS_BATCH_SIZE = 1000
+
+# Ranked kinds only show their top rows on the dashboard
+TOP_STATS = 10
+
+UPSERT_SQL = """
+    INSERT INTO {table} (kind, key, count, updated_at)
+    VALUES {values}
+    ON CONFLICT (kind, key) DO UPDATE
+       SET count = {table}.count + EXCLUDED.count, updated_at = EXCLUDED.updated_at
+"""
+
+UPLOAD_UPSERT_SQL = """
+    INSERT INTO {table} (upload_date, user_id, uploads, total_records, total_unique_records, updated_at)
+    VALUES {values}
+    ON CONFLICT (upload_date, user_id) DO UPDATE
+       SET uploads = {table}.uploads + EXCLUDED.uploads,
+           total_records = {table}.total_records + EXCLUDED.total_records,
+           total_unique_records = {table}.total_unique_records + EXCLUDED.total_unique_records,
+           updated_at = EXCLUDED.updated_at
+"""
+
+
+def apply_stat_deltas(deltas):
+    """
+    Adds a Counter of (kind, key) -> delta to the DashboardStat rows in place
+    (INSERT ... ON CONFLICT, so concurrent ingests don't lose updates).
+    Rows that drop to zero are removed.
+    """
+    items = sorted((kind, str(key), delta) for (kind, key), delta in deltas.items() if delta)
+    if not items:
+        return
+    table = connection.ops.quote_name(DashboardStat._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(items), STATS_BATCH_SIZE):
+            batch = items[start:start + STATS_BATCH_SIZE]
+            values = ", ".join(["(%s, %s, %s, now())"] * len(batch))
+            cursor.execute(UPSERT_SQL.format(table=table, values=values),
+                           [value for item in batch for value in item])
+        if any(delta < 0 for _, _, delta in items):
+            DashboardStat.objects.filter(count__lte=0).delete()
+
+
+def extraction_counts(extraction):
+    """Counters of a DataExtraction row itself: its type and its uploader."""
+    return Counter({
+        ('extraction_type', extraction.extraction_type if extraction.extraction_type is not None else ''): 1,
+        ('user', extraction.extracted_by_id or ''): 1,
+    })
+
+
+def extraction_data_counts(extraction):
+    """Counters of the articles and authors loaded by a DataExtraction (keywords, years, domains)."""
+    counts = Counter()
+    keywords = (DataExtractionKeyword.objects
+                .filter(article__data_extraction=extraction)
+                .values_list('keyword')
+                .annotate(count=Count('id')))
+    years = (DataExtractionArticle.objects
+             .filter(data_extraction=extraction)
+             .exclude(publication_year__isnull=True)
+             .values_list('publication_year')
+             .annotate(count=Count('id')))
+    domains = (DataExtractionAuthor.objects
+               .filter(article__data_extraction=extraction)
+               .exclude(email_domain='')
+               .values_list('email_domain')
+               .annotate(count=Count('id')))
+    for kind, rows in (('keyword', keywords), ('year', years), ('domain', domains)):
+        for key, count in rows:
+            counts[(kind, key)] += count
+    return counts
+
+
+def rebuild_dashboard_stats():
+    """Recomputes every counter from the current data. Returns the number of rows written."""
+    counts = Counter({('groups', ''): DataExtractionGroup.objects.count()})
+    for kind, rows in (
+        ('extraction_type', DataExtraction.objects.values_list('extraction_type').annotate(count=Count('id'))),
+        ('user', DataExtraction.objects.values_list('extracted_by_id').annotate(count=Count('id'))),
+        ('keyword', DataExtractionKeyword.objects.values_list('keyword').annotate(count=Count('id'))),
+        ('year', DataExtractionArticle.objects.exclude(publication_year__isnull=True)
+                 .values_list('publication_year').annotate(count=Count('id'))),
+        ('domain', DataExtractionAuthor.objects.exclude(email_domain='')
+                   .values_list('email_domain').annotate(count=Count('id'))),
+    ):
+        for key, count in rows:
+            counts[(kind, '' if key is None else key)] += count
+
+    stats = [DashboardStat(kind=kind, key=str(key), count=count) for (kind, key), count in counts.items() if count]
+    with transaction.atomic():
+        DashboardStat.objects.all().delete()
+        DashboardStat.objects.bulk_create(stats, batch_size=STATS_BATCH_SIZE)
+    return len(stats)
+
+
+def dashboard_stats():
+    """
+    Every dashboard figure in one query: the small kinds in full plus the top
+    keywords and domains (index-backed LIMIT on kind, -count).
+    """
+    def top(kind):
+        return DashboardStat.objects.filter(kind=kind).order_by('-count', 'key').values_list('kind', 'key', 'count')[:TOP_STATS]
+
+    rows = (DashboardStat.objects
+            .filter(kind__in=['groups', 'extraction_type', 'user', 'year'])
+            .values_list('kind', 'key', 'count')
+            .union(top('keyword'), top('domain'), all=True))
+
+    stats = {kind: {} for kind, _ in DashboardStat.KIND_CHOICES}
+    for kind, key, count in rows:
+        stats[kind][key] = count
+    return stats
+
+
+def user_upload_counts(stats):
+    """(first names, counts) of the per-user counters, highest first."""
+    uploads = sorted(stats['user'].items(), key=lambda item: -item[1])
+    names = dict(Users.objects
+                 .filter(id__in=[int(key) for key, _ in uploads if key.isdigit()])
+                 .values_list('id', 'first_name'))
+    labels = [(names.get(int(key)) if key.isdigit() else None) or 'Unknown' for key, _ in uploads]
+    return labels, [count for _, count in uploads]
+
+
+def extraction_upload_counts(extraction, sign=1):
+    """
+    The DailyUploadRollup delta of one extraction: (upload date, user id) ->
+    (uploads, records, unique records), negated with sign=-1 on delete.
+    """
+    day = timezone.localdate(extraction.created_at) if extraction.created_at else timezone.localdate()
+    # extracted_by defaults to '' on unsaved-FK instances, stored as NULL
+    return {(day, extraction.extracted_by_id or None): (
+        sign, sign * (extraction.total_records or 0), sign * (extraction.total_unique_records or 0))}
+
+
+def apply_upload_deltas(deltas):
+    """Adds (uploads, records, unique records) deltas to the DailyUploadRollup rows in place."""
+    items = sorted(((day, user_id) + delta for (day, user_id), delta in deltas.items() if any(delta)),
+                   key=lambda item: (item[0], item[1] or 0))
+    if not items:
+        return
+    table = connection.ops.quote_name(DailyUploadRollup._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(items), STATS_BATCH_SIZE):
+            batch = items[start:start + STATS_BATCH_SIZE]
+            values = ", ".join(["(%s, %s, %s, %s, %s, now())"] * len(batch))
+            cursor.execute(UPLOAD_UPSERT_SQL.format(table=table, values=values),
+                           [value for item in batch for value in item])
+        if any(item[2] < 0 for item in items):
+            DailyUploadRollup.objects.filter(uploads__lte=0).delete()
+
+
+def rebuild_upload_rollups():
+    """Recomputes the DailyUploadRollup rows from DataExtraction. Returns the number of rows written."""
+    rows = (DataExtraction.objects
+            .annotate(day=TruncDate('created_at'))
+            .values('day', 'extracted_by_id')
+            .annotate(uploads=Count('id'),
+                      records=Coalesce(Sum('total_records'), 0),
+                      unique_records=Coalesce(Sum('total_unique_records'), 0)))
+    rollups = [DailyUploadRollup(upload_date=row['day'], user_id=row['extracted_by_id'], uploads=row['uploads'],
+                                 total_records=row['records'], total_unique_records=row['unique_records'])
+               for row in rows]
+    with transaction.atomic():
+        DailyUploadRollup.objects.all().delete()
+        DailyUploadRollup.objects.bulk_create(rollups, batch_size=STATS_BATCH_SIZE)
+    return len(rollups)
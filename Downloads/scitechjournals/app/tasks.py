@@ -1,6 +1,13 @@
+import os
+
 from celery import shared_task
+from django.conf import settings
 from django.core.mail import send_mail
-from .models import ScrapeLog
+from django.utils import timezone
+from .counts import compute_exact_count
+from .exports import write_export
+from .models import ScrapeLog, ExportJob
+from .reports import EXPORT_REPORTS
 from .scrapers.science_direct import scrape_science_direct
 
 @shared_task(bind=True)
@@ -28,3 +35,54 @@ def scrape_science_direct_task(self, user_email=None):
         if user_email:
             send_mail('❌ ScienceDirect Scraping Failed', str(e), 'noreply@example.com', [user_email])
         raise e
+
+
+EXPORT_DIR = settings.EXPORT_ROOT
+
+@shared_task(bind=True)
+def run_export_job(self, job_id):
+    """
+    Writes a queued ExportJob to EXPORT_DIR, streaming the rows from server-side cursors.
+    """
+    job = ExportJob.objects.get(pk=job_id)
+    job.status = 'RUNNING'
+    job.save(update_fields=['status', 'updated_at'])
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{job.id}_{job.file_name}")
+    row_count = 0
+
+    def counted(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
+    try:
+        sheets = EXPORT_REPORTS[job.export_type](job.params)
+        # The first sheet holds every matched row; later ones are de-duplicated views of it
+        title, header, rows = sheets[0]
+        sheets[0] = (title, header, counted(rows))
+        write_export(path, job.file_format, sheets)
+
+        job.status = 'SUCCESS'
+        job.file_path = path
+        job.row_count = row_count
+        job.message = f"{row_count} rows exported."
+    except Exception as e:
+        if os.path.exists(path):
+            os.remove(path)
+        job.status = 'FAILURE'
+        job.message = str(e)
+        raise e
+    finally:
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'file_path', 'row_count', 'message', 'completed_at', 'updated_at'])
+
+    return {'rows': row_count}
+
+
+@shared_task(bind=True)
+def compute_report_count(self, name, params):
+    """Exact total of a report, cached for app.counts.report_count."""
+    return compute_exact_count(name, params)
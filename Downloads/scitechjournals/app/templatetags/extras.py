@@ -22,4 +22,21 @@ def get_item(dictionary, key):
 
 @register.filter
 def get_group(dictionary, key):
-    return dictionary.get(key)
\ No newline at end of file
+    return dictionary.get(key)
+
+@register.filter
+def join_attr(items, attr):
+    """Usage: {{ extraction.groups.all|join_attr:'group_name' }} -> 'Onco, Cardio' """
+    return ", ".join(str(getattr(item, attr, '')) for item in items)
+
+@register.filter
+def approx_number(value):
+    """Usage: {{ 1234567|approx_number }} -> 1.2M """
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return value
+    for limit, suffix in ((10 ** 9, 'B'), (10 ** 6, 'M'), (10 ** 3, 'K')):
+        if abs(value) >= limit:
+            return f"{value / limit:.1f}".rstrip('0').rstrip('.') + suffix
+    return str(value)
@@ -1,3 +1,818 @@
-from django.test import TestCase
+import io
+import os
+import subprocess
+import tarfile
+import tempfile
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app import cache as app_cache
+from app.aggregates import rebuild_author_aggregates
+from app.backup_storage import LocalStorage
+from app.backups import create_archive, dump_database, restore_tree
+from app.cache import DATA_VERSION_KEY, bump_data_version, cache_get, cache_set, get_data_version
+from app.counts import compute_exact_count, report_count
+from app.dates import parse_publication_date, parse_year_range
+from app.exports import STREAM_FLUSH_BYTES
+from app.groups import extraction_ids_in_groups, sync_extraction_groups
+from app.lookups import lookup, user_groups
+from app.models import (AuthorAggregateCount, BackupDataExtractionLog, DailyUploadRollup, DashboardStat,
+                        DataExtraction, DataExtractionArticle, DataExtractionAuthor, DataExtractionGroup,
+                        DataExtractionKeyword, Users)
+from app.names import name_blocking_keys, name_similarity, name_tokens, query_blocking_keys, soundex
+from app.pagination import keyset_page
+from app.reports import keyword_list_workbooks, top_authors_queryset
+from app.search import FUZZY_NAME_MIN_SCORE, fuzzy_author_rows
+from app.stats import (apply_stat_deltas, apply_upload_deltas, extraction_data_counts, rebuild_dashboard_stats,
+                       rebuild_upload_rollups)
+
+REDIS_DOWN = ConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+# Two separate local-memory caches, 'default' standing in for Redis
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'redis'},
+    'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'local'},
+}
+
+
+def similarity(query, candidate):
+    return name_similarity(name_tokens(query), name_tokens(candidate))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CacheFallbackTests(SimpleTestCase):
+    # An outage makes the operations of the 'default' cache raise
+
+    def setUp(self):
+        for alias in ('default', 'local'):
+            caches[alias].clear()
+        for name, value in (('_redis_down_since', None), ('_pending_bumps', set())):
+            patcher = mock.patch.object(app_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @contextmanager
+    def redis_down(self):
+        methods = {method: mock.Mock(side_effect=REDIS_DOWN) for method in ('get', 'set', 'add', 'incr')}
+        with mock.patch.multiple(caches['default'], **methods):
+            yield methods
+        # Let the next call retry Redis
+        app_cache._redis_down_since -= app_cache.REDIS_RETRY_AFTER + 1
+
+    def test_falls_back_to_the_local_cache(self):
+        with self.redis_down():
+            cache_set('key', 'value')
+            self.assertEqual(cache_get('key'), 'value')
+        self.assertEqual(caches['local'].get('key'), 'value')
+        self.assertIsNone(caches['default'].get('key'))
+
+    def test_waits_before_retrying_redis(self):
+        with self.redis_down() as redis:
+            cache_get('key')
+            cache_get('key')
+            cache_set('key', 'value')
+        self.assertEqual(redis['get'].call_count, 1)
+        self.assertEqual(redis['set'].call_count, 0)
+
+        cache_set('key', 'value')
+        self.assertEqual(caches['default'].get('key'), 'value')
+        self.assertIsNone(app_cache._redis_down_since)
+
+    def test_bump_during_outage_survives_recovery(self):
+        version = get_data_version()
+        with self.redis_down():
+            bump_data_version()
+        self.assertEqual(caches['default'].get(DATA_VERSION_KEY), version)
+
+        self.assertEqual(get_data_version(), version + 1)
+        self.assertEqual(caches['default'].get(DATA_VERSION_KEY), version + 1)
+        self.assertFalse(app_cache._pending_bumps)
+
+    def test_bumps_while_up_are_not_replayed(self):
+        version = get_data_version()
+        bump_data_version()
+        cache_get('key')
+        self.assertEqual(get_data_version(), version + 1)
+
+
+class TopAuthorsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for group_id in (3, 7, 13):
+            DataExtractionGroup.objects.create(id=group_id, group_name=f"Group {group_id}")
+        first = DataExtraction.objects.create(extraction_name="first", extraction_groups="3")
+        cls.second = DataExtraction.objects.create(extraction_name="second", extraction_groups="7, 13")
+        for extraction, year, keywords, authors in [
+            (first, "2010", ["graphene"], ["Prolific Author"]),
+            (first, "2010", ["graphene"], ["Prolific Author", " prolific author "]),
+            (first, "2010", ["graphene"], ["Prolific Author"]),
+            (first, "2023", ["graphene"], ["Recent Author"]),
+            (first, "2023", ["graphene"], ["Recent Author"]),
+            (cls.second, "2023", ["graphene", "optics"], ["Prolific Author"]),
+            (cls.second, None, ["graphene"], ["Recent Author"]),
+        ]:
+            article = DataExtractionArticle.objects.create(data_extraction=extraction, published_year=year)
+            for keyword in keywords:
+                DataExtractionKeyword.objects.create(article=article, keyword=keyword)
+            for name in authors:
+                email = "p@uni.edu" if name.strip().lower() == "prolific author" else "r@lab.org"
+                DataExtractionAuthor.objects.create(article=article, author_name=name, author_email=email)
+        rebuild_author_aggregates()
+
+    def ranking(self, **filters):
+        return [(row["email"], row["article_count"], row["first_year"], row["last_year"])
+                for row in top_authors_queryset(**filters)]
+
+    def test_all_time_ranking(self):
+        self.assertEqual(self.ranking(), [("p@uni.edu", 4, 2010, 2023), ("r@lab.org", 3, 2023, 2023)])
+
+    def test_year_counts_only_that_years_articles(self):
+        self.assertEqual(self.ranking(year="2023"), [("r@lab.org", 2, 2023, 2023), ("p@uni.edu", 1, 2023, 2023)])
+        self.assertEqual(self.ranking(year="2010"), [("p@uni.edu", 3, 2010, 2010)])
+        self.assertEqual(self.ranking(year="abc"), [])
+
+    def test_year_range_sums_the_years(self):
+        self.assertEqual(self.ranking(year="2023-2010"), [("p@uni.edu", 4, 2010, 2023), ("r@lab.org", 2, 2023, 2023)])
+        self.assertEqual(self.ranking(year="2011-2022"), [])
+
+    def test_group_counts_only_the_groups_articles(self):
+        self.assertEqual(self.ranking(group="7"), [("p@uni.edu", 1, 2023, 2023), ("r@lab.org", 1, None, None)])
+        self.assertEqual(self.ranking(group="3", year="2023"), [("r@lab.org", 2, 2023, 2023)])
+        self.assertEqual(self.ranking(group="1"), [])
+        self.assertEqual(self.ranking(group="x"), [])
+
+    def test_domain_filter(self):
+        self.assertEqual(self.ranking(domain="@LAB.org"), [("r@lab.org", 3, 2023, 2023)])
+        self.assertEqual(self.ranking(domain="uni.edu", year="2023"), [("p@uni.edu", 1, 2023, 2023)])
+
+    def test_keyword_ranking_counts_like_the_aggregate(self):
+        for filters in ({"year": "2023"}, {"year": "2009-2023"}, {"group": "7"}, {"group": "3", "year": "2010"}, {}):
+            with self.subTest(**filters):
+                self.assertEqual(self.ranking(keyword="Graphene", **filters), self.ranking(**filters))
+        self.assertEqual([row[:2] for row in self.ranking(keyword="optics")], [("p@uni.edu", 1)])
+
+    def test_deleting_an_extraction_refreshes_the_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        self.assertEqual(self.ranking(), [("p@uni.edu", 3, 2010, 2010), ("r@lab.org", 2, 2023, 2023)])
+        self.assertEqual(self.ranking(group="7"), [])
+
+        refreshed = self.counts()
+        rebuild_author_aggregates()
+        self.assertEqual(self.counts(), refreshed)
+
+    def counts(self):
+        return sorted(AuthorAggregateCount.objects.values_list(
+            "aggregate__name_norm", "aggregate__email_norm", "group_id", "year", "articles"), key=str)
+
+
+class YearRangeTests(SimpleTestCase):
+    def test_parse_year_range(self):
+        self.assertEqual(parse_year_range("2021"), (2021, 2021))
+        self.assertEqual(parse_year_range("2019-2023"), (2019, 2023))
+        self.assertEqual(parse_year_range("2023-2019"), (2019, 2023))
+        self.assertEqual(parse_year_range(2021), (2021, 2021))
+        for value in ("", None, "abc", "20", "2021-"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_year_range(value))
+
+    def test_parse_publication_date(self):
+        self.assertEqual(parse_publication_date("2021 Jan 15"), date(2021, 1, 15))
+        self.assertEqual(parse_publication_date("15 March 2020"), date(2020, 3, 15))
+        self.assertEqual(parse_publication_date("2019-02-30"), date(2019, 2, 1))
+        self.assertEqual(parse_publication_date("", "2018"), date(2018, 1, 1))
+        self.assertIsNone(parse_publication_date("n.d.", None))
+
+
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        extraction = DataExtraction.objects.create(extraction_name="test", extraction_groups="3")
+        for name in ("Baker", "Adams", "Baker", "Clark", "Adams", "Evans", "Adams"):
+            article = DataExtractionArticle.objects.create(data_extraction=extraction, published_year="2020")
+            DataExtractionKeyword.objects.create(article=article, keyword="topic")
+            DataExtractionAuthor.objects.create(article=article, author_name=name,
+                                                author_email=f"{name.lower()}@example.org")
+        rebuild_author_aggregates()
+
+    def walk(self, queryset, page_size):
+        pages, cursor = [], None
+        while True:
+            page = keyset_page(queryset, cursor, page_size)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once(self):
+        for ordering in (("author_name", "id"), ("-author_name", "id"), ("author_name", "-id")):
+            with self.subTest(ordering=ordering):
+                queryset = DataExtractionAuthor.objects.order_by(*ordering)
+                pages = self.walk(queryset, 2)
+                self.assertEqual([row.id for page in pages for row in page.rows], [row.id for row in queryset])
+                self.assertEqual([page.start_index for page in pages], [0, 2, 4, 6])
+                self.assertFalse(pages[0].has_previous)
+
+    def test_null_sort_keys_are_paged_like_postgresql_orders_them(self):
+        article = DataExtractionArticle.objects.first()
+        for _ in range(3):
+            DataExtractionAuthor.objects.create(article=article, author_name=None)
+        for ordering in (("author_name", "id"), ("-author_name", "id"), ("author_name", "-id")):
+            with self.subTest(ordering=ordering):
+                queryset = DataExtractionAuthor.objects.order_by(*ordering)
+                pages = self.walk(queryset, 3)
+                self.assertEqual([row.id for page in pages for row in page.rows], [row.id for row in queryset])
+                for previous, page in zip(pages, pages[1:]):
+                    back = keyset_page(queryset, page.prev_cursor, 3)
+                    self.assertEqual([row.id for row in back.rows], [row.id for row in previous.rows])
+
+    def test_previous_cursor_returns_the_same_pages(self):
+        queryset = DataExtractionAuthor.objects.order_by("author_name", "id")
+        pages = self.walk(queryset, 2)
+        for previous, page in zip(pages, pages[1:]):
+            back = keyset_page(queryset, page.prev_cursor, 2)
+            self.assertEqual([row.id for row in back.rows], [row.id for row in previous.rows])
+            self.assertEqual(back.start_index, previous.start_index)
+            self.assertTrue(back.has_next)
+        self.assertFalse(keyset_page(queryset, pages[1].prev_cursor, 2).has_previous)
+
+    def test_invalid_cursor_starts_over(self):
+        queryset = DataExtractionAuthor.objects.order_by("author_name", "id")
+        page = keyset_page(queryset, "not-a-cursor", 3)
+        self.assertEqual([row.id for row in page.rows], [row.id for row in queryset[:3]])
+        self.assertFalse(page.has_previous)
+
+    def test_top_authors_pages(self):
+        for filters in ({}, {"year": "2020"}, {"group": "3"}, {"keyword": "topic"}):
+            with self.subTest(**filters):
+                queryset = top_authors_queryset(**filters)
+                rows = [row for page in self.walk(queryset, 1) for row in page.rows]
+                self.assertEqual(rows, list(queryset))
+                self.assertEqual([row["article_count"] for row in rows], [3, 2, 1, 1])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ReportCountTests(TestCase):
+    params = {"year": ""}
+
+    @classmethod
+    def setUpTestData(cls):
+        article = DataExtractionArticle.objects.create(article_title="Article")
+        for email in (None, "", "", "author@example.org"):
+            DataExtractionAuthor.objects.create(article=article, author_name="Author", author_email=email)
+
+    def setUp(self):
+        for alias in ('default', 'local'):
+            caches[alias].clear()
+        patcher = mock.patch("app.tasks.compute_report_count.delay")
+        self.queue = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_estimate_until_the_exact_count_is_computed(self):
+        first = report_count("missing_emails", self.params)
+        second = report_count("missing_emails", self.params)
+        self.assertFalse(first["exact"])
+        self.assertEqual(second, first)
+        self.queue.assert_called_once_with("missing_emails", self.params)
+
+        # What the queued task does
+        self.assertEqual(compute_exact_count("missing_emails", self.params), 3)
+        self.assertEqual(report_count("missing_emails", self.params), {"count": 3, "exact": True})
+        self.assertEqual(self.queue.call_count, 1)
+
+    def test_each_filter_is_counted_once(self):
+        for _ in range(2):
+            report_count("missing_emails", {"year": "2020"})
+            report_count("top_authors", {"year": "", "keyword": "", "domain": "", "group": ""})
+        self.assertEqual(self.queue.call_count, 2)
+
+    def test_new_data_requeues_the_count(self):
+        compute_exact_count("missing_emails", self.params)
+        bump_data_version()
+        self.assertFalse(report_count("missing_emails", self.params)["exact"])
+        self.queue.assert_called_once_with("missing_emails", self.params)
+
+    def test_invalid_filter_is_an_exact_zero(self):
+        params = {"year": "", "keyword": "", "domain": "", "group": "x"}
+        self.assertEqual(report_count("top_authors", params), {"count": 0, "exact": True})
+        self.queue.assert_not_called()
+
+    def test_queue_failure_still_returns_the_estimate(self):
+        self.queue.side_effect = OSError("broker unreachable")
+        self.assertFalse(report_count("missing_emails", self.params)["exact"])
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        self.user = Users.objects.create(first_name="Ada")
+        DataExtractionGroup.objects.create(group_name="Group")
+
+    def load(self, extraction_type, user, articles):
+        """An extraction with its rows, counted the way save_extraction_items does once they are loaded."""
+        extraction = DataExtraction.objects.create(extraction_name="test", extraction_type=extraction_type,
+                                                   extracted_by=user)
+        for year, keywords, emails in articles:
+            article = DataExtractionArticle.objects.create(data_extraction=extraction, published_year=year)
+            for keyword in keywords:
+                DataExtractionKeyword.objects.create(article=article, keyword=keyword)
+            for email in emails:
+                DataExtractionAuthor.objects.create(article=article, author_name="Author", author_email=email)
+        apply_stat_deltas(extraction_data_counts(extraction))
+        return extraction
+
+    def stats(self):
+        return {(kind, key): count for kind, key, count in DashboardStat.objects.values_list("kind", "key", "count")}
+
+    def load_two(self):
+        first = self.load(1, self.user, [
+            ("2020", ["graphene", "optics"], ["a@uni.edu", "B@Uni.edu "]),
+            ("2021", ["graphene"], ["c@lab.org", None]),
+        ])
+        second = self.load(2, None, [("2020", ["graphene"], ["d@uni.edu"]), ("", [], [])])
+        return first, second
+
+    def test_incremental_counts_match_a_rebuild(self):
+        self.load_two()
+        incremental = self.stats()
+        self.assertEqual(incremental, {
+            ("groups", ""): 1,
+            ("extraction_type", "1"): 1, ("extraction_type", "2"): 1,
+            ("user", str(self.user.id)): 1, ("user", ""): 1,
+            ("keyword", "graphene"): 3, ("keyword", "optics"): 1,
+            ("year", "2020"): 2, ("year", "2021"): 1,
+            ("domain", "uni.edu"): 3, ("domain", "lab.org"): 1,
+        })
+        rebuild_dashboard_stats()
+        self.assertEqual(self.stats(), incremental)
+
+    def test_deleting_extractions_returns_the_counters_to_zero(self):
+        before = self.stats()
+        first, second = self.load_two()
+        first.delete()
+        self.assertEqual(self.stats()[("keyword", "graphene")], 1)
+        second.delete()
+        self.assertEqual(self.stats(), before)
+
+    def test_deleting_a_user_uncounts_their_extractions(self):
+        self.load_two()
+        self.user.delete()
+        self.assertNotIn(("user", str(self.user.id)), self.stats())
+        self.assertEqual(self.stats()[("keyword", "graphene")], 1)
+
+    def test_group_counter(self):
+        group = DataExtractionGroup.objects.create(group_name="Other")
+        self.assertEqual(self.stats()[("groups", "")], 2)
+        group.delete()
+        self.assertEqual(self.stats()[("groups", "")], 1)
+
+    def test_deltas_add_up_and_zero_rows_are_removed(self):
+        apply_stat_deltas(Counter({("keyword", "graphene"): 2}))
+        apply_stat_deltas(Counter({("keyword", "graphene"): 3, ("keyword", "optics"): 1}))
+        self.assertEqual(self.stats()[("keyword", "graphene")], 5)
+        apply_stat_deltas(Counter({("keyword", "graphene"): -5}))
+        self.assertNotIn(("keyword", "graphene"), self.stats())
+        self.assertEqual(self.stats()[("keyword", "optics")], 1)
+
+
+class ExtractionGroupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Users.objects.create(first_name="Ada")
+        cls.other = Users.objects.create(first_name="Grace")
+        cls.physics = DataExtractionGroup.objects.create(group_name="Physics", user=cls.user)
+        cls.biology = DataExtractionGroup.objects.create(group_name="Biology")
+        cls.both = DataExtraction.objects.create(
+            extraction_name="both", extraction_groups=f"{cls.physics.id}, {cls.biology.id}")
+        cls.biology_only = DataExtraction.objects.create(extraction_name="biology",
+                                                         extraction_groups=str(cls.biology.id))
+        cls.ungrouped = DataExtraction.objects.create(extraction_name="ungrouped")
+
+    def group_ids(self, extraction):
+        return set(extraction.groups.values_list("id", flat=True))
+
+    def test_saving_mirrors_the_groups_text(self):
+        self.assertEqual(self.group_ids(self.both), {self.physics.id, self.biology.id})
+        self.assertEqual(self.group_ids(self.ungrouped), set())
+
+        self.both.extraction_groups = f"{self.biology.id}, 999999, x"
+        self.both.save()
+        self.assertEqual(self.group_ids(self.both), {self.biology.id})
+
+    def test_sync_adds_and_removes_memberships(self):
+        self.ungrouped.extraction_groups = str(self.physics.id)
+        sync_extraction_groups(self.ungrouped)
+        sync_extraction_groups(self.ungrouped)
+        self.assertEqual(self.group_ids(self.ungrouped), {self.physics.id})
+
+        self.ungrouped.extraction_groups = ""
+        sync_extraction_groups(self.ungrouped)
+        self.assertEqual(self.group_ids(self.ungrouped), set())
+
+    def test_extractions_in_groups_are_listed_once(self):
+        extractions = DataExtraction.objects.filter(id__in=extraction_ids_in_groups([self.physics.id,
+                                                                                     self.biology.id]))
+        self.assertEqual(sorted(extractions.values_list("id", flat=True)), [self.both.id, self.biology_only.id])
+
+    def listed(self, user, **params):
+        session = self.client.session
+        session["user_id"] = user.id
+        session.save()
+        response = self.client.get(reverse("app:data_central_list_api"), params)
+        return {row["id"] for row in response.json()["data"]}
+
+    def test_list_defaults_to_the_users_groups(self):
+        self.assertEqual(self.listed(self.user), {self.both.id})
+        self.assertEqual(self.listed(self.user, group_id=self.biology.id), {self.both.id, self.biology_only.id})
+
+    def test_users_without_groups_see_every_extraction(self):
+        self.assertEqual(self.listed(self.other), {self.both.id, self.biology_only.id, self.ungrouped.id})
+
+
+class DataCentralListApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("beta", "alpha", "gamma", "beta two"):
+            DataExtraction.objects.create(extraction_name=name)
+
+    def page(self, **params):
+        return self.client.get(reverse("app:data_central_list_api"), {"draw": 3, **params}).json()
+
+    def test_pages_are_sorted_and_counted_in_the_database(self):
+        page = self.page(start=1, length=2, **{"order[0][column]": 2, "order[0][dir]": "asc"})
+        self.assertEqual((page["draw"], page["recordsTotal"], page["recordsFiltered"]), (3, 4, 4))
+        self.assertEqual([row["extraction_name"] for row in page["data"]], ["beta", "beta two"])
+        self.assertEqual([row["row_number"] for row in page["data"]], [2, 3])
+
+    def test_search_filters_the_records(self):
+        page = self.page(**{"search[value]": " BETA "})
+        self.assertEqual((page["recordsTotal"], page["recordsFiltered"]), (4, 2))
+        self.assertEqual([row["extraction_name"] for row in page["data"]], ["beta two", "beta"])
+
+    def test_page_length_is_capped(self):
+        self.assertEqual(len(self.page(length=1)["data"]), 1)
+        self.assertEqual(len(self.page(length=1000)["data"]), 4)
+        self.assertEqual(len(self.page(length="x", start="y")["data"]), 4)
+
+
+class DailyUploadRollupTests(TestCase):
+    def setUp(self):
+        self.user = Users.objects.create(first_name="Ada")
+
+    def rollups(self):
+        return {(row[0], row[1]): row[2:] for row in DailyUploadRollup.objects.values_list(
+            "upload_date", "user_id", "uploads", "total_records", "total_unique_records")}
+
+    def upload(self, user, total, unique):
+        return DataExtraction.objects.create(extraction_name="test", extracted_by=user, total_records=total,
+                                             total_unique_records=unique)
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        for user, total, unique in ((self.user, 10, 8), (self.user, 5, None), (None, 3, 3), (None, None, 1)):
+            self.upload(user, total, unique)
+        today = timezone.localdate()
+        incremental = self.rollups()
+        self.assertEqual(incremental, {(today, self.user.id): (2, 15, 8), (today, None): (2, 3, 4)})
+        rebuild_upload_rollups()
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_deleting_extractions_returns_the_rollups_to_zero(self):
+        first, second = self.upload(self.user, 10, 8), self.upload(None, 3, 3)
+        first.delete()
+        self.assertEqual(list(self.rollups()), [(timezone.localdate(), None)])
+        second.delete()
+        self.assertEqual(self.rollups(), {})
+
+    def test_deltas_add_up_and_empty_rows_are_removed(self):
+        day = timezone.localdate()
+        apply_upload_deltas({(day, None): (1, 10, 5)})
+        apply_upload_deltas({(day, None): (2, 4, 4), (day, self.user.id): (1, 1, 1)})
+        self.assertEqual(self.rollups(), {(day, None): (3, 14, 9), (day, self.user.id): (1, 1, 1)})
+        apply_upload_deltas({(day, None): (-3, -14, -9), (day, self.user.id): (0, 0, 0)})
+        self.assertEqual(self.rollups(), {(day, self.user.id): (1, 1, 1)})
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LookupTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = Users.objects.create(first_name="Ada")
+
+    def test_lookups_are_cached_until_invalidated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            group = DataExtractionGroup.objects.create(group_name="Physics", user=self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual([row["group_name"] for row in lookup("groups")], ["Physics"])
+        with self.assertNumQueries(0):
+            self.assertEqual(user_groups(self.user.id), [{"id": group.id, "group_name": "Physics",
+                                                          "user_id": self.user.id}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DataExtractionGroup.objects.create(group_name="biology")
+        self.assertEqual([row["group_name"] for row in lookup("groups")], ["biology", "Physics"])
+        self.assertEqual(user_groups(None), [])
+
+
+class KeywordListWorkbookTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        extraction = DataExtraction.objects.create(extraction_name="test")
+        for title, year, keywords, emails in [
+            ("Graphene optics", "2020", ["graphene", "optics"], ["x@uni.edu", "y@uni.edu"]),
+            ("Lenses", "2021", ["optics"], ["x@uni.edu"]),
+            ("Cells", "2020", ["biology"], ["z@lab.org"]),
+        ]:
+            article = DataExtractionArticle.objects.create(data_extraction=extraction, article_title=title,
+                                                           published_year=year)
+            for keyword in keywords:
+                DataExtractionKeyword.objects.create(article=article, keyword=keyword)
+            for email in emails:
+                DataExtractionAuthor.objects.create(article=article, author_name=email.split("@")[0],
+                                                    author_email=email)
+
+    def workbooks(self, keyword_lists, year=""):
+        return {file_name: {sheet: [tuple(row) for row in rows] for sheet, _, rows in sheets}
+                for file_name, sheets in keyword_list_workbooks(keyword_lists, year=year)}
+
+    def test_each_author_is_routed_to_every_matching_list_once(self):
+        workbooks = self.workbooks({"Materials": ["graphene", "optics"], "Light": [" Optics"], "Bio/Life": ["biology"],
+                                    "Materials ": ["unknown"]})
+        self.assertEqual(list(workbooks), ["Materials.xlsx", "Light.xlsx", "Bio_Life.xlsx", "Materials_4.xlsx"])
+        optics_rows = [("Graphene optics", "x", "x@uni.edu"), ("Graphene optics", "y", "y@uni.edu"),
+                       ("Lenses", "x", "x@uni.edu")]
+        for file_name in ("Materials.xlsx", "Light.xlsx"):
+            with self.subTest(file_name=file_name):
+                self.assertEqual(workbooks[file_name]["total_data"], optics_rows)
+                self.assertEqual(workbooks[file_name]["unique_data"], optics_rows[:2])
+        self.assertEqual(workbooks["Bio_Life.xlsx"]["unique_data"], [("Cells", "z", "z@lab.org")])
+        self.assertEqual(workbooks["Materials_4.xlsx"], {"total_data": [], "unique_data": []})
+
+    def test_year_filter(self):
+        workbooks = self.workbooks({"Light": ["optics"]}, year="2021")
+        self.assertEqual(workbooks["Light.xlsx"]["unique_data"], [("Lenses", "x", "x@uni.edu")])
+
+
+class NamesTests(SimpleTestCase):
+    def test_soundex(self):
+        self.assertEqual(soundex("robert"), "R163")
+        self.assertEqual(soundex("rupert"), "R163")
+        self.assertEqual(soundex("ashcraft"), "A261")
+        self.assertEqual(soundex("tymczak"), "T522")
+        self.assertEqual(soundex("pfister"), "P236")
+        self.assertEqual(soundex("mueller"), soundex("muller"))
+        self.assertEqual(soundex(""), "")
+
+    def test_name_tokens(self):
+        self.assertEqual(name_tokens("Müller-Lüdenscheidt, J."), ["muller", "ludenscheidt", "j"])
+        self.assertEqual(name_tokens("Smith AJ"), ["smith", "a", "j"])
+        self.assertEqual(name_tokens("WEI ZHANG"), ["wei", "zhang"])
+        self.assertEqual(name_tokens(None), [])
+
+    def test_blocking_keys_ignore_word_order_and_initials_format(self):
+        self.assertEqual(name_blocking_keys("Smith John"), ["J500", "J500S", "S530", "S530J"])
+        for query in ("J. Smith", "John Smith", "Jon Smyth"):
+            self.assertIn("S530J", query_blocking_keys(query))
+        self.assertIn("S530J", name_blocking_keys("Smith AJ"))
+        self.assertIn("M460J", name_blocking_keys("Müller Johann"))
+        self.assertEqual(query_blocking_keys("Mueller"), ["M460"])
+
+    def test_blocking_keys_are_bounded(self):
+        self.assertEqual(name_blocking_keys("Ana Maria de la Cruz Santos"),
+                         name_blocking_keys("Ana Maria de la"))
+
+    def test_matches_initials_and_typos(self):
+        for query, candidate in [
+            ("Mueller J", "Müller Johann"),
+            ("J. Smith", "John Smith"),
+            ("J. Smith", "Jon Smyth"),
+            ("John Smith", "Jon Smyth"),
+            ("Jon Smyth", "Smith John"),
+            ("J Smith", "Smith AJ"),
+            ("Johann Muller", "Müller J"),
+            ("Zhang W", "Zhang Wei"),
+            ("Katherine Jones", "Catherine Jones"),
+            ("Mueller", "Mueller Hans"),
+        ]:
+            with self.subTest(query=query, candidate=candidate):
+                self.assertGreaterEqual(similarity(query, candidate), FUZZY_NAME_MIN_SCORE)
+
+    def test_rejects_other_people_with_the_surname(self):
+        for query, candidate in [
+            ("John Smith", "Jane Smith"),
+            ("John Smith", "Schmidt John"),
+            ("J Smith", "K Smith"),
+            ("Mueller J", "Mueller Hans"),
+            ("Smith", "Schmidt John"),
+        ]:
+            with self.subTest(query=query, candidate=candidate):
+                self.assertLess(similarity(query, candidate), FUZZY_NAME_MIN_SCORE)
+
+
+class FuzzyAuthorSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        extraction = DataExtraction.objects.create(extraction_name="test")
+        article = DataExtractionArticle.objects.create(data_extraction=extraction, article_title="Article")
+        for name in ("Müller Johann", "Smith AJ", "Jon Smyth", "Jane Smith", "Schmidt John", None):
+            DataExtractionAuthor.objects.create(article=article, author_name=name)
+
+    def test_name_blocks_are_set_on_save(self):
+        author = DataExtractionAuthor.objects.get(author_name="Müller Johann")
+        self.assertEqual(author.name_blocks, ["J500", "J500M", "M460", "M460J"])
+
+    def test_finds_initials_and_typos(self):
+        rows = list(fuzzy_author_rows(["John Smith", "mueller j"], ["author_name"]))
+        self.assertEqual(sorted((name, query) for name, query, _ in rows), [
+            ("Jon Smyth", "John Smith"),
+            ("Müller Johann", "mueller j"),
+            ("Smith AJ", "John Smith"),
+        ])
+
+
+class BulkDownloadTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def extraction(self, name, path, content=None):
+        full_path = os.path.join(self.directory, path)
+        if content is not None:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "wb") as file:
+                file.write(content)
+        return DataExtraction.objects.create(extraction_name=name, output_excel_path=full_path)
+
+    def test_streams_the_selected_files_with_a_manifest(self):
+        workbook = os.urandom(3 * STREAM_FLUSH_BYTES)
+        first = self.extraction("first", "a/report.xlsx", workbook)
+        second = self.extraction("second", "b/report.xlsx", b"second workbook")
+        notes = self.extraction("notes", "b/notes.csv", b"name,email\n" * 1000)
+        missing = self.extraction("missing", "c/gone.xlsx")
+
+        response = self.client.post(reverse("app:bulk_download_zip"), {
+            "selected_ids": f"{first.id},{second.id},{notes.id},{missing.id},x"})
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 3)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), ["report.xlsx", f"report_{second.id}.xlsx", "notes.csv",
+                                                  "MANIFEST.txt"])
+            self.assertEqual(archive.read("report.xlsx"), workbook)
+            self.assertEqual(archive.read(f"report_{second.id}.xlsx"), b"second workbook")
+            self.assertEqual(archive.getinfo("report.xlsx").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo("notes.csv").compress_type, zipfile.ZIP_DEFLATED)
+            manifest = archive.read("MANIFEST.txt").decode("utf-8").splitlines()
+
+        self.assertEqual(manifest[0], "Included files (3):")
+        self.assertIn(f"{second.id}\tsecond\treport_{second.id}.xlsx", manifest)
+        self.assertIn("Missing files (1):", manifest)
+        self.assertTrue(manifest[-1].startswith(f"{missing.id}\tmissing\t"))
+
+    def test_requires_a_selection(self):
+        self.assertEqual(self.client.post(reverse("app:bulk_download_zip"), {"selected_ids": ""}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("app:bulk_download_zip")).status_code, 405)
+
+
+class DataExtractionBackupTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = Path(tmp.name) / "data_extraction"
+        self.backups_dir = Path(tmp.name) / "backups"
+        self.restore_dir = Path(tmp.name) / "restore"
+        self.write("a.txt", "first")
+        self.write("nested/b.csv", "x,y\n1,2\n")
+        self.write("nested/c.pdf", "%PDF")
+        self.write("exports/skipped.xlsx", "export")
+        # Archive names carry the time to the second
+        patcher = mock.patch("app.backups.datetime")
+        self.addCleanup(patcher.stop)
+        patcher.start().now.side_effect = [datetime(2025, 1, 1, 0, 0, second) for second in range(10)]
+
+    def write(self, path, content, mtime=None):
+        full_path = self.folder / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+        if mtime is not None:
+            os.utime(full_path, (mtime, mtime))
+
+    def backup(self, full=False):
+        zip_path, zip_name, kind, base, manifest, files_archived = create_archive(
+            str(self.folder), str(self.backups_dir), full=full)
+        return BackupDataExtractionLog.objects.create(
+            status="SUCCESS", kind=kind, base=base, archive_name=zip_name, manifest=manifest,
+            files_archived=files_archived)
+
+    def restore(self, backup):
+        restored = restore_tree(backup.manifest, str(self.backups_dir), str(self.restore_dir))
+        return restored, {str(path.relative_to(self.restore_dir)).replace(os.sep, "/"): path.read_text()
+                          for path in self.restore_dir.rglob("*") if path.is_file()}
+
+    def test_incremental_chain_round_trip(self):
+        full = self.backup()
+        self.assertEqual((full.kind, full.files_archived), ("FULL", 3))
+        self.assertNotIn("exports/skipped.xlsx", full.manifest)
+
+        unchanged = self.backup()
+        self.assertEqual((unchanged.kind, unchanged.archive_name, unchanged.files_archived), ("INCREMENTAL", "", 0))
+
+        self.write("a.txt", "second version")
+        self.write("nested/c.pdf", "%PDF", mtime=1)  # touched, same content
+        self.write("new/d.txt", "new")
+        os.remove(self.folder / "nested" / "b.csv")
+        incremental = self.backup()
+        self.assertEqual((incremental.kind, incremental.base, incremental.files_archived),
+                         ("INCREMENTAL", unchanged, 2))
+        self.assertEqual(incremental.manifest["nested/c.pdf"][3], full.archive_name)
+        self.assertEqual(incremental.manifest["a.txt"][3], incremental.archive_name)
+
+        restored, files = self.restore(incremental)
+        self.assertEqual(restored, 3)
+        self.assertEqual(files, {"a.txt": "second version", "nested/c.pdf": "%PDF", "new/d.txt": "new"})
+
+    def test_restore_checks_the_archived_content(self):
+        full = self.backup()
+        full.manifest["a.txt"][2] = "0" * 64
+        with self.assertRaisesMessage(ValueError, "Checksum mismatch for a.txt"):
+            self.restore(full)
+
+    def test_restore_needs_every_archive_of_the_chain(self):
+        full = self.backup()
+        self.write("a.txt", "second version")
+        incremental = self.backup()
+        os.remove(self.backups_dir / full.archive_name)
+        with self.assertRaisesMessage(FileNotFoundError, full.archive_name):
+            self.restore(incremental)
+
+    def test_full_backup_when_asked(self):
+        self.backup()
+        full = self.backup(full=True)
+        self.assertEqual((full.kind, full.base, full.files_archived), ("FULL", None, 3))
+
+
+class DatabaseBackupTests(SimpleTestCase):
+    database = {"NAME": "scitech", "USER": "scitech", "PASSWORD": "secret", "HOST": "db", "PORT": "5433"}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def fake_pg_dump(self, command, **kwargs):
+        # Writes what pg_dump -Fd would: a directory of table files
+        output = Path(command[command.index("-f") + 1])
+        output.mkdir()
+        (output / "toc.dat").write_bytes(b"toc")
+        (output / "3001.dat.gz").write_bytes(b"data")
+
+    def test_directory_dump_is_tarred(self):
+        options = {"PG_DUMP": "/usr/bin/pg_dump", "FORMAT": "directory", "JOBS": 4, "COMPRESS": 6}
+        with mock.patch("app.backups.subprocess.run", side_effect=self.fake_pg_dump) as run:
+            path = dump_database(self.database, str(self.tmp / "dumps"), "backup_1", options)
+
+        command, kwargs = run.call_args.args[0], run.call_args.kwargs
+        self.assertEqual(command, ["/usr/bin/pg_dump", "-h", "db", "-p", "5433", "-U", "scitech", "-Fd",
+                                   "-f", str(self.tmp / "dumps" / "backup_1"), "-j", "4", "-Z", "6", "scitech"])
+        self.assertTrue(kwargs["check"])
+        self.assertEqual(kwargs["env"]["PGPASSWORD"], "secret")
+
+        self.assertEqual(path, str(self.tmp / "dumps" / "backup_1.tar"))
+        self.assertFalse((self.tmp / "dumps" / "backup_1").exists())
+        with tarfile.open(path) as archive:
+            self.assertEqual(sorted(archive.getnames()),
+                             ["backup_1", "backup_1/3001.dat.gz", "backup_1/toc.dat"])
+
+    def test_plain_dump(self):
+        with mock.patch("app.backups.subprocess.run") as run:
+            path = dump_database(self.database, str(self.tmp), "backup_1", {"FORMAT": "plain", "JOBS": 4})
+        command = run.call_args.args[0]
+        self.assertEqual(path, str(self.tmp / "backup_1.sql"))
+        self.assertIn("-Fp", command)
+        self.assertNotIn("-j", command)
+        self.assertNotIn("-Z", command)
+
+    def test_failed_dump_raises(self):
+        error = subprocess.CalledProcessError(1, "pg_dump", stderr="connection refused")
+        with mock.patch("app.backups.subprocess.run", side_effect=error):
+            with self.assertRaises(subprocess.CalledProcessError):
+                dump_database(self.database, str(self.tmp), "backup_1", {"FORMAT": "custom"})
+
+    def test_local_storage_copies_the_file(self):
+        source = self.tmp / "backup_1.tar"
+        source.write_bytes(b"dump")
+        link = LocalStorage(self.tmp / "uploads").save(str(source))
+        copy = self.tmp / "uploads" / "backup_1.tar"
+        self.assertEqual(link, copy.resolve().as_uri())
+        self.assertEqual(copy.read_bytes(), b"dump")
@@ -26,13 +26,20 @@ urlpatterns = [
     path('configuration/user/delete', views.delete_user, name='delete_user'),
 
     path('data/central/list', views.data_central_list, name='data_central_list'),
+    path('api/data-central/', views.data_central_list_api, name='data_central_list_api'),
     path('data-central/bulk-download/', views.bulk_download_zip, name='bulk_download_zip'),
     path('search/by/keyword', views.search_by_keywords, name='search_by_keywords'),
     path('search-by-keyword-year', views.search_by_keywords_and_year, name='search_by_keywords_and_year'),
+    path('search-by-keyword-lists', views.search_by_keyword_lists, name='search_by_keyword_lists'),
     path('search-by-author', views.search_by_author_name, name='search_by_author_name'),
     path('search-by-affiliation', views.search_by_affiliation, name='search_by_affiliation'),
     path('top-authors/', views.top_authors_report, name='top_authors_report'),
     path('missing-emails/', views.missing_email_authors, name='missing_email_authors'),
+    path('api/search/', views.fulltext_search_api, name='fulltext_search_api'),
+    path('api/authors/', views.AuthorSearchAPI.as_view(), name='author_search_api'),
+    path('api/report-count/<str:report>/', views.report_count_api, name='report_count_api'),
+    path('exports/', views.export_job_list, name='export_job_list'),
+    path('exports/<int:job_id>/download/', views.export_job_download, name='export_job_download'),
 
     path('user/uploads/', views.user_uploads_by_date, name='user_uploads_by_date'),
     path('user/uploads/export/', views.export_user_uploads_excel, name='export_user_uploads_excel'),
@@ -59,6 +66,7 @@ urlpatterns = [
     path('journals/science-direct', views.journals_science_direct, name='journals_science_direct'),
     path('articles/science-direct', views.articles_science_direct, name='articles_science_direct'),
     path('authors/science-direct', views.authors_science_direct, name='authors_science_direct'),
+    path('api/science-direct/<str:listing>/', views.science_direct_list_api, name='science_direct_list_api'),
     path('get/data/science-direct', views.get_data_science_direct, name='get_data_science_direct'),
 
     path('scrap/science-direct', views.scrap_science_direct, name='scrap_science_direct'),
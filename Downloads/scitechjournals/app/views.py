@@ -6,6 +6,7 @@ import logging
 import pandas as pd
 import io
 from datetime import datetime
+from urllib.parse import urlencode
 
 from io import BytesIO, StringIO
 
@@ -19,29 +20,46 @@ from django.contrib.auth.hashers import make_password
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.db import transaction
-from django.db.models import Q, TextField, Count, F
+from django.db.models import Q, TextField, F
 from django.db.models.expressions import RawSQL
-from django.db.models.functions import Length, Cast, TruncDate, Lower, Trim
-from django.http import JsonResponse, HttpResponse
+from django.db.models.functions import Length, Cast
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.dateparse import parse_date
 from django.views.decorators.csrf import csrf_exempt
-from django.utils import timezone
-from django.core.paginator import Paginator
+from django.utils import formats, timezone
 from rest_framework.decorators import api_view
 
 from collections import Counter
 
 from rest_framework.views import APIView
+from rest_framework.generics import ListAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import UserSerializer
+from .serializers import ExtractedAuthorSerializer, UserSerializer
 from django.conf import settings
 
-from app.models import Users, Journal, Article, Author, UploadLog, DataExtractionArticle, DataExtractionAuthor, \
-    DataExtractionGroup, DataExtraction, BackupLog, BackupDataExtractionLog
-
-from .tasks import scrape_science_direct_task
+from app.models import Users, UploadLog, DataExtractionArticle, DataExtractionAuthor, \
+    DataExtractionGroup, DataExtraction, BackupLog, BackupDataExtractionLog, DataExtractionKeyword, ExportJob, \
+    DailyUploadRollup
+from .search import normalize_keywords, update_data_extraction_search_vectors, fulltext_search, FULLTEXT_SCOPES, \
+    search_extracted_authors
+from .exports import EXPORT_CHUNK_SIZE, iter_file, iter_xlsx, streaming_xlsx_response, streaming_csv_response, \
+    streaming_zip_response
+from .aggregates import refresh_author_aggregates_for_extraction
+from .cache import bump_data_version
+from .lookups import lookup, user_groups
+from .counts import report_count, report_params
+from .pagination import AuthorSearchCursorPagination, keyset_page
+from .dates import format_year_range, parse_year_range
+from .groups import extraction_ids_in_groups
+from .stats import apply_stat_deltas, dashboard_stats, extraction_data_counts, user_upload_counts
+from .listings import SCIENCE_DIRECT_LISTS, SCIENCE_DIRECT_PAGE_SIZE, science_direct_list_queryset
+from .reports import EXPORT_REPORTS, COUNT_REPORTS, cached_report_sheets, top_authors_queryset, missing_email_queryset, \
+    keyword_list_workbooks
+
+from .tasks import scrape_science_direct_task, run_export_job
 from celery.result import AsyncResult
 from bs4 import BeautifulSoup
 from lxml import etree
@@ -172,6 +190,45 @@ class CreateOrUpdateUser(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AuthorSearchAPI(ListAPIView):
+    """
+    Extracted authors matching the search filters, as cursor-paginated JSON pages
+    (follow `next` until it is null):
+
+    ?keyword=..&keyword=..  any of the article keywords
+    ?year=2021 | 2019-2023  article publication year or range
+    ?author_name=..  ?affiliation=..  ?country=..  any of the substrings (repeatable)
+    ?domain=uni.edu  author email domain
+    ?fields=author_name,author_email,article_title  columns to return
+    ?page_size=  rows per page (max 1000)
+    """
+    serializer_class = ExtractedAuthorSerializer
+    pagination_class = AuthorSearchCursorPagination
+    renderer_classes = [JSONRenderer]
+
+    def selected_fields(self):
+        return ExtractedAuthorSerializer.selected_fields(self.request.query_params.get('fields'))
+
+    def get_queryset(self):
+        params = self.request.query_params
+        authors = search_extracted_authors(
+            keywords=normalize_keywords(params.getlist('keyword')),
+            year=(params.get('year') or '').strip(),
+            author_names=[term.strip() for term in params.getlist('author_name') if term.strip()],
+            affiliations=[term.strip() for term in params.getlist('affiliation') if term.strip()],
+            countries=[term.strip() for term in params.getlist('country') if term.strip()],
+            domain=(params.get('domain') or '').strip(),
+        )
+        # Only the selected columns, joining the article only when one of its columns is selected
+        columns = ExtractedAuthorSerializer.query_columns(self.selected_fields())
+        if any(column.startswith('article__') for column in columns):
+            authors = authors.select_related('article')
+        return authors.only('id', *columns)
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, fields=self.selected_fields(), **kwargs)
+
+
 def app_login(request):
     if request.method == "POST":
         username = request.POST.get('username')
@@ -212,66 +269,44 @@ def logout_user(request):
 
 
 def dashboard(request):
+    # Every figure is read from the incrementally maintained DashboardStat counters
+    stats = dashboard_stats()
+
     # Summary Metrics
-    total_groups = DataExtractionGroup.objects.count()
-    pubmed_new = DataExtraction.objects.filter(extraction_type=0).count()
-    pubmed_central = DataExtraction.objects.filter(extraction_type=1).count()
-    europe_pmc = DataExtraction.objects.filter(extraction_type=2).count()
+    total_groups = stats['groups'].get('', 0)
+    pubmed_new = stats['extraction_type'].get('0', 0)
+    pubmed_central = stats['extraction_type'].get('1', 0)
+    europe_pmc = stats['extraction_type'].get('2', 0)
 
     # User-wise upload chart data
-    user_uploads = (
-        DataExtraction.objects.values('extracted_by__first_name')
-        .annotate(count=Count('id'))
-        .order_by('-count')
-    )
-    user_labels = [u['extracted_by__first_name'] or 'Unknown' for u in user_uploads]
-    user_counts = [u['count'] for u in user_uploads]
+    user_labels, user_counts = user_upload_counts(stats)
 
     # Top Keywords
-    # keyword_counter = Counter()
-    # keyword_qs = DataExtractionArticle.objects.exclude(article_keywords__isnull=True)
-    #
-    # for article in keyword_qs:
-    #     keywords = article.article_keywords or []
-    #     if isinstance(keywords, list):
-    #         keyword_counter.update([kw.lower().strip() for kw in keywords if kw])
-    #
-    # top_keywords = keyword_counter.most_common(10)
-    # keyword_labels = [k[0] for k in top_keywords]
-    # keyword_counts = [k[1] for k in top_keywords]
-    #
-    # # Articles per Year
-    # articles_by_year = (
-    #     DataExtractionArticle.objects.values('published_year')
-    #     .annotate(count=Count('id'))
-    #     .order_by('published_year')
-    # )
-    # year_labels = [a['published_year'] for a in articles_by_year if a['published_year']]
-    # year_counts = [a['count'] for a in articles_by_year if a['published_year']]
-    #
-    # # Top Domains
-    # domain_counter = Counter()
-    # for author in DataExtractionAuthor.objects.exclude(author_email__isnull=True).exclude(author_email__exact=""):
-    #     try:
-    #         domain = author.author_email.split('@')[1].strip().lower()
-    #         domain_counter[domain] += 1
-    #     except IndexError:
-    #         continue
-    # top_domains = domain_counter.most_common(10)
-    # domain_labels = [d[0] for d in top_domains]
-    # domain_counts = [d[1] for d in top_domains]
+    top_keywords = sorted(stats['keyword'].items(), key=lambda k: (-k[1], k[0]))
+    keyword_labels = [k[0] for k in top_keywords]
+    keyword_counts = [k[1] for k in top_keywords]
+
+    # Articles per Year
+    articles_by_year = sorted(stats['year'].items())
+    year_labels = [a[0] for a in articles_by_year]
+    year_counts = [a[1] for a in articles_by_year]
+
+    # Top Domains
+    top_domains = sorted(stats['domain'].items(), key=lambda d: (-d[1], d[0]))
+    domain_labels = [d[0] for d in top_domains]
+    domain_counts = [d[1] for d in top_domains]
 
     return render(request, 'dashboard.html', {
         "total_groups": total_groups,
         "pubmed_new": pubmed_new,
         "pubmed_central": pubmed_central,
         "europe_pmc": europe_pmc,
-        # "year_labels": year_labels,
-        # "year_counts": year_counts,
-        # "domain_labels": domain_labels,
-        # "domain_counts": domain_counts,
-        # "keyword_labels": keyword_labels,
-        # "keyword_counts": keyword_counts,
+        "year_labels": year_labels,
+        "year_counts": year_counts,
+        "domain_labels": domain_labels,
+        "domain_counts": domain_counts,
+        "keyword_labels": keyword_labels,
+        "keyword_counts": keyword_counts,
         "user_labels": user_labels ,
         "user_counts": user_counts
     })
@@ -392,23 +427,35 @@ def delete_user(request):
     return JsonResponse({"success": False, "error": "Invalid request."})
 
 
-def data_central_list(request):
-    extraction_type = settings.EXTRACTION_TYPE
-    all_users = Users.objects.all()
-    all_groups = DataExtractionGroup.objects.all()
+# DataTables column index -> order_by field of the Data Central table (other columns aren't sortable)
+DATA_CENTRAL_ORDER_COLUMNS = {
+    1: "id",
+    2: "extraction_name",
+    3: "extraction_type",
+    5: "total_records",
+    6: "total_unique_records",
+    7: "extracted_by__first_name",
+    8: "created_at",
+}
+
+def data_central_lookups():
+    return {
+        "all_users": lookup("users"),
+        "all_groups": lookup("groups"),
+    }
 
+def data_central_queryset(request):
+    """DataExtraction rows visible in the Data Central list for the filters in request.GET."""
     user_id = request.session.get("user_id")
     default_user = Users.objects.filter(id=user_id).first()
 
-    queryset = DataExtraction.objects.select_related('extracted_by')
+    queryset = DataExtraction.objects.all()
 
-    # 🔽 Filter only user's assigned groups initially
-    if default_user and request.GET.get("group_id") is None:
-        user_group_ids = DataExtractionGroup.objects.filter(user=default_user).values_list('id', flat=True)
-        conditions = Q()
-        for group_id in user_group_ids:
-            conditions |= Q(extraction_groups=group_id)
-        queryset = queryset.filter(conditions)
+    # 🔽 Filter only user's assigned groups initially (indexed membership join); users
+    # without groups see every extraction
+    default_group_ids = [group["id"] for group in user_groups(default_user.id)] if default_user else []
+    if default_group_ids and request.GET.get("group_id") is None:
+        queryset = queryset.filter(id__in=extraction_ids_in_groups(default_group_ids))
 
     # 🧠 Filters from query params
     keyword = request.GET.get('keyword')
@@ -424,439 +471,395 @@ def data_central_list(request):
         queryset = queryset.filter(extraction_type=ext_type)
     if filter_user_id:
         queryset = queryset.filter(extracted_by__id=filter_user_id)
-    if group_id:
-        group_id_val = DataExtractionGroup.objects.filter(id=group_id).values_list('id', flat=True).first()
-        if group_id_val:
-            queryset = queryset.filter(extraction_groups=group_id_val)
+    if group_id and group_id.isdigit():
+        queryset = queryset.filter(id__in=extraction_ids_in_groups([int(group_id)]))
     if start_date:
         queryset = queryset.filter(created_at__date__gte=parse_date(start_date))
     if end_date:
         queryset = queryset.filter(created_at__date__lte=parse_date(end_date))
+    return queryset
 
-    data_central_list_info = queryset.order_by('-id')
-
-    group_id_name_map = {
-        str(group.id): group.group_name
-        for group in DataExtractionGroup.objects.all()
-    }
-
+def data_central_list(request):
+    # The table itself is loaded page by page from data_central_list_api
     return render(request, 'tools/data_central/list.html', {
-        "data_central_list_info": data_central_list_info,
-        "extraction_type": extraction_type,
-        "all_users": all_users,
-        "all_groups": all_groups,
-        "group_id_name_map": group_id_name_map,
+        "extraction_type": settings.EXTRACTION_TYPE,
+        **data_central_lookups(),
     })
 
-def search_by_keywords(request):
-    if request.method == "POST":
-        keyword_input = request.POST.get("keywords", "")
-        uploaded_file = request.FILES.get("excel_file")
+def data_central_list_api(request):
+    """
+    DataTables server-side endpoint of the Data Central list: the page filters in the
+    query string plus draw, start, length, search[value] and order[0][column|dir].
+    """
+    def int_param(name, default):
+        value = request.GET.get(name, "")
+        return int(value) if value.isdigit() else default
+
+    draw = int_param("draw", 0)
+    start = int_param("start", 0)
+    length = min(max(int_param("length", 25), 1), 100)
+    search = (request.GET.get("search[value]") or "").strip()
+
+    queryset = data_central_queryset(request)
+    records_total = queryset.count()
+    if search:
+        queryset = queryset.filter(extraction_name__icontains=search)
+        records_filtered = queryset.count()
+    else:
+        records_filtered = records_total
+
+    order_field = DATA_CENTRAL_ORDER_COLUMNS.get(int_param("order[0][column]", 1), "id")
+    descending = request.GET.get("order[0][dir]", "desc") != "asc"
+    ordering = [f"-{order_field}" if descending else order_field]
+    if order_field != "id":
+        ordering.append("-id")
+
+    page = (queryset
+            .select_related("extracted_by")
+            .prefetch_related("groups")
+            .only("id", "extraction_name", "extraction_type", "total_records", "total_unique_records",
+                  "output_excel_path", "created_at", "extracted_by__first_name")
+            .order_by(*ordering)[start:start + length])
+
+    rows = []
+    for index, extraction in enumerate(page, start=start + 1):
+        rows.append({
+            "id": extraction.id,
+            "row_number": index,
+            "extraction_name": extraction.extraction_name,
+            "data_source": settings.EXTRACTION_TYPE.get(extraction.extraction_type, ""),
+            "groups": ", ".join(group.group_name for group in extraction.groups.all()),
+            "total_records": extraction.total_records,
+            "total_unique_records": extraction.total_unique_records,
+            "user": extraction.extracted_by.first_name if extraction.extracted_by else "",
+            "created_at": formats.date_format(timezone.localtime(extraction.created_at), "DATETIME_FORMAT"),
+            "file_url": (extraction.output_excel_path.replace("app/data_extraction", "/media")
+                         if extraction.output_excel_path else ""),
+        })
 
-        keywords = set()
-        if keyword_input:
-            keywords |= set([k.strip().lower() for k in keyword_input.split(",") if k.strip()])
+    return JsonResponse({
+        "draw": draw,
+        "recordsTotal": records_total,
+        "recordsFiltered": records_filtered,
+        "data": rows,
+    })
 
-        if uploaded_file:
-            df = pd.read_excel(uploaded_file, usecols=[0])
-            for val in df.iloc[:, 0]:
-                if isinstance(val, str):
-                    keywords |= set([k.strip().lower() for k in val.split(",") if k.strip()])
-
-        # Collect matching articles and authors
-        all_data = []
-        for article in DataExtractionArticle.objects.prefetch_related('data_extraction_authors').all():
-            match = False
-            if article.article_keywords:
-                match = any(k in [kw.lower() for kw in article.article_keywords] for k in keywords)
-
-            if match:
-                for author in article.data_extraction_authors.all():
-                    all_data.append({
-                        "article": article.article_title,
-                        "author_name": author.author_name,
-                        "author_email": author.author_email or "",
-                    })
+def collect_search_terms(text_input, uploaded_file):
+    """
+    Collects the lowercased search terms from a comma-separated text input and from the
+    first column of an optional uploaded Excel file.
+    """
+    terms = set()
+    if text_input:
+        terms |= set([t.strip().lower() for t in text_input.split(",") if t.strip()])
 
-        df_all = pd.DataFrame(all_data)
-        df_unique = df_all.drop_duplicates(subset=["author_email"])
+    if uploaded_file:
+        df = pd.read_excel(uploaded_file, usecols=[0])
+        for val in df.iloc[:, 0]:
+            if isinstance(val, str):
+                terms |= set([t.strip().lower() for t in val.split(",") if t.strip()])
 
-        # Write to Excel
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_all.to_excel(writer, sheet_name="total_data", index=False)
-            df_unique.to_excel(writer, sheet_name="unique_data", index=False)
-        output.seek(0)
+    return terms
 
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename=search_results.xlsx'
-        return response
+def collect_keyword_lists(uploaded_file):
+    """
+    Named keyword lists of a batch search workbook: every column of every sheet, named
+    after its header, or after the sheet when the sheet has a single column.
+    """
+    keyword_lists = {}
+    for sheet_name, df in pd.read_excel(uploaded_file, sheet_name=None).items():
+        for column in df.columns:
+            name = str(sheet_name if len(df.columns) == 1 else column).strip()
+            terms = keyword_lists.setdefault(name, set())
+            for val in df[column]:
+                if isinstance(val, str):
+                    terms |= set([t.strip().lower() for t in val.split(",") if t.strip()])
+    return {name: sorted(terms) for name, terms in keyword_lists.items() if terms}
 
-    return render(request, 'tools/data_central/search_by.html')
+def requested_year(values):
+    """
+    Year filter of a Data Central view: 'year' as given (a year or a '2019-2023' range,
+    as used in filter links), or the range picked in the 'year_from' / 'year_to' selects.
+    """
+    year = (values.get("year") or "").strip()
+    if not year:
+        year = format_year_range((values.get("year_from") or "").strip(), (values.get("year_to") or "").strip())
+    return year
+
+def year_filter_context(year):
+    """Years facet (cached lookup) and the selected range for the year selects."""
+    year_from, year_to = parse_year_range(year) or (None, None)
+    return {
+        "years": lookup("publication_years"),
+        "selected_year": year,
+        "year_from": year_from,
+        "year_to": year_to,
+    }
 
-def search_by_keywords_and_year(request):
-    years = DataExtractionArticle.objects.values_list('published_year', flat=True).distinct().order_by('-published_year')
-    years = [y for y in years if y]  # filter non-empty
+def queue_export_job(request, export_type, file_format, file_name, params):
+    """
+    Queues a large export to be written to disk by Celery instead of streamed in the request.
+    """
+    job = ExportJob.objects.create(
+        export_type=export_type,
+        file_format=file_format,
+        file_name=file_name,
+        params=params,
+        requested_by_id=request.session.get("user_id"),
+    )
+    run_export_job.delay(job.id)
+    messages.success(request, f"Export '{file_name}' queued. It will be listed here for download once ready.")
+    return redirect('app:export_job_list')
 
+def search_by_keywords(request):
     if request.method == "POST":
-        keyword_input = request.POST.get("keywords", "")
-        uploaded_file = request.FILES.get("excel_file")
-        selected_year = request.POST.get("year")
+        keywords = collect_search_terms(request.POST.get("keywords", ""), request.FILES.get("excel_file"))
 
-        keywords = set()
-        if keyword_input:
-            keywords |= set([k.strip().lower() for k in keyword_input.split(",") if k.strip()])
+        params = {"keywords": sorted(keywords)}
+        if request.POST.get("background"):
+            return queue_export_job(request, "search_by_keywords", "excel", "search_results.xlsx", params)
 
-        if uploaded_file:
-            df = pd.read_excel(uploaded_file, usecols=[0])
-            for val in df.iloc[:, 0]:
-                if isinstance(val, str):
-                    keywords |= set([k.strip().lower() for k in val.split(",") if k.strip()])
+        # Matching articles and authors (indexed keyword join), streamed to Excel
+        return streaming_xlsx_response("search_results.xlsx", cached_report_sheets("search_by_keywords", params))
 
-        # Collect matching records based on keyword and year
-        all_data = []
-        for article in DataExtractionArticle.objects.filter(published_year=selected_year).prefetch_related('data_extraction_authors'):
-            if not article.article_keywords:
-                continue
-            if any(k in [kw.lower() for kw in article.article_keywords] for k in keywords):
-                for author in article.data_extraction_authors.all():
-                    all_data.append({
-                        "article": article.article_title,
-                        "author_name": author.author_name,
-                        "author_email": author.author_email or "",
-                    })
+    return render(request, 'tools/data_central/search_by.html')
 
-        df_all = pd.DataFrame(all_data)
-        df_unique = df_all.drop_duplicates(subset=["author_email"])
+def search_by_keywords_and_year(request):
+    if request.method == "POST":
+        keywords = collect_search_terms(request.POST.get("keywords", ""), request.FILES.get("excel_file"))
+        selected_year = requested_year(request.POST)
 
-        # Write to Excel
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_all.to_excel(writer, sheet_name="total_data", index=False)
-            df_unique.to_excel(writer, sheet_name="unique_data", index=False)
-        output.seek(0)
+        params = {"keywords": sorted(keywords), "year": selected_year}
+        if request.POST.get("background"):
+            return queue_export_job(request, "search_by_keywords", "excel", "search_by_year_results.xlsx", params)
 
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename=search_by_year_results.xlsx'
-        return response
+        # Matching records based on keyword and year (indexed keyword join), streamed to Excel
+        return streaming_xlsx_response("search_by_year_results.xlsx", cached_report_sheets("search_by_keywords", params))
 
-    return render(request, 'tools/data_central/search_by_year.html', {"years": years})
+    return render(request, 'tools/data_central/search_by_year.html', year_filter_context(""))
 
-def search_by_author_name(request):
+def search_by_keyword_lists(request):
     if request.method == "POST":
-        names_input = request.POST.get("author_names", "")
         uploaded_file = request.FILES.get("excel_file")
+        keyword_lists = collect_keyword_lists(uploaded_file) if uploaded_file else {}
+        if not keyword_lists:
+            messages.error(request, "Upload a workbook with at least one keyword list.")
+            return redirect("app:search_by_keyword_lists")
 
-        names = set()
-        if names_input:
-            names |= set([n.strip().lower() for n in names_input.split(",") if n.strip()])
+        # Every list is answered by one indexed query; one workbook per list in a zip
+        workbooks = keyword_list_workbooks(keyword_lists, year=requested_year(request.POST))
+        return streaming_zip_response("keyword_list_results.zip",
+                                      [(file_name, iter_xlsx(sheets)) for file_name, sheets in workbooks],
+                                      compression=zipfile.ZIP_STORED)
 
-        if uploaded_file:
-            df = pd.read_excel(uploaded_file, usecols=[0])
-            for val in df.iloc[:, 0]:
-                if isinstance(val, str):
-                    names |= set([n.strip().lower() for n in val.split(",") if n.strip()])
-
-        matched_data = []
-        for author in DataExtractionAuthor.objects.select_related('article').all():
-            if author.author_name and any(n in author.author_name.lower() for n in names):
-                matched_data.append({
-                    "article": author.article.article_title if author.article else "",
-                    "author_name": author.author_name,
-                    "author_email": author.author_email or "",
-                })
+    return render(request, 'tools/data_central/search_by_keyword_lists.html', year_filter_context(""))
 
-        df_all = pd.DataFrame(matched_data)
-        df_unique = df_all.drop_duplicates(subset=["author_email"])
+def search_by_author_name(request):
+    if request.method == "POST":
+        names = collect_search_terms(request.POST.get("author_names", ""), request.FILES.get("excel_file"))
 
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_all.to_excel(writer, sheet_name="total_data", index=False)
-            df_unique.to_excel(writer, sheet_name="unique_data", index=False)
-        output.seek(0)
+        # Trigram-indexed substring match on the author name, or fuzzy match within the
+        # indexed name blocks, streamed to Excel
+        export_type = "search_by_author_name_fuzzy" if request.POST.get("fuzzy") else "search_by_author_name"
+        params = {"terms": sorted(names)}
+        if request.POST.get("background"):
+            return queue_export_job(request, export_type, "excel", "search_by_author_name.xlsx", params)
 
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename=search_by_author_name.xlsx'
-        return response
+        return streaming_xlsx_response("search_by_author_name.xlsx", cached_report_sheets(export_type, params))
 
     return render(request, 'tools/data_central/search_by_author_name.html')
 
 def search_by_affiliation(request):
     if request.method == "POST":
-        input_text = request.POST.get("affiliations", "")
-        uploaded_file = request.FILES.get("excel_file")
-
-        affiliations = set()
-        if input_text:
-            affiliations |= set([a.strip().lower() for a in input_text.split(",") if a.strip()])
+        affiliations = collect_search_terms(request.POST.get("affiliations", ""), request.FILES.get("excel_file"))
 
-        if uploaded_file:
-            df = pd.read_excel(uploaded_file, usecols=[0])
-            for val in df.iloc[:, 0]:
-                if isinstance(val, str):
-                    affiliations |= set([a.strip().lower() for a in val.split(",") if a.strip()])
-
-        results = []
-        for author in DataExtractionAuthor.objects.select_related('article').all():
-            if author.author_affiliation:
-                affil_lower = author.author_affiliation.lower()
-                if any(keyword in affil_lower for keyword in affiliations):
-                    results.append({
-                        "article": author.article.article_title if author.article else "",
-                        "author_name": author.author_name,
-                        "author_email": author.author_email or "",
-                        "affiliation": author.author_affiliation,
-                        "country": author.author_country or ""
-                    })
+        params = {"terms": sorted(affiliations)}
+        if request.POST.get("background"):
+            return queue_export_job(request, "search_by_affiliation", "excel", "search_by_affiliation.xlsx", params)
 
-        df_all = pd.DataFrame(results)
-        df_unique = df_all.drop_duplicates(subset=["author_email"])
+        # Trigram-indexed substring match on the affiliation, streamed to Excel
+        return streaming_xlsx_response("search_by_affiliation.xlsx", cached_report_sheets("search_by_affiliation", params))
 
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_all.to_excel(writer, sheet_name="total_data", index=False)
-            df_unique.to_excel(writer, sheet_name="unique_data", index=False)
-        output.seek(0)
+    return render(request, 'tools/data_central/search_by_affiliation.html')
 
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename=search_by_affiliation.xlsx'
-        return response
+def fulltext_search_api(request):
+    """
+    Ranked full-text search (JSON) over article titles/keywords and author names/affiliations.
+    ?q=<websearch query>&scope=articles|authors|sd_articles|sd_authors&page=&page_size=
+    """
+    text = (request.GET.get("q") or "").strip()
+    scope = (request.GET.get("scope") or "articles").strip()
+    # Non-numeric page / page_size fall back to the defaults
+    page = (request.GET.get("page") or "").strip()
+    page_size = (request.GET.get("page_size") or "").strip()
+    page = max(int(page), 1) if page.isdigit() else 1
+    page_size = min(max(int(page_size), 1), 100) if page_size.isdigit() else 25
+
+    if scope not in FULLTEXT_SCOPES:
+        return JsonResponse({"success": False, "error": f"Unknown scope '{scope}'."}, status=400)
+
+    rows, has_next = fulltext_search(scope, text, page, page_size) if text else ([], False)
+
+    return JsonResponse({
+        "success": True,
+        "query": text,
+        "scope": scope,
+        "page": page,
+        "page_size": page_size,
+        "has_next": has_next,
+        "results": rows,
+    })
 
-    return render(request, 'tools/data_central/search_by_affiliation.html')
+def report_count_api(request, report):
+    """
+    Total rows of a paginated report for its current filters (same GET params as the
+    report page): {"count": n, "exact": false} is a planner estimate, polled until exact.
+    """
+    if report not in COUNT_REPORTS:
+        return JsonResponse({"success": False, "error": f"Unknown report '{report}'."}, status=400)
+    return JsonResponse({"success": True, **report_count(report, report_params(report, request.GET))})
 
 def top_authors_report(request):
     PAGE_SIZE = 25
-    year    = (request.GET.get("year") or "").strip()
+    year    = requested_year(request.GET)
     keyword = (request.GET.get("keyword") or "").strip()
     domain  = (request.GET.get("domain") or "").strip()
     group   = (request.GET.get("group") or "").strip()
     export  = (request.GET.get("export") or "").strip()
-    page    = max(int(request.GET.get("page") or 1), 1)
+    cursor  = (request.GET.get("cursor") or "").strip()
 
-    # ---------- Build the base article filter (fast & selective) ----------
-    articles = DataExtractionArticle.objects.select_related("data_extraction")
-    if year:
-        articles = articles.filter(published_year=year)
-    if keyword:
-        # consider pg_trgm GIN index on article_keywords to accelerate icontains
-        articles = articles.filter(article_keywords__icontains=keyword)
-    if group:
-        articles = articles.filter(data_extraction__extraction_groups__icontains=group)
-
-    # ---------- Aggregate from AUTHORS side to avoid row explosion ----------
-    # Assuming the reverse relation name from Article -> Author is "data_extraction_authors"
-    # If it's different, adjust the join path below (e.g., authors__article or similar)
-    authors = (
-        DataExtractionAuthor.objects
-        .filter(article__in=articles.values("id"))  # FK name from Author → Article
-        .annotate(
-            a_name=Trim(F("author_name")),
-            a_email_norm=Lower(Trim(F("author_email"))),
-        )
-        .exclude(a_name__isnull=True)
-        .exclude(a_name__exact="")
-    )
+    grouped = top_authors_queryset(year=year, keyword=keyword, domain=domain, group=group)
 
-    if domain:
-        dom = domain.lower().lstrip("@")
-        authors = authors.filter(a_email_norm__endswith="@" + dom)
-
-    grouped = (
-        authors
-        .values("a_name", "a_email_norm", "author_country")  # include country
-        .distinct()  # no counting, just unique combinations
-        .order_by("a_name")
-    )
-
-    # ---------- Exports (materialize only when needed) ----------
+    # ---------- Exports (streamed from a server-side cursor, or queued in the background) ----------
     if export in {"csv", "excel"}:
-        df = pd.DataFrame(list(grouped))
-        output = BytesIO()
+        params = {"year": year, "keyword": keyword, "domain": domain, "group": group}
+        file_name = "top_authors.csv" if export == "csv" else "group_authors_emails.xlsx"
+        if request.GET.get("background"):
+            return queue_export_job(request, "top_authors", export, file_name, params)
         if export == "csv":
-            df.to_csv(output, index=False)
-            output.seek(0)
-            resp = HttpResponse(output, content_type="text/csv")
-            resp["Content-Disposition"] = 'attachment; filename="top_authors.csv"'
-            return resp
-        else:
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="TopAuthors")
-            output.seek(0)
-            resp = HttpResponse(
-                output,
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            resp["Content-Disposition"] = 'attachment; filename="group_authors_emails.xlsx"'
-            return resp
-
-    # ---------- Fast pagination without COUNT() ----------
-    start = (page - 1) * PAGE_SIZE
-    rows = list(grouped[start:start + PAGE_SIZE + 1])  # lookahead by 1
-    has_next = len(rows) > PAGE_SIZE
-    page_rows = rows[:PAGE_SIZE]
-
-    # Populate years & groups (small lookups)
-    years = (DataExtractionArticle.objects
-             .exclude(published_year=None)
-             .values_list("published_year", flat=True)
-             .distinct()
-             .order_by("published_year"))
-
-    groups = (DataExtractionGroup.objects
-              .annotate(gn_lower=Lower('group_name'))
-              .order_by('gn_lower')
-              .values_list('id', 'group_name'))
-
-    # IMPORTANT: remove the expensive total_count. If you really need it, compute async and cache.
-    total_count = None  # or show "—" in the UI
+            _, header, rows = EXPORT_REPORTS["top_authors"](params)[0]
+            return streaming_csv_response(file_name, header, rows)
+        return streaming_xlsx_response(file_name, EXPORT_REPORTS["top_authors"](params))
+
+    # ---------- Keyset pagination (no OFFSET, no COUNT()) ----------
+    page = keyset_page(grouped, cursor, PAGE_SIZE)
+    filter_query = urlencode({k: v for k, v in
+                              {"year": year, "group": group, "keyword": keyword, "domain": domain}.items() if v})
+
+    # Populate groups (cached lookup)
+    groups = [(group["id"], group["group_name"]) for group in lookup("groups")]
+
+    # Planner estimate until the exact COUNT(), computed in the background, is cached
+    total = report_count("top_authors", {"year": year, "keyword": keyword, "domain": domain, "group": group})
 
     context = {
-        "rows": page_rows,                   # replace template usage of page_obj with rows
-        "has_next": has_next,
+        "rows": page.rows,
         "page": page,
         "page_size": PAGE_SIZE,
-        "start_index": start,  # <-- add this
-        "years": years,
+        "start_index": page.start_index,
+        "filter_query": filter_query,
+        **year_filter_context(year),
         "groups": groups,
-        "selected_year": year,
         "selected_group": group,
         "keyword": keyword,
         "domain": domain,
-        "total_count": total_count,          # don’t render a huge count synchronously
+        "total": total,
     }
     return render(request, "tools/data_central/top_authors_report.html", context)
 
 
 def missing_email_authors(request):
-    year = request.GET.get("year", "")
-    export = request.GET.get("export", "")
-
-    authors_qs = DataExtractionAuthor.objects.filter(
-        Q(author_email__isnull=True) | Q(author_email__exact="")
-    ).select_related("article")
-
-    if year:
-        authors_qs = authors_qs.filter(article__published_year=year)
-
-    data = []
-    for author in authors_qs:
-        data.append({
-            "author_name": author.author_name,
-            "affiliation": author.author_affiliation,
-            "article_title": author.article.article_title if author.article else "",
-            "year": author.article.published_year if author.article else "",
-        })
-
-    total_count = len(data)
+    year = requested_year(request.GET)
+    export = (request.GET.get("export") or "").strip()
 
-    # Export
+    # Export (streamed from a server-side cursor, or queued in the background)
     if export in ["csv", "excel"]:
-        df = pd.DataFrame(data)
-        output = BytesIO()
+        params = {"year": year}
+        file_name = "missing_emails.csv" if export == "csv" else "missing_emails.xlsx"
+        if request.GET.get("background"):
+            return queue_export_job(request, "missing_emails", export, file_name, params)
         if export == "csv":
-            df.to_csv(output, index=False)
-            output.seek(0)
-            response = HttpResponse(output, content_type="text/csv")
-            response["Content-Disposition"] = "attachment; filename=missing_emails.csv"
-        else:
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="MissingEmails")
-            output.seek(0)
-            response = HttpResponse(
-                output,
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-            response["Content-Disposition"] = "attachment; filename=missing_emails.xlsx"
-        return response
+            _, header, rows = EXPORT_REPORTS["missing_emails"](params)[0]
+            return streaming_csv_response(file_name, header, rows)
+        return streaming_xlsx_response(file_name, EXPORT_REPORTS["missing_emails"](params))
 
-    paginator = Paginator(data, 25)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Keyset pages over the dea_missing_email partial indexes: one LIMIT 26 index scan per page
+    authors_qs = (missing_email_queryset(year=year)
+                  .order_by("id")
+                  .values("id", "author_name", "article__article_title", "article__publication_year",
+                          affiliation=F("author_affiliation")))
+    total = report_count("missing_emails", {"year": year})
 
-    years = DataExtractionArticle.objects.exclude(published_year=None).values_list("published_year", flat=True).distinct()
+    page = keyset_page(authors_qs, request.GET.get("cursor"), 25)
 
     return render(request, "tools/data_central/missing_email_authors.html", {
-        "page_obj": page_obj,
-        "years": years,
-        "selected_year": year,
-        "total_count": total_count,
+        "page": page,
+        **year_filter_context(year),
+        "total": total,
     })
 
+def user_upload_rollups(request):
+    """
+    DailyUploadRollup rows of the user upload reports for the user / start_date /
+    end_date filters, as plain range predicates on the indexed upload_date.
+    """
+    selected_user = request.GET.get('user')
+    start_date = parse_date(request.GET.get('start_date') or '')
+    end_date = parse_date(request.GET.get('end_date') or '')
+
+    rollups = DailyUploadRollup.objects.all()
+    if selected_user and selected_user.isdigit():
+        rollups = rollups.filter(user_id=selected_user)
+    if start_date:
+        rollups = rollups.filter(upload_date__gte=start_date)
+    if end_date:
+        rollups = rollups.filter(upload_date__lte=end_date)
+    return rollups.order_by('-upload_date', 'user__first_name')
+
+
 def user_uploads_by_date(request):
-    users = Users.objects.all()
+    users = lookup("users")
 
     selected_user = request.GET.get('user')
     start_date = request.GET.get('start_date')
     end_date = request.GET.get('end_date')
 
-    uploads = DataExtraction.objects.annotate(upload_date=TruncDate('created_at'))
-
-    if selected_user:
-        uploads = uploads.filter(extracted_by_id=selected_user)
-    if start_date:
-        uploads = uploads.filter(upload_date__gte=parse_date(start_date))
-    if end_date:
-        uploads = uploads.filter(upload_date__lte=parse_date(end_date))
-
-    grouped_uploads = (
-        uploads.values('upload_date', 'extracted_by__first_name')
-        .annotate(total=Count('id'))
-        .order_by('-upload_date')
-    )
+    uploads = user_upload_rollups(request).values(
+        'upload_date', 'user__first_name', 'uploads', 'total_records', 'total_unique_records')
 
     return render(request, 'tools/data_central/user_uploads_by_date.html', {
-        "uploads": grouped_uploads,
+        "uploads": uploads,
         "users": users,
         "selected_user": selected_user,
         "start_date": start_date,
         "end_date": end_date,
     })
 
-
 def export_user_uploads_excel(request):
-    uploads = DataExtraction.objects.annotate(upload_date=TruncDate('created_at'))
+    rows = (user_upload_rollups(request)
+            .values_list('upload_date', 'user__first_name', 'uploads', 'total_records', 'total_unique_records')
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    return streaming_xlsx_response("user_uploads.xlsx", [
+        ("Sheet1", ["Date", "User", "Uploads", "Records", "Unique Records"], rows)])
 
-    selected_user = request.GET.get('user')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
 
-    if selected_user:
-        uploads = uploads.filter(extracted_by_id=selected_user)
-    if start_date:
-        uploads = uploads.filter(upload_date__gte=parse_date(start_date))
-    if end_date:
-        uploads = uploads.filter(upload_date__lte=parse_date(end_date))
+def export_job_list(request):
+    jobs = ExportJob.objects.select_related('requested_by').order_by('-created_at')
+    if request.session.get('user_type') != 0:
+        jobs = jobs.filter(requested_by_id=request.session.get('user_id'))
 
-    grouped = (
-        uploads.values('upload_date', 'extracted_by__first_name')
-        .annotate(total=Count('id'))
-        .order_by('-upload_date')
-    )
-
-    df = pd.DataFrame(grouped)
-    df.rename(columns={
-        'upload_date': 'Date',
-        'extracted_by__first_name': 'User',
-        'total': 'Uploads'
-    }, inplace=True)
+    return render(request, 'tools/data_central/export_job_list.html', {
+        'jobs': jobs,
+    })
 
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="user_uploads.xlsx"'
-    df.to_excel(response, index=False)
-    return response
+def export_job_download(request, job_id):
+    job = get_object_or_404(ExportJob, id=job_id, status='SUCCESS')
+    if request.session.get('user_type') != 0 and job.requested_by_id != request.session.get('user_id'):
+        return render(request, 'access_denied.html')
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise Http404("Export file no longer exists.")
 
+    return FileResponse(open(job.file_path, 'rb'), as_attachment=True, filename=job.file_name)
 
 def backup_log_list(request):
     logs = BackupLog.objects.all().order_by('-timestamp')
@@ -887,7 +890,8 @@ def backup_log_list(request):
     })
 
 def backup_data_extraction_zip_list(request):
-    logs = BackupDataExtractionLog.objects.all().order_by('-timestamp')
+    # The manifests hold every file of the tree, the list doesn't need them
+    logs = BackupDataExtractionLog.objects.defer('manifest').order_by('-timestamp')
     today = timezone_now().date()
     has_today_backup = logs.filter(status='SUCCESS', timestamp__date=today).exists()
 
@@ -927,7 +931,7 @@ def data_extractor_groups_add(request):
         messages.success(request, "Group added successfully!")
         return redirect("app:data_extractor_groups_list")
 
-    users = Users.objects.all()
+    users = lookup("users")
     return render(request, "tools/groups/add.html", {"users": users})
 
 
@@ -948,7 +952,7 @@ def data_extractor_groups_edit(request):
     else:
         group_id = request.GET.get("group_id")
         extractor_group = get_object_or_404(DataExtractionGroup, id=group_id)
-        users = Users.objects.all()
+        users = lookup("users")
         return render(request, "tools/groups/edit.html", {
             "extractor_group": extractor_group,
             "users": users
@@ -1067,6 +1071,52 @@ def extract_year(date_str):
     return match.group(0) if match else None
 
 
+def save_extraction_items(extraction, with_email, logger):
+    """
+    Stores the extracted article/author rows of a DataExtraction. Keywords of newly
+    created articles are normalized into DataExtractionKeyword for indexed search,
+    and the full-text search vectors and author aggregates of the loaded rows are
+    refreshed along with the dashboard counters. Cached search results are
+    invalidated once the rows are committed.
+    """
+    for item in with_email:
+        try:
+            article_title = item['article_title'].strip()
+            article, created = DataExtractionArticle.objects.get_or_create(
+                article_title=article_title,
+                data_extraction=extraction,
+                defaults={
+                    'published_date': item['published_date'],
+                    'published_year': item['published_year'],
+                    'article_keywords': item.get('article_keywords', []),
+                }
+            )
+            if created:
+                DataExtractionKeyword.objects.bulk_create(
+                    [DataExtractionKeyword(article=article, keyword=keyword)
+                     for keyword in normalize_keywords(article.article_keywords)],
+                    ignore_conflicts=True
+                )
+            # Attempt to get the author or create if it doesn't exist.
+            # The 'defaults' dictionary is used only if a new object needs to be created.
+            DataExtractionAuthor.objects.get_or_create(
+                article=article,
+                author_email=item['email'],
+                defaults={
+                    'author_name': item['author'],
+                    'author_country': item['author_country'],
+                    'author_affiliation': item['affiliation']
+                }
+            )
+        except Exception as row_err:
+            logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+
+    update_data_extraction_search_vectors(extraction)
+    refresh_author_aggregates_for_extraction(extraction)
+    apply_stat_deltas(extraction_data_counts(extraction))
+    transaction.on_commit(bump_data_version)
+
+
 def stream_entries(file):
     buffer = []
     for line in io.TextIOWrapper(file, encoding='utf-8', errors='ignore'):
@@ -1217,7 +1267,7 @@ def extract_pubmed_new_data(text):
 def data_extractor_pubmed_new(request):
     extraction_file_types = settings.PUBMED_NEW_EXTRACTION_FILE_TYPE
     user_id = request.session.get("user_id")
-    extract_groups = DataExtractionGroup.objects.filter(user=user_id)
+    extract_groups = user_groups(user_id)
     if request.method == 'POST':
         uploaded_file = request.FILES.get('file')
         extractor_name = request.POST.get('extractor_name')
@@ -1283,31 +1333,7 @@ def data_extractor_pubmed_new(request):
                 with_email=len(with_email),
             )
 
-            for item in with_email:
-                try:
-                    article_title = item['article_title'].strip()
-                    article, created = DataExtractionArticle.objects.get_or_create(
-                        article_title=article_title,
-                        data_extraction=extraction,
-                        defaults={
-                            'published_date': item['published_date'],
-                            'published_year': item['published_year'],
-                            'article_keywords': item.get('article_keywords', []),
-                        }
-                    )
-                    # Attempt to get the author or create if it doesn't exist.
-                    # The 'defaults' dictionary is used only if a new object needs to be created.
-                    author_instance, created = DataExtractionAuthor.objects.get_or_create(
-                        article=article,
-                        author_email=item['email'],
-                        defaults={
-                            'author_name': item['author'],
-                            'author_country': item['author_country'],
-                            'author_affiliation': item['affiliation']
-                        }
-                    )
-                except Exception as row_err:
-                    logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+            save_extraction_items(extraction, with_email, logger)
 
             # buffer = io.BytesIO()
             # timestamp_suffix = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1441,7 +1467,7 @@ def extract_pubmed_central_data(text):
 def data_extractor_pubmed_central(request):
     extraction_file_types = settings.PUBMED_CENTRAL_EXTRACTION_FILE_TYPE
     user_id = request.session.get("user_id")
-    extract_groups = DataExtractionGroup.objects.filter(user=user_id)
+    extract_groups = user_groups(user_id)
     if request.method == 'POST':
         uploaded_file = request.FILES.get('file')
         extractor_name = request.POST.get('extractor_name')
@@ -1513,31 +1539,7 @@ def data_extractor_pubmed_central(request):
                 with_email=len(with_email),
             )
 
-            for item in with_email:
-                try:
-                    article_title = item['article_title'].strip()
-                    article, created = DataExtractionArticle.objects.get_or_create(
-                        article_title=article_title,
-                        data_extraction=extraction,
-                        defaults={
-                            'published_date': item['published_date'],
-                            'published_year': item['published_year'],
-                            'article_keywords': item.get('article_keywords', []),
-                        }
-                    )
-                    # Attempt to get the author or create if it doesn't exist.
-                    # The 'defaults' dictionary is used only if a new object needs to be created.
-                    author_instance, created = DataExtractionAuthor.objects.get_or_create(
-                        article=article,
-                        author_email=item['email'],
-                        defaults={
-                            'author_name': item['author'],
-                            'author_country': item['author_country'],
-                            'author_affiliation': item['affiliation']
-                        }
-                    )
-                except Exception as row_err:
-                    logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+            save_extraction_items(extraction, with_email, logger)
 
             # buffer = io.BytesIO()
 
@@ -1773,7 +1775,7 @@ def sanitize_xml(xml: str) -> str:
 def data_extractor_europe_pmc(request):
     extraction_file_types = settings.EUROPE_PMC_EXTRACTION_FILE_TYPE
     user_id = request.session.get("user_id")
-    extract_groups = DataExtractionGroup.objects.filter(user=user_id)
+    extract_groups = user_groups(user_id)
     if request.method == 'POST':
         uploaded_file = request.FILES.get('file')
         extractor_name = request.POST.get('extractor_name')
@@ -1843,29 +1845,7 @@ def data_extractor_europe_pmc(request):
                 with_email=len(with_email),
             )
 
-            for item in with_email:
-                try:
-                    article_title = item['article_title'].strip()
-                    article, created = DataExtractionArticle.objects.get_or_create(
-                        article_title=article_title,
-                        data_extraction=extraction,
-                        defaults={
-                            'published_date': item['published_date'],
-                            'published_year': item['published_year'],
-                            'article_keywords': item.get('article_keywords', []),
-                        }
-                    )
-                    DataExtractionAuthor.objects.get_or_create(
-                        article=article,
-                        author_email=item['email'],
-                        defaults={
-                            'author_name': item['author'],
-                            'author_country': item['author_country'],
-                            'author_affiliation': item['affiliation']
-                        }
-                    )
-                except Exception as row_err:
-                    logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+            save_extraction_items(extraction, with_email, logger)
 
             extraction_dir = f"app/data_extraction/{extraction.extraction_type}/{extraction.id}"
             os.makedirs(extraction_dir, exist_ok=True)
@@ -1986,7 +1966,7 @@ def extract_pubmed_data(text):
 def data_extractor_pubmed(request):
     extraction_file_types = settings.PUBMED_EXTRACTION_FILE_TYPE
     user_id = request.session.get("user_id")
-    extract_groups = DataExtractionGroup.objects.filter(user=user_id)
+    extract_groups = user_groups(user_id)
     if request.method == 'POST':
         uploaded_file = request.FILES.get('file')
         extractor_name = request.POST.get('extractor_name')
@@ -2052,31 +2032,7 @@ def data_extractor_pubmed(request):
                 with_email=len(with_email),
             )
 
-            for item in with_email:
-                try:
-                    article_title = item['article_title'].strip()
-                    article, created = DataExtractionArticle.objects.get_or_create(
-                        article_title=article_title,
-                        data_extraction=extraction,
-                        defaults={
-                            'published_date': item['published_date'],
-                            'published_year': item['published_year'],
-                            'article_keywords': item.get('article_keywords', []),
-                        }
-                    )
-                    # Attempt to get the author or create if it doesn't exist.
-                    # The 'defaults' dictionary is used only if a new object needs to be created.
-                    author_instance, created = DataExtractionAuthor.objects.get_or_create(
-                        article=article,
-                        author_email=item['email'],
-                        defaults={
-                            'author_name': item['author'],
-                            'author_country': item['author_country'],
-                            'author_affiliation': item['affiliation']
-                        }
-                    )
-                except Exception as row_err:
-                    logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+            save_extraction_items(extraction, with_email, logger)
 
             # buffer = io.BytesIO()
             # timestamp_suffix = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -2122,6 +2078,33 @@ def data_extractor_pubmed(request):
                       {"extract_groups": extract_groups, "extraction_file_types": extraction_file_types})
 
 
+def bulk_download_members(extractions):
+    """
+    (name, chunks) members of the bulk download: each output workbook read from disk
+    as the archive is written, then a MANIFEST.txt listing what was included and
+    which files were missing.
+    """
+    included, missing, names = [], [], set()
+    for extraction in extractions:
+        relative_path = extraction.output_excel_path.replace('\\', '/').strip()
+        full_path = os.path.join(settings.BASE_DIR, relative_path)
+        if not os.path.isfile(full_path):
+            logging.getLogger(__name__).warning("Bulk download: file not found for extraction %s: %s", extraction.id, full_path)
+            missing.append(f"{extraction.id}\t{extraction.extraction_name}\t{relative_path}")
+            continue
+
+        name = os.path.basename(full_path)
+        if name in names:
+            root, extension = os.path.splitext(name)
+            name = f"{root}_{extraction.id}{extension}"
+        names.add(name)
+        included.append(f"{extraction.id}\t{extraction.extraction_name}\t{name}")
+        yield name, iter_file(full_path)
+
+    lines = [f"Included files ({len(included)}):", *included, "", f"Missing files ({len(missing)}):", *missing]
+    yield "MANIFEST.txt", ["\n".join(lines).encode("utf-8") + b"\n"]
+
+
 @csrf_exempt
 def bulk_download_zip(request):
     if request.method == 'POST':
@@ -2130,25 +2113,12 @@ def bulk_download_zip(request):
             return HttpResponse("No files selected.", status=400)
 
         id_list = [int(i) for i in ids.split(',') if i.isdigit()]
-        files = DataExtraction.objects.filter(id__in=id_list, output_excel_path__isnull=False)
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
-            for file in files:
-                relative_path = file.output_excel_path.replace('\\', '/').strip()
-                full_path = os.path.join(settings.BASE_DIR, relative_path)
+        extractions = (DataExtraction.objects.filter(id__in=id_list, output_excel_path__isnull=False)
+                       .exclude(output_excel_path="").only("id", "extraction_name", "output_excel_path").order_by("id"))
 
-                if os.path.exists(full_path):
-                    zip_file.write(full_path, os.path.basename(full_path))
-                else:
-                    print(f"❌ File not found: {full_path}")
-
-        zip_buffer.seek(0)
+        # Streamed as it is written: workbooks are stored as-is (already deflated), ZIP64 throughout
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        zip_filename = f"bulk_data_central_{timestamp}.zip"
-        response = HttpResponse(zip_buffer, content_type='application/zip')
-        response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
-        return response
+        return streaming_zip_response(f"bulk_data_central_{timestamp}.zip", bulk_download_members(extractions))
 
     return HttpResponse("Invalid request", status=405)
 
@@ -2257,7 +2227,7 @@ def extract_korean_med_data(text):
 
 def data_extractor_korean_med(request):
     extraction_file_types = settings.KOREAMED_EXTRACTION_FILE_TYPE
-    extract_groups = DataExtractionGroup.objects.all()
+    extract_groups = lookup("groups")
     if request.method == 'POST':
         uploaded_file = request.FILES.get('file')
         extractor_name = request.POST.get('extractor_name')
@@ -2329,31 +2299,7 @@ def data_extractor_korean_med(request):
                 with_email=len(with_email),
             )
 
-            for item in with_email:
-                try:
-                    article_title = item['article_title'].strip()
-                    article, created = DataExtractionArticle.objects.get_or_create(
-                        article_title=article_title,
-                        data_extraction=extraction,
-                        defaults={
-                            'published_date': item['published_date'],
-                            'published_year': item['published_year'],
-                            'article_keywords': item.get('article_keywords', []),
-                        }
-                    )
-                    # Attempt to get the author or create if it doesn't exist.
-                    # The 'defaults' dictionary is used only if a new object needs to be created.
-                    author_instance, created = DataExtractionAuthor.objects.get_or_create(
-                        article=article,
-                        author_email=item['email'],
-                        defaults={
-                            'author_name': item['author'],
-                            'author_country': item['author_country'],
-                            'author_affiliation': item['affiliation']
-                        }
-                    )
-                except Exception as row_err:
-                    logger.warning(f"Failed to insert row: {item} | Error: {row_err}")
+            save_extraction_items(extraction, with_email, logger)
 
             # buffer = io.BytesIO()
 
@@ -2408,70 +2354,45 @@ def subjects_science_direct(request):
         subject_data = json.load(file)
     return render(request, 'science-direct/list.html', {"subjects": subject_data})
 
+# The list pages render only the table shell; rows are fetched page by page from
+# science_direct_list_api as the table is scrolled
 def journals_science_direct(request):
-    journals_list = Journal.objects.all()
-    return render(request, 'science-direct/journals_list.html', {"journals": journals_list})
+    return render(request, 'science-direct/journals_list.html', {})
 
 def articles_science_direct(request):
-    # Get all articles with non-null and non-empty author_info
-    articles_with_data = Article.objects.filter(is_email=True)
-    context = {
-        "articles": articles_with_data
-    }
-    return render(request, 'science-direct/articles_list.html', context)
+    return render(request, 'science-direct/articles_list.html', {})
 
 
 def authors_science_direct(request):
-    # Get all articles with non-null and non-empty author_info
-    authors_with_data = Author.objects.all()
-    context = {
-        "authors": authors_with_data
-    }
-    return render(request, 'science-direct/authors_list.html', context)
+    return render(request, 'science-direct/authors_list.html', {})
+
+
+def science_direct_list_api(request, listing):
+    """
+    One keyset page of a ScienceDirect list: the list filters and sort in the query
+    string plus the cursor returned with the previous page.
+    """
+    if listing not in SCIENCE_DIRECT_LISTS:
+        raise Http404
+    queryset = science_direct_list_queryset(listing, request.GET)
+    page = keyset_page(queryset, request.GET.get("cursor"), SCIENCE_DIRECT_PAGE_SIZE)
+    return JsonResponse({
+        "rows": page.rows,
+        "start": page.start_index,
+        "next_cursor": page.next_cursor,
+    })
 
 def get_data_science_direct(request):
     if request.method == 'POST' and request.FILES.get('excel_file'):
         file = request.FILES['excel_file']
         df_keywords = pd.read_excel(file)
 
-        keywords = df_keywords.iloc[:, 0].dropna().astype(str).tolist()
-
-        # Filter authors by keywords in article title
-        filtered_authors = Author.objects.filter(article_title__iregex=r'(' + '|'.join(keywords) + ')')
-
-        # Sheet 1: All matches
-        data_sheet1 = [
-            {
-                'Article Title': a.article_title,
-                'Author Name': a.author_name,
-                'Author Email': a.author_email,
-                'Published': f"{a.article.published_date}-{a.article.published_month}-{a.article.published_year}"
-            }
-            for a in filtered_authors
-        ]
-
-        df1 = pd.DataFrame(data_sheet1)
-
-        # Sheet 2: Unique authors
-        df2 = df1[['Author Name', 'Author Email']].drop_duplicates()
+        keywords = sorted({k.strip().lower() for k in df_keywords.iloc[:, 0].dropna().astype(str) if k.strip()})
 
-        # Prepare Excel file
+        # Authors of articles whose title contains any keyword (trigram-indexed, streamed)
         timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
         file_name = f"author_export_{timestamp}.xlsx"
-        output = io.BytesIO()
-
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df1.to_excel(writer, sheet_name='Matched Articles', index=False)
-            df2.to_excel(writer, sheet_name='Unique Authors', index=False)
-
-        output.seek(0)
-
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{file_name}"'
-        return response
+        return streaming_xlsx_response(file_name, EXPORT_REPORTS["science_direct_authors"]({"keywords": keywords}))
 
     return render(request, 'science-direct/get_data.html', {})
 
@@ -1,9 +1,8 @@
 # backup_data_extraction.py
 import os
+import sys
 import django
-import zipfile
 import pickle
-from datetime import datetime
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 
@@ -12,23 +11,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scitechjournals.settings')  # C
 django.setup()
 
 from app.models import BackupDataExtractionLog
-
-
-def zip_data_folder():
-    folder = "app/data_extraction"
-    zip_name = f"data_extraction_backup_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.zip"
-    zip_path = os.path.join("app", "data_extraction_backups", zip_name)
-
-    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
-
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(folder):
-            for file in files:
-                full_path = os.path.join(root, file)
-                arcname = os.path.relpath(full_path, folder)
-                zipf.write(full_path, arcname)
-
-    return zip_path, zip_name
+from app.backups import BACKUPS_DIR, DATA_EXTRACTION_DIR, create_archive
 
 
 def upload_to_drive(file_path, file_name):
@@ -52,24 +35,34 @@ def upload_to_drive(file_path, file_name):
     return f"https://drive.google.com/file/d/{uploaded.get('id')}"
 
 
-def log(status, message, drive_link=''):
+def log(status, message, drive_link='', **backup):
     BackupDataExtractionLog.objects.create(
         status=status,
         message=message,
-        drive_link=drive_link
+        drive_link=drive_link,
+        **backup
     )
 
 
-def run_backup():
+def run_backup(full=False):
+    # Only new and changed files since the last successful backup, with a full snapshot
+    # every FULL_SNAPSHOT_EVERY runs (or with --full); see app.backups
     try:
-        zip_path, zip_name = zip_data_folder()
+        zip_path, zip_name, kind, base, manifest, files_archived = create_archive(
+            DATA_EXTRACTION_DIR, BACKUPS_DIR, full=full)
+        backup = {'kind': kind, 'base': base, 'archive_name': zip_name, 'manifest': manifest,
+                  'files_archived': files_archived}
+        if zip_path is None:
+            log('SUCCESS', f"No changes since {base.archive_name or base.timestamp}", **backup)
+            print("✅ No changes since the last backup.")
+            return
         link = upload_to_drive(zip_path, zip_name)
-        log('SUCCESS', zip_name, link)
-        print(f"✅ Backup successful: {zip_name}")
+        log('SUCCESS', f"{zip_name} ({files_archived} of {len(manifest)} files)", link, **backup)
+        print(f"✅ {kind.title()} backup successful: {zip_name} ({files_archived} files)")
     except Exception as e:
         log('FAILURE', str(e))
         print(f"❌ Backup failed: {e}")
 
 
 if __name__ == "__main__":
-    run_backup()
+    run_backup(full='--full' in sys.argv[1:])
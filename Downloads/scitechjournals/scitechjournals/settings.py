@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'app'
 ]
 
@@ -141,9 +142,46 @@ INSTALLED_APPS += [
     'django_celery_results',
 ]
 
+# CACHES (Redis, with a local-memory fallback used while Redis is unreachable; see app/cache.py)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scitechjournals',
+    },
+}
+
+# Search result cache (see app/reports.py)
+SEARCH_CACHE_TIMEOUT = 60 * 60 * 6
+SEARCH_CACHE_MAX_ROWS = 50000
+
+# Database backups made by backup_db.py (see app/backups.py and app/backup_storage.py)
+DB_BACKUP = {
+    # pg_dump executable: an absolute path, or a name looked up on PATH
+    'PG_DUMP': os.environ.get('PG_DUMP', r'C:\Program Files\PostgreSQL\17\bin\pg_dump.exe' if os.name == 'nt' else 'pg_dump'),
+    # 'directory' (-Fd, dumped by JOBS parallel workers), 'custom' (-Fc) or 'plain' (-Fp)
+    'FORMAT': 'directory',
+    'JOBS': 4,
+    # zlib level of the dumped table data
+    'COMPRESS': 6,
+    # Where dumps are uploaded: GoogleDriveStorage, or LocalStorage with a 'directory' option
+    'STORAGE': 'app.backup_storage.GoogleDriveStorage',
+    'STORAGE_OPTIONS': {
+        'folder_id': '1eJZdicuQmOwxV_OaXyPeH50bywvWZkFS',
+        'credentials_file': 'google_drive_save.json',
+        'token_file': 'token.pickle',
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'app/data_extraction')
 
+# Background export files (app/tasks.py), kept out of MEDIA_ROOT which the data-extraction backups archive
+EXPORT_ROOT = os.path.join(BASE_DIR, 'exports')
+
 # EMAIL (for Gmail example)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -0,0 +1,86 @@
+// Infinite-scroll table fed by a keyset-paged JSON endpoint (see app.listings).
+// The next page is fetched when the status row below the table scrolls into view;
+// submitting the filter form or changing one of its selects starts again from the first page.
+//
+//   lazyList({url, form, table, status, columns: [{value: function (row, number) {...}, wrap: true}]})
+function lazyList(options) {
+  const tbody = options.table.querySelector("tbody");
+  const status = options.status;
+  let cursor = null;
+  let loading = false;
+  let done = false;
+  let generation = 0;
+
+  function isVisible(element) {
+    const rect = element.getBoundingClientRect();
+    return rect.top < window.innerHeight && rect.bottom > 0;
+  }
+
+  function appendRows(rows, start) {
+    rows.forEach(function (row, index) {
+      const tr = document.createElement("tr");
+      options.columns.forEach(function (column) {
+        const td = document.createElement("td");
+        const value = column.value(row, start + index + 1);
+        td.textContent = value === null || value === undefined ? "" : value;
+        if (column.wrap) {
+          td.style.whiteSpace = "normal";
+          td.style.wordBreak = "break-word";
+        }
+        tr.appendChild(td);
+      });
+      tbody.appendChild(tr);
+    });
+  }
+
+  function load() {
+    if (loading || done) return;
+    loading = true;
+    status.textContent = "Loading...";
+    const current = generation;
+    const query = new URLSearchParams(new FormData(options.form));
+    if (cursor) query.set("cursor", cursor);
+
+    fetch(options.url + "?" + query.toString(), {headers: {"X-Requested-With": "XMLHttpRequest"}})
+      .then(function (response) {
+        if (!response.ok) throw new Error(response.status);
+        return response.json();
+      })
+      .then(function (data) {
+        if (current !== generation) return;
+        appendRows(data.rows, data.start);
+        cursor = data.next_cursor;
+        done = !cursor;
+        loading = false;
+        status.textContent = done && !tbody.rows.length ? "No records found." : "";
+        // The observer only fires on changes: keep filling while the status row is on screen
+        if (!done && isVisible(status)) load();
+      })
+      .catch(function () {
+        if (current !== generation) return;
+        loading = false;
+        status.textContent = "Could not load the list, scroll to retry.";
+      });
+  }
+
+  function reload() {
+    generation += 1;
+    cursor = null;
+    loading = false;
+    done = false;
+    tbody.innerHTML = "";
+    load();
+  }
+
+  options.form.addEventListener("submit", function (e) {
+    e.preventDefault();
+    reload();
+  });
+  options.form.addEventListener("change", function (e) {
+    if (e.target.tagName === "SELECT") reload();
+  });
+  new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting) load();
+  }).observe(status);
+  load();
+}